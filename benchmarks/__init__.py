@@ -0,0 +1,5 @@
+"""
+Paquete con las mediciones de rendimiento de la aplicacion.
+
+Cada modulo se ejecuta con python -m benchmarks.<modulo> desde la raiz del proyecto.
+"""
@@ -0,0 +1,134 @@
+"""
+Este módulo mide el tiempo de importacion de la aplicacion con python -X importtime.
+
+Importa el modulo indicado (main por defecto) en procesos nuevos, interpreta el
+reporte de -X importtime y muestra el tiempo acumulado del modulo y los modulos que
+mas tiempo propio consumen. Falla si se cargan modulos que deben importarse solo al
+usarlos (como requests) o si se supera el tiempo maximo indicado, para detectar
+regresiones en el arranque.
+
+Uso: python -m benchmarks.arranque [--modulo main] [--repeticiones 5] [--max-ms 100]
+[--salida resultados.json]
+
+Importaciones:
+- argparse: para interpretar los argumentos de la linea de comandos.
+- json: para guardar los resultados.
+- os: para ejecutar desde la raiz del proyecto.
+- subprocess: para importar la aplicacion en un proceso nuevo.
+- sys: para usar el mismo interprete y el codigo de salida.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROHIBIDOS = ("requests", "urllib3", "multiprocessing", "sqlite3", "numpy")
+
+
+def interpretar(reporte: str, modulo: str):
+    """interpreta la salida de python -X importtime, conservando solo los modulos
+    importados por el modulo dado (no los que carga el interprete al iniciar)
+
+    Args:
+        reporte (str): la salida de error del proceso
+        modulo (str): el modulo importado
+
+    Returns:
+        dict: {modulo: (tiempo propio, tiempo acumulado)} en microsegundos
+    """
+    tiempos = {}
+    for linea in reporte.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:") :].split("|")
+        tiempos[nombre.strip()] = (int(propio), int(acumulado))
+        if not nombre.startswith("  "):
+            if nombre.strip() == modulo:
+                return tiempos
+            tiempos = {}
+    return tiempos
+
+
+def medir(modulo: str = "main"):
+    """importa el modulo en un proceso nuevo con -X importtime
+
+    Args:
+        modulo (str, optional): el modulo a importar
+
+    Returns:
+        dict: {modulo: (tiempo propio, tiempo acumulado)} en microsegundos
+    """
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return interpretar(proceso.stderr, modulo)
+
+
+def ejecutar(modulo: str = "main", repeticiones: int = 5, mas_lentos: int = 10):
+    """mide varias veces la importacion y se queda con la medicion mas rapida
+
+    Args:
+        modulo (str, optional): el modulo a importar
+        repeticiones (int, optional): cantidad de mediciones
+        mas_lentos (int, optional): cantidad de modulos con mas tiempo propio a reportar
+
+    Returns:
+        dict: tiempo acumulado del modulo en ms, modulos con mas tiempo propio y
+        modulos prohibidos cargados
+    """
+    mediciones = [medir(modulo) for _ in range(repeticiones)]
+    mejor = min(mediciones, key=lambda tiempos: tiempos[modulo][1])
+    return {
+        "modulo": modulo,
+        "acumulado_ms": mejor[modulo][1] / 1000,
+        "mas_lentos_ms": {
+            nombre: tiempos[0] / 1000
+            for nombre, tiempos in sorted(
+                mejor.items(), key=lambda item: item[1][0], reverse=True
+            )[:mas_lentos]
+        },
+        "prohibidos": sorted(
+            nombre for nombre in mejor if nombre.split(".")[0] in PROHIBIDOS
+        ),
+    }
+
+
+def cli(argumentos=None):
+    """ejecuta la medicion desde la linea de comandos
+
+    Args:
+        argumentos (list[str], optional): argumentos a interpretar, por defecto sys.argv
+
+    Returns:
+        int: 0 si el arranque cumple los limites, 1 si no
+    """
+    parser = argparse.ArgumentParser(description="Tiempo de importacion de la aplicacion")
+    parser.add_argument("--modulo", default="main")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, help="tiempo acumulado maximo")
+    parser.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    args = parser.parse_args(argumentos)
+    resultado = ejecutar(args.modulo, args.repeticiones)
+    print(f"import {resultado['modulo']}: {resultado['acumulado_ms']:.1f} ms")
+    for nombre, tiempo in resultado["mas_lentos_ms"].items():
+        print(f"  {tiempo:8.2f} ms  {nombre}")
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, indent=4)
+    fallas = [f"modulo cargado al arrancar: {nombre}" for nombre in resultado["prohibidos"]]
+    if args.max_ms is not None and resultado["acumulado_ms"] > args.max_ms:
+        fallas.append(f"el arranque supera {args.max_ms} ms")
+    for falla in fallas:
+        print(falla)
+    return 1 if fallas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
@@ -0,0 +1,111 @@
+"""
+Este módulo genera datos sinteticos y deterministas de viajes y gastos para las
+mediciones de rendimiento.
+
+Los viajes son consecutivos y no se cruzan, empiezan en FECHA_BASE y sus destinos,
+duraciones, gastos y valores salen de un generador aleatorio con semilla fija, de modo
+que la misma semilla produce siempre los mismos datos. Los viajes se generan uno a
+uno para que escribir los tamaños grandes (100k viajes / 5M gastos) no requiera
+tenerlos todos en memoria.
+
+Importaciones:
+- datetime: para las fechas de los viajes y gastos.
+- random: generadores aleatorios con semilla, uno para los viajes y otro para los
+  gastos, de modo que las fechas de los viajes no dependen de la cantidad de gastos.
+- Viaje: La clase que representa un viaje.
+- Gasto: La clase que representa un gasto.
+- archivo_viajes: escritura del archivo viajes.json.
+- ProveedorTasasFijas: tasas de cambio locales, sin consultar la API.
+"""
+
+from datetime import date, timedelta
+import random
+from models.viaje import Viaje
+from models.gasto import Gasto
+from repositories import archivo_viajes
+from services.tasas_cambio import ProveedorTasasFijas
+
+FECHA_BASE = date(2000, 1, 1)
+DESTINOS = ("colombia", "usa", "europa")
+METODOS_PAGO = ("efectivo", "tarjeta")
+TASAS = {"usa": 4000.0, "europa": 4200.0}
+
+
+def proveedor_tasas():
+    """obtiene un proveedor con tasas de cambio fijas, para no medir la API
+
+    Returns:
+        ProveedorTasasFijas: el proveedor de tasas
+    """
+    return ProveedorTasasFijas(TASAS)
+
+
+def generar_viajes(cantidad: int, gastos_por_viaje: int, semilla: int = 0):
+    """genera los viajes con sus gastos, uno a uno
+
+    Args:
+        cantidad (int): cantidad de viajes
+        gastos_por_viaje (int): cantidad de gastos de cada viaje
+        semilla (int, optional): semilla del generador aleatorio
+
+    Yields:
+        Viaje: los viajes, ordenados por fecha y sin cruces entre ellos
+    """
+    aleatorio_viajes = random.Random(semilla)
+    aleatorio_gastos = random.Random(semilla + 1)
+    inicio = FECHA_BASE
+    for _ in range(cantidad):
+        dias = aleatorio_viajes.randint(1, 6)
+        fin = inicio + timedelta(days=dias)
+        viaje = Viaje(
+            aleatorio_viajes.choice(DESTINOS),
+            inicio,
+            fin,
+            float(aleatorio_viajes.randrange(50, 500)),
+        )
+        for _ in range(gastos_por_viaje):
+            viaje.agregar_gasto(
+                Gasto(
+                    inicio + timedelta(days=aleatorio_gastos.randint(0, dias)),
+                    round(aleatorio_gastos.uniform(1, 100), 2),
+                    aleatorio_gastos.choice(METODOS_PAGO),
+                    aleatorio_gastos.choice(Gasto.tipos_gasto),
+                )
+            )
+        yield viaje
+        inicio = fin + timedelta(days=aleatorio_viajes.randint(1, 3))
+
+
+def fechas_viajes(cantidad: int, semilla: int = 0):
+    """obtiene las fechas de los viajes generados, sin generar sus gastos. Las fechas
+    no dependen de la cantidad de gastos por viaje
+
+    Args:
+        cantidad (int): cantidad de viajes
+        semilla (int, optional): semilla del generador aleatorio
+
+    Returns:
+        list[tuple[date, date]]: fecha de inicio y de fin de cada viaje
+    """
+    return [
+        (viaje.fecha_inicio, viaje.fecha_fin)
+        for viaje in generar_viajes(cantidad, 0, semilla)
+    ]
+
+
+def escribir_viajes(ruta: str, cantidad: int, gastos_por_viaje: int, semilla: int = 0):
+    """escribe los viajes generados en el formato de viajes.json, con sus totales
+
+    Args:
+        ruta (str): ruta del archivo a escribir
+        cantidad (int): cantidad de viajes
+        gastos_por_viaje (int): cantidad de gastos de cada viaje
+        semilla (int, optional): semilla del generador aleatorio
+    """
+    archivo_viajes.escribir_viajes(
+        ruta,
+        (
+            {**viaje.to_dict(), "agregados": viaje.agregados()}
+            for viaje in generar_viajes(cantidad, gastos_por_viaje, semilla)
+        ),
+    )
@@ -0,0 +1,382 @@
+"""
+Este módulo mide el tiempo y la memoria de las operaciones principales a medida que
+crecen los datos.
+
+Para cada tamaño genera un viajes.json sintetico y determinista (ver benchmarks.datos)
+y mide, con las tasas de cambio fijas en memoria para no depender de la API:
+- get_viajes en frio (repositorio nuevo) y en caliente (viajes ya en memoria).
+- ViajesController.validar_fechas con intervalos libres y cruzados.
+- Viaje.get_balance_dia sobre un viaje con sus gastos cargados.
+- Reporte.generar_reportes sobre una muestra de viajes.
+- ViajesController.registrar_gasto, al final porque modifica los datos. El
+  viajes.json se vuelve a generar antes de cada repeticion, fuera del tiempo medido,
+  para que todas partan de la misma bitacora vacia y la compactacion no caiga en una
+  repeticion arbitraria.
+
+Cada medicion se repite varias veces y se reporta el tiempo por llamada (minimo,
+mediana y media) y, en una ejecucion aparte con tracemalloc, el pico de memoria. Los
+resultados se guardan en JSON junto con el commit actual, para comparar ejecuciones
+entre commits con --comparar.
+
+Uso: python -m benchmarks.rendimiento [--tamanos xs,s,m] [--repeticiones 5]
+[--semilla 0] [--directorio DIR] [--salida resultados.json] [--comparar anterior.json]
+
+Importaciones:
+- argparse: para interpretar los argumentos de la linea de comandos.
+- datetime: para las fechas de las mediciones y la fecha de ejecucion.
+- json: para guardar y leer los resultados.
+- logging: para silenciar los errores esperados de las operaciones medidas.
+- os: para las rutas y tamaños de los archivos generados.
+- platform: para registrar la version de Python.
+- random: para elegir con semilla las fechas medidas.
+- statistics: para la mediana y la media de los tiempos.
+- subprocess: para obtener el commit actual.
+- sys: para el codigo de salida.
+- tempfile: directorio temporal de los datos generados.
+- time: para medir los tiempos.
+- tracemalloc: para medir el pico de memoria.
+- ViajesController: la clase que maneja la logica de negocio de viajes y gastos.
+- ViajeException: excepcion de las validaciones de fechas.
+- Reporte: servicio de generacion de reportes.
+- ViajesRepository: repositorio de los viajes en viajes.json.
+- CacheReportes: cache de reportes en memoria, para no escribir en archivos/.
+- datos: generador de datos sinteticos.
+"""
+
+import argparse
+from datetime import datetime, timedelta
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from controllers.viajes_controller import ViajesController
+from exceptions.viaje_exception import ViajeException
+from models.reporte import Reporte
+from repositories.viajes_repository import ViajesRepository
+from services.cache_reportes import CacheReportes
+from benchmarks import datos
+from benchmarks.arranque import RAIZ
+
+TAMANOS = {
+    "xs": (10, 50),
+    "s": (1_000, 50),
+    "m": (10_000, 50),
+    "l": (100_000, 50),
+}
+LLAMADAS = 1000
+MUESTRA_REPORTES = 100
+GASTOS_REGISTRADOS = 100
+
+
+def medir_tiempo(funcion, repeticiones: int, llamadas: int = 1, preparar=None):
+    """mide el tiempo por llamada de una funcion que hace la cantidad de llamadas dada
+
+    Args:
+        funcion (Callable[[], object]): la funcion a medir
+        repeticiones (int): cantidad de veces que se ejecuta la funcion
+        llamadas (int, optional): cantidad de llamadas que hace cada ejecucion
+        preparar (Callable[[], object], optional): se ejecuta antes de cada
+            repeticion, fuera del tiempo medido
+
+    Returns:
+        dict: tiempo por llamada en microsegundos: minimo, mediana y media
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1e6 / llamadas)
+    return {
+        "min_us": min(tiempos),
+        "mediana_us": statistics.median(tiempos),
+        "media_us": statistics.fmean(tiempos),
+    }
+
+
+def medir_memoria(funcion, preparar=None):
+    """mide el pico de memoria reservada durante una ejecucion de la funcion
+
+    Args:
+        funcion (Callable[[], object]): la funcion a medir
+        preparar (Callable[[], object], optional): se ejecuta antes de la medicion,
+            fuera de la memoria medida
+
+    Returns:
+        float: pico de memoria en KiB
+    """
+    if preparar is not None:
+        preparar()
+    tracemalloc.start()
+    try:
+        funcion()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def commit_actual():
+    """obtiene el commit actual del repositorio
+
+    Returns:
+        str | None: el hash del commit, o None si no se puede obtener
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=RAIZ,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def generar_datos(ruta: str, cantidad: int, gastos_por_viaje: int, semilla: int):
+    """genera el viajes.json sintetico, descartando el anterior y su bitacora
+
+    Args:
+        ruta (str): ruta del viajes.json a generar
+        cantidad (int): cantidad de viajes
+        gastos_por_viaje (int): cantidad de gastos de cada viaje
+        semilla (int): semilla de los datos
+    """
+    for sobrante in (ruta, ruta + ".journal"):
+        if os.path.exists(sobrante):
+            os.remove(sobrante)
+    datos.escribir_viajes(ruta, cantidad, gastos_por_viaje, semilla)
+
+
+def mediciones(ruta: str, cantidad: int, gastos_por_viaje: int, semilla: int):
+    """construye las mediciones sobre el viajes.json generado
+
+    Args:
+        ruta (str): ruta del viajes.json generado
+        cantidad (int): cantidad de viajes generados
+        gastos_por_viaje (int): cantidad de gastos de cada viaje generado
+        semilla (int): semilla de los datos y de las fechas medidas
+
+    Returns:
+        list[tuple[str, Callable[[], object], int, Callable[[], object] | None]]:
+        nombre, funcion a medir, cantidad de llamadas que hace la funcion y
+        preparacion previa a cada repeticion, en el orden en que se miden
+    """
+    aleatorio = random.Random(semilla)
+    fechas = datos.fechas_viajes(cantidad, semilla)
+    libre = fechas[-1][1] + timedelta(days=1)
+    intervalos = [
+        (inicio + timedelta(days=(fin - inicio).days // 2), fin + timedelta(days=1))
+        for inicio, fin in aleatorio.choices(fechas, k=LLAMADAS // 2)
+    ] + [(libre, libre + timedelta(days=3))] * (LLAMADAS // 2)
+    intervalos = [(inicio.isoformat(), fin.isoformat()) for inicio, fin in intervalos]
+    controller = ViajesController(
+        ViajesRepository(ruta), datos.proveedor_tasas(), CacheReportes()
+    )
+    controller.get_viajes()
+    viaje = controller.buscar_viaje(fechas[len(fechas) // 2][0])
+    duracion = (viaje.fecha_fin - viaje.fecha_inicio).days
+    dias = [
+        viaje.fecha_inicio + timedelta(days=aleatorio.randint(0, duracion))
+        for _ in range(LLAMADAS)
+    ]
+    muestra = [
+        controller.buscar_viaje(inicio)
+        for inicio, _ in aleatorio.sample(fechas, min(MUESTRA_REPORTES, cantidad))
+    ]
+    ruta_reporte = os.path.join(os.path.dirname(ruta), "reporte.txt")
+    gastos = [
+        (
+            inicio + timedelta(days=aleatorio.randint(0, (fin - inicio).days)),
+            round(aleatorio.uniform(1, 100), 2),
+        )
+        for inicio, fin in aleatorio.choices(fechas, k=GASTOS_REGISTRADOS)
+    ]
+
+    def validar_fechas():
+        for inicio, fin in intervalos:
+            try:
+                controller.validar_fechas(inicio, fin)
+            except ViajeException:
+                pass
+
+    def get_balance_dia():
+        for dia in dias:
+            viaje.get_balance_dia(dia)
+
+    def generar_reportes():
+        for viaje_muestra in muestra:
+            Reporte.generar_reportes(viaje_muestra, ruta_reporte)
+
+    registro = {}
+
+    def preparar_registro():
+        generar_datos(ruta, cantidad, gastos_por_viaje, semilla)
+        registro["controller"] = ViajesController(
+            ViajesRepository(ruta), datos.proveedor_tasas(), CacheReportes()
+        )
+        registro["controller"].get_viajes()
+
+    def registrar_gasto():
+        for fecha, valor in gastos:
+            registro["controller"].registrar_gasto(
+                fecha.isoformat(), valor, "tarjeta", "compras"
+            )
+
+    return [
+        ("get_viajes_frio", lambda: ViajesRepository(ruta).get_viajes(), 1, None),
+        ("get_viajes_caliente", controller.get_viajes, 1, None),
+        ("validar_fechas", validar_fechas, len(intervalos), None),
+        ("get_balance_dia", get_balance_dia, len(dias), None),
+        ("generar_reportes", generar_reportes, len(muestra), None),
+        ("registrar_gasto", registrar_gasto, len(gastos), preparar_registro),
+    ]
+
+
+def ejecutar_tamano(tamano: str, repeticiones: int, directorio: str, semilla: int = 0):
+    """genera los datos de un tamaño y ejecuta todas las mediciones sobre ellos
+
+    Args:
+        tamano (str): llave de TAMANOS
+        repeticiones (int): cantidad de repeticiones de cada medicion
+        directorio (str): directorio donde generar los datos
+        semilla (int, optional): semilla de los datos y de las fechas medidas
+
+    Returns:
+        dict: tamaño de los datos, tiempo de generacion y resultado de cada medicion
+    """
+    cantidad, gastos_por_viaje = TAMANOS[tamano]
+    ruta = os.path.join(directorio, tamano, "viajes.json")
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    inicio = time.perf_counter()
+    generar_datos(ruta, cantidad, gastos_por_viaje, semilla)
+    resultado = {
+        "viajes": cantidad,
+        "gastos": cantidad * gastos_por_viaje,
+        "generacion_s": time.perf_counter() - inicio,
+        "archivo_kib": os.path.getsize(ruta) / 1024,
+        "mediciones": {},
+    }
+    for nombre, funcion, llamadas, preparar in mediciones(
+        ruta, cantidad, gastos_por_viaje, semilla
+    ):
+        resultado["mediciones"][nombre] = {
+            **medir_tiempo(funcion, repeticiones, llamadas, preparar),
+            "llamadas": llamadas,
+            "pico_memoria_kib": medir_memoria(funcion, preparar),
+        }
+    return resultado
+
+
+def ejecutar(tamanos, repeticiones: int = 5, directorio: str = None, semilla: int = 0):
+    """ejecuta las mediciones de los tamaños dados
+
+    Args:
+        tamanos (Iterable[str]): llaves de TAMANOS
+        repeticiones (int, optional): cantidad de repeticiones de cada medicion
+        directorio (str, optional): directorio donde generar los datos, por defecto
+            uno temporal que se borra al terminar
+        semilla (int, optional): semilla de los datos y de las fechas medidas
+
+    Returns:
+        dict: datos de la ejecucion y resultados por tamaño
+    """
+    ejecucion = {
+        "commit": commit_actual(),
+        "python": platform.python_version(),
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "semilla": semilla,
+        "repeticiones": repeticiones,
+        "tamanos": {},
+    }
+    nivel = logging.getLogger().level
+    logging.getLogger().setLevel(logging.CRITICAL)
+    try:
+        with tempfile.TemporaryDirectory() as temporal:
+            for tamano in tamanos:
+                ejecucion["tamanos"][tamano] = ejecutar_tamano(
+                    tamano, repeticiones, directorio or temporal, semilla
+                )
+    finally:
+        logging.getLogger().setLevel(nivel)
+    return ejecucion
+
+
+def comparar(actual: dict, anterior: dict):
+    """compara la mediana de cada medicion con la de una ejecucion anterior
+
+    Args:
+        actual (dict): resultados de esta ejecucion
+        anterior (dict): resultados de la ejecucion anterior
+
+    Returns:
+        dict: {tamaño: {medicion: mediana actual / mediana anterior}} de las
+        mediciones presentes en ambas ejecuciones
+    """
+    razones = {}
+    for tamano, resultado in actual["tamanos"].items():
+        previas = anterior.get("tamanos", {}).get(tamano, {}).get("mediciones", {})
+        for nombre, medicion in resultado["mediciones"].items():
+            if previas.get(nombre, {}).get("mediana_us"):
+                razones.setdefault(tamano, {})[nombre] = (
+                    medicion["mediana_us"] / previas[nombre]["mediana_us"]
+                )
+    return razones
+
+
+def cli(argumentos=None):
+    """ejecuta las mediciones desde la linea de comandos
+
+    Args:
+        argumentos (list[str], optional): argumentos a interpretar, por defecto sys.argv
+
+    Returns:
+        int: 0 al terminar
+    """
+    parser = argparse.ArgumentParser(description="Rendimiento segun el tamaño de datos")
+    parser.add_argument(
+        "--tamanos", default="xs,s,m", help=f"separados por coma: {','.join(TAMANOS)}"
+    )
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--directorio", help="directorio donde generar los datos")
+    parser.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="archivo JSON de una ejecucion anterior")
+    args = parser.parse_args(argumentos)
+    tamanos = [tamano for tamano in args.tamanos.split(",") if tamano]
+    desconocidos = [tamano for tamano in tamanos if tamano not in TAMANOS]
+    if desconocidos:
+        parser.error(f"tamaños desconocidos: {', '.join(desconocidos)}")
+    resultado = ejecutar(tamanos, args.repeticiones, args.directorio, args.semilla)
+    razones = {}
+    if args.comparar:
+        with open(args.comparar, "r", encoding="utf-8") as f:
+            razones = comparar(resultado, json.load(f))
+    for tamano, datos_tamano in resultado["tamanos"].items():
+        print(
+            f"{tamano}: {datos_tamano['viajes']} viajes, {datos_tamano['gastos']} gastos"
+            f" ({datos_tamano['archivo_kib'] / 1024:.1f} MiB)"
+        )
+        for nombre, medicion in datos_tamano["mediciones"].items():
+            razon = razones.get(tamano, {}).get(nombre)
+            print(
+                f"  {nombre:20} {medicion['mediana_us']:12.2f} us"
+                f" {medicion['pico_memoria_kib']:12.1f} KiB"
+                + (f"  x{razon:.2f}" if razon is not None else "")
+            )
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(cli())
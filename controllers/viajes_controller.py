@@ -5,7 +5,7 @@ Incluye funcionalidades para:
 - Trabajar con fechas usando el módulo datetime.
 - Registrar y manejar errores mediante el módulo logging.
 - Convertir datos a y desde JSON.
-- Hacer solicitudes HTTP con requests.
+- Convertir montos a peso colombiano con un proveedor de tasas de cambio.
 - Definir y manipular objetos Viaje y Gasto.
 - Generar reportes con los datos de viajes y gastos.
 - Manejar excepciones personalizadas para viajes y gastos.
@@ -13,34 +13,59 @@ Incluye funcionalidades para:
 Importaciones:
 - datetime.date: Para manejar fechas relacionadas con los viajes.
 - logging: Para registrar eventos, errores y mensajes de depuración.
-- json: Para la serialización y deserialización de datos en formato JSON.
-- requests: Para hacer solicitudes HTTP a servicios externos.
+- os: Para crear el directorio y las rutas de los reportes.
+- threading: Para serializar los registros de viajes y gastos entre hilos.
 - Viaje: La clase que representa un viaje.
 - Gasto: La clase que representa un gasto.
 - Reporte: La clase que genera reportes sobre los viajes y gastos.
+- analitica: totales de gastos entre varios viajes.
 - ViajeException: Excepción personalizada para errores relacionados con viajes.
 - GastoException: Excepción personalizada para errores relacionados con gastos.
+- ConcurrenciaException: Excepción lanzada si otro proceso modificó los viajes leídos.
+- ViajesRepository: Repositorio con cache en memoria de los viajes almacenados.
+- ProveedorTasas, ProveedorTasasRemoto, TasasCache: Proveedores de tasas de cambio.
+- CacheReportes: Cache de reportes por identidad y version de cada viaje, por defecto
+  solo en memoria.
+
+concurrent.futures.ProcessPoolExecutor, usado para generar reportes de varios viajes
+en paralelo, se importa solo al generarlos, para no cargar multiprocessing al iniciar.
+Del mismo modo asyncio se importa solo en las variantes asincronas de las operaciones.
+La configuracion de logging corresponde a la aplicacion (ver main.py), no a este modulo.
 """
 
 from datetime import date
 import logging
-import json
-import requests
+import os
+import threading
 from models.viaje import Viaje
 from models.gasto import Gasto
 from models.reporte import Reporte
+from models import analitica
 from exceptions.viaje_exception import ViajeException
 from exceptions.gasto_exception import GastoException
-
-
-logging.basicConfig(
-    level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s"
-)
+from exceptions.concurrencia_exception import ConcurrenciaException
+from repositories.viajes_repository import ViajesRepository
+from services.tasas_cambio import ProveedorTasas, ProveedorTasasRemoto, TasasCache
+from services.cache_reportes import CacheReportes
 
 
 class ViajesController:
     """clase controladora de la logica de negocio de viajes y gastos"""
 
+    REINTENTOS = 3
+
+    def __init__(
+        self,
+        repositorio: ViajesRepository = None,
+        proveedor_tasas: ProveedorTasas = None,
+        cache_reportes: CacheReportes = None,
+    ) -> None:
+        self.repositorio = repositorio or ViajesRepository()
+        self.proveedor_tasas = proveedor_tasas or TasasCache(ProveedorTasasRemoto())
+        self.cache_reportes = cache_reportes or CacheReportes()
+        self.__escritura = threading.Lock()
+        self.__tasas_en_curso = {}
+
     def registrar_viaje(
         self,
         destino: str,
@@ -59,20 +84,59 @@ class ViajesController:
         Returns:
             str: mensaje exitoso de creacion de viaje o log del error ocurrido en caso de fallar
         """
-        try:
+        return self.__registrar_viaje(
+            destino, fecha_inicio, fecha_fin, presupuesto_diario
+        )
+
+    def __registrar_viaje(
+        self, destino, fecha_inicio, fecha_fin, presupuesto_diario, tasas=None
+    ):
+        """crea un nuevo registro de viaje, ver registrar_viaje
+
+        Args:
+            tasas (dict, optional): tasas de cambio ya obtenidas, por lugar
+
+        Returns:
+            str: mensaje exitoso de creacion de viaje o vacio en caso de fallar
+        """
+
+        def registrar():
             self.validar_destino(destino)
-            fecha_inicio, fecha_fin = self.validar_fechas(fecha_inicio, fecha_fin)
-            presupuesto_diario = self.convertir_moneda(
-                destino, float(presupuesto_diario)
+            inicio, fin = self.validar_fechas(fecha_inicio, fecha_fin)
+            presupuesto = self.convertir_moneda(
+                destino, float(presupuesto_diario), tasas
             )
-            viaje = Viaje(destino, fecha_inicio, fecha_fin, presupuesto_diario)
-            viajes = self.agregar_viaje(viaje)
-            self.guardar_archivo(viajes)
+            self.repositorio.agregar_viaje(Viaje(destino, inicio, fin, presupuesto))
+
+        try:
+            with self.__escritura:
+                self.__con_reintentos(registrar)
             return "Viaje registrado con exito (ver archivo viajes.json)"
-        except (ViajeException, ValueError) as e:
+        except (ViajeException, ConcurrenciaException, ValueError) as e:
             logging.error(e)
             return ""
 
+    def __con_reintentos(self, operacion):
+        """ejecuta la operacion y la repite, hasta REINTENTOS veces en total, si otro
+        proceso modifico los viajes almacenados mientras se ejecutaba
+
+        Args:
+            operacion (Callable[[], object]): la operacion, que debe volver a leer del
+                repositorio los viajes que modifica
+
+        Raises:
+            ConcurrenciaException: excepcion lanzada si el ultimo intento tambien falla
+
+        Returns:
+            object: el resultado de la operacion
+        """
+        for _ in range(self.REINTENTOS - 1):
+            try:
+                return operacion()
+            except ConcurrenciaException as e:
+                logging.warning(e)
+        return operacion()
+
     def validar_destino(self, destino: str):
         """verifica que el destino sea permitido en la aplicacion
 
@@ -88,7 +152,7 @@ class ViajesController:
     def validar_fechas(self, fecha_inicio: str, fecha_fin: str):
         """valida que:
         1. Las fechas esten en el orden correcto de tiempo
-        2. Las fechas no se crucen con ningun otro viaje
+        2. Las fechas no se crucen con ningun otro viaje (ni contengan a otro viaje)
 
         Args:
             fecha_inicio (str): fecha de inicio del viaje
@@ -104,12 +168,8 @@ class ViajesController:
         fecha_fin = date.fromisoformat(fecha_fin)
         if fecha_fin <= fecha_inicio:
             raise ViajeException("fechas incorrectas")
-        viajes = self.get_viajes()
-        for viaje in viajes:
-            if (viaje.fecha_inicio <= fecha_inicio <= viaje.fecha_fin) or (
-                viaje.fecha_inicio <= fecha_fin <= viaje.fecha_fin
-            ):
-                raise ViajeException("fechas cruzadas con otro viaje")
+        if self.repositorio.hay_cruce(fecha_inicio, fecha_fin):
+            raise ViajeException("fechas cruzadas con otro viaje")
         return fecha_inicio, fecha_fin
 
     def validar_metodo_pago(self, metodo_pago: str):
@@ -148,11 +208,24 @@ class ViajesController:
         Returns:
             tuple[list[Viaje], Viaje]: lista de todos los viajes y el viaje encontrado para la fecha
         """
-        viajes = self.get_viajes()
-        for viaje in viajes:
-            if viaje.fecha_inicio <= fecha <= viaje.fecha_fin:
-                return viajes, viaje
-        raise ViajeException("No hay ningun viaje en la fecha dada para el pago")
+        return self.get_viajes(), self.buscar_viaje(fecha)
+
+    def buscar_viaje(self, fecha: date):
+        """obtiene del repositorio el viaje que contenga la fecha especificada
+
+        Args:
+            fecha (date): la fecha que se usara para buscar el viaje
+
+        Raises:
+            ViajeException: excepcion lanzada en caso de no encontrar un viaje en la fecha indicada
+
+        Returns:
+            Viaje: el viaje encontrado para la fecha
+        """
+        viaje = self.repositorio.get_viaje(fecha)
+        if viaje is None:
+            raise ViajeException("No hay ningun viaje en la fecha dada para el pago")
+        return viaje
 
     def get_viajes(self):
         """obtiene el listado de viajes almacenados en el archivo viajes.json
@@ -160,25 +233,34 @@ class ViajesController:
         Returns:
             list[Viaje]: lista de viajes estructurados como objetos de tipo Viaje
         """
-        try:
-            with open("archivos/viajes.json", "r", encoding="utf-8") as f:
-                viajes_data = json.load(f)
-                return [Viaje.from_dict(viaje_data) for viaje_data in viajes_data]
-        except (FileNotFoundError, json.decoder.JSONDecodeError):
-            return []
+        return self.repositorio.get_viajes()
+
+    def get_resumenes(self):
+        """obtiene los viajes almacenados con el resumen de sus gastos. Los resumenes se
+        calculan bajo el candado de escritura, pues en los viajes sin totales
+        persistidos recorren gastos que otro hilo puede estar agregando
 
-    def convertir_moneda(self, lugar: str, cantidad: float):
+        Returns:
+            list[tuple[Viaje, ResumenGastos]]: cada viaje con su resumen
+        """
+        with self.__escritura:
+            return [(viaje, viaje.resumen) for viaje in self.get_viajes()]
+
+    def convertir_moneda(self, lugar: str, cantidad: float, tasas: dict = None):
         """
         -verifica que la cantidad a convertir sea positiva\n
         -hace la conversion de moneda segun corresponda\n
-        -consume una API para simular la conversion de moneda de Dolar/Euro a peso colombiano
+        -obtiene del proveedor de tasas la tasa de cambio de Dolar/Euro a peso colombiano
 
         Args:
             lugar (str): el lugar en el que se hace el viaje o gasto
             cantidad (float): la cantidad a convertir de moneda del lugar a peso colombiano
+            tasas (dict, optional): tasas ya obtenidas por lugar; si el lugar no esta,
+                se consulta al proveedor de tasas
 
         Raises:
-            ValueError: excepcion lanzada en caso de tener una cantidad negativa
+            ValueError: excepcion lanzada en caso de tener una cantidad negativa o de no
+                poder obtener la tasa de cambio
 
         Returns:
             float: la cantidad convertida a peso colombiano
@@ -187,18 +269,9 @@ class ViajesController:
             raise ValueError("no se admiten valores negativos")
         if lugar == "colombia":
             return cantidad
-        try:
-            valor_moneda = requests.get(
-                "https://csrng.net/csrng/csrng.php?min=3500&max=4500", timeout=10
-            ).json()[0]["random"]
-            if lugar == "usa":
-                return cantidad * valor_moneda
-            valor_moneda += 200
-            return cantidad * valor_moneda
-        except requests.exceptions.Timeout as e:
-            raise ValueError(
-                "La solicitud para obtener la tasa de cambio ha expirado"
-            ) from e
+        if tasas and lugar in tasas:
+            return cantidad * tasas[lugar]
+        return cantidad * self.proveedor_tasas.get_tasa(lugar)
 
     def agregar_viaje(self, viaje: Viaje):
         """obtiene la lista de viajes y agrega a la misma el viaje dado
@@ -213,14 +286,23 @@ class ViajesController:
         viajes.append(viaje)
         return viajes
 
+    def sesion(self):
+        """abre una sesion de escritura diferida en el repositorio: las operaciones
+        dentro de ella trabajan sobre los viajes en memoria y se escriben juntas al
+        cerrarla
+
+        Returns:
+            ContextManager: la sesion del repositorio, para usar con with
+        """
+        return self.repositorio.sesion()
+
     def guardar_archivo(self, viajes):
         """reescribe el archivo viajes.json con la lista de viajes dada
 
         Args:
             viajes (list[Viaje]): la lista de viajes a guardar en el archivo viajes.json
         """
-        with open("archivos/viajes.json", "w", encoding="utf-8") as f:
-            json.dump([viaje.to_dict() for viaje in viajes], f, indent=4)
+        self.repositorio.guardar(viajes)
 
     def registrar_gasto(
         self, fecha: str, valor: float, metodo_pago: str, tipo_gasto: str
@@ -236,35 +318,328 @@ class ViajesController:
         Returns:
             str: mensaje exitoso de creacion del pago o log del error ocurrido en caso de fallar
         """
-        try:
-            fecha: date = date.fromisoformat(fecha)
-            viajes, viaje = self.get_viaje(fecha)
+        return self.__registrar_gasto(fecha, valor, metodo_pago, tipo_gasto)
+
+    def __registrar_gasto(self, fecha, valor, metodo_pago, tipo_gasto, tasas=None):
+        """registra un nuevo gasto, ver registrar_gasto
+
+        Args:
+            tasas (dict, optional): tasas de cambio ya obtenidas, por lugar
+
+        Returns:
+            str: mensaje exitoso de creacion del pago o vacio en caso de fallar
+        """
+
+        def registrar():
+            viaje = self.buscar_viaje(fecha)
             self.validar_metodo_pago(metodo_pago)
             self.validar_tipo_gasto(tipo_gasto)
-            valor = self.convertir_moneda(viaje.destino, float(valor))
-            gasto = Gasto(fecha, valor, metodo_pago, tipo_gasto)
-            viaje.agregar_gasto(gasto)
-            for gasto in viaje.gastos:
-                print(gasto.to_dict())
+            gasto = Gasto(
+                fecha,
+                self.convertir_moneda(viaje.destino, float(valor), tasas),
+                metodo_pago,
+                tipo_gasto,
+            )
+            self.repositorio.agregar_gasto(viaje, gasto)
+            return viaje
+
+        try:
+            fecha: date = date.fromisoformat(fecha)
+            with self.__escritura:
+                viaje = self.__con_reintentos(registrar)
             balance_dia = viaje.get_balance_dia(fecha)
-            self.guardar_archivo(viajes)
             mensaje = "Gasto registrado con exito"
             mensaje += f"\nBalance del dia {fecha.strftime('%Y-%m-%d')}:"
             mensaje += f"\n  Presupuesto diario: {viaje.presupuesto_diario}"
             mensaje += f"\n  Gastos: {viaje.presupuesto_diario-balance_dia}"
             mensaje += f"\n  Balance dia: {balance_dia}"
             return mensaje
-        except (ViajeException, GastoException, ValueError) as e:
+        except (ViajeException, GastoException, ConcurrenciaException, ValueError) as e:
             logging.error(e)
             return ""
 
-    def generar_reportes(self, viaje: Viaje):
-        """llama al servicio de generar reporte de la clase Reporte para el viaje especificado
+    async def get_tasa_async(self, lugar: str):
+        """obtiene la tasa de cambio del lugar sin bloquear el ciclo de eventos: la
+        consulta al proveedor se ejecuta en el executor por defecto y las consultas
+        simultaneas del mismo lugar esperan una unica solicitud en curso
+
+        Args:
+            lugar (str): el lugar del viaje
+
+        Raises:
+            ValueError: excepcion lanzada si no se puede obtener la tasa
+
+        Returns:
+            float | None: la tasa de cambio, o None si el lugar usa peso colombiano
+        """
+        import asyncio
+
+        if lugar == "colombia":
+            return None
+        loop = asyncio.get_running_loop()
+        en_curso = self.__tasas_en_curso.get(lugar)
+        if en_curso is None or en_curso.get_loop() is not loop:
+            en_curso = loop.run_in_executor(None, self.proveedor_tasas.get_tasa, lugar)
+            self.__tasas_en_curso[lugar] = en_curso
+
+            def descartar(futuro):
+                if self.__tasas_en_curso.get(lugar) is futuro:
+                    del self.__tasas_en_curso[lugar]
+
+            en_curso.add_done_callback(descartar)
+        return await asyncio.shield(en_curso)
+
+    async def registrar_viaje_async(
+        self,
+        destino: str,
+        fecha_inicio: str,
+        fecha_fin: str,
+        presupuesto_diario: str,
+        ejecutor=None,
+    ):
+        """variante asincrona de registrar_viaje: espera la tasa de cambio sin
+        bloquear (ver get_tasa_async) y registra el viaje en el executor dado
+
+        Args:
+            destino (str): el lugar al que se viaja
+            fecha_inicio (str): fecha de inicio del viaje
+            fecha_fin (str): fecha de culminacion del vije
+            presupuesto_diario (str): presupuesto diario del viaje (en moneda del destino)
+            ejecutor (Executor, optional): executor del registro en el repositorio,
+                por defecto el del ciclo de eventos
+
+        Returns:
+            str: mensaje exitoso de creacion de viaje o vacio en caso de fallar
+        """
+        import asyncio
+
+        try:
+            self.validar_destino(destino)
+            tasas = {destino: await self.get_tasa_async(destino)}
+        except (ViajeException, ValueError) as e:
+            logging.error(e)
+            return ""
+        return await asyncio.get_running_loop().run_in_executor(
+            ejecutor,
+            self.__registrar_viaje,
+            destino,
+            fecha_inicio,
+            fecha_fin,
+            presupuesto_diario,
+            tasas,
+        )
+
+    async def registrar_gasto_async(
+        self,
+        fecha: str,
+        valor: float,
+        metodo_pago: str,
+        tipo_gasto: str,
+        ejecutor=None,
+    ):
+        """variante asincrona de registrar_gasto: busca el viaje en el executor dado,
+        espera la tasa de cambio de su destino sin bloquear (ver get_tasa_async) y
+        registra el gasto en el executor
+
+        Args:
+            fecha (str): la fecha del gasto realizado
+            valor (float): a valor del gasto realizado (en moneda del lugar del viaje)
+            metodo_pago (str): metodo de pago con el que se realizo el pago
+            tipo_gasto (str): el tipo de gasto que se realizo
+            ejecutor (Executor, optional): executor de las operaciones sobre el
+                repositorio, por defecto el del ciclo de eventos
+
+        Returns:
+            str: mensaje exitoso de creacion del pago o vacio en caso de fallar
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        try:
+            viaje = await loop.run_in_executor(
+                ejecutor, self.buscar_viaje, date.fromisoformat(fecha)
+            )
+            tasas = {viaje.destino: await self.get_tasa_async(viaje.destino)}
+        except (ViajeException, ValueError) as e:
+            logging.error(e)
+            return ""
+        return await loop.run_in_executor(
+            ejecutor,
+            self.__registrar_gasto,
+            fecha,
+            valor,
+            metodo_pago,
+            tipo_gasto,
+            tasas,
+        )
+
+    def registrar_gastos_lote(self, filas):
+        """registra un lote de gastos con una sola escritura en el repositorio.
+        Cada fila se valida con las mismas reglas de registrar_gasto y se asigna al
+        viaje que contenga su fecha; la tasa de cambio se consulta una vez por destino
+
+        Args:
+            filas (Iterable[dict | Exception]): filas con las llaves fecha, valor,
+                metodo_pago y tipo_gasto, o la excepcion de una fila que no se pudo leer
+
+        Returns:
+            list[dict]: resultado por fila con la llave "fila" (numero desde 1) y
+            "resultado" ("ok") o "error" (mensaje del error)
+        """
+        resultados = []
+        gastos = []
+        viajes = []
+        tasas = {"colombia": 1}
+        for numero, fila in enumerate(filas, start=1):
+            try:
+                if isinstance(fila, Exception):
+                    raise fila
+                fecha = date.fromisoformat(fila["fecha"])
+                viaje = next(
+                    (v for v in viajes if v.fecha_inicio <= fecha <= v.fecha_fin), None
+                )
+                if viaje is None:
+                    viaje = self.buscar_viaje(fecha)
+                    viajes.append(viaje)
+                self.validar_metodo_pago(fila["metodo_pago"])
+                self.validar_tipo_gasto(fila["tipo_gasto"])
+                valor = float(fila["valor"])
+                if viaje.destino not in tasas:
+                    tasas[viaje.destino] = self.proveedor_tasas.get_tasa(viaje.destino)
+                gasto = Gasto(
+                    fecha,
+                    self.convertir_moneda(viaje.destino, valor, tasas),
+                    fila["metodo_pago"],
+                    fila["tipo_gasto"],
+                )
+                gastos.append((numero, viaje, gasto))
+                resultados.append({"fila": numero, "resultado": "ok"})
+            except KeyError as e:
+                resultados.append({"fila": numero, "error": f"falta la columna {e}"})
+            except (ViajeException, GastoException, ValueError, TypeError) as e:
+                resultados.append({"fila": numero, "error": str(e)})
+        if gastos:
+            with self.__escritura:
+                rechazados = self.__con_reintentos(
+                    lambda: self.__escribir_lote(gastos)
+                )
+            for numero, error in rechazados.items():
+                resultados[numero - 1] = {"fila": numero, "error": error}
+        return resultados
+
+    def __escribir_lote(self, gastos):
+        """agrega al repositorio, con una sola escritura, los gastos cuyo viaje sigue
+        almacenado tal como estaba al validarlos
+
+        Args:
+            gastos (list[tuple[int, Viaje, Gasto]]): numero de fila, viaje y gasto
+
+        Returns:
+            dict: mensaje de error por numero de fila de los gastos no agregados
+        """
+        actuales = {}
+        validos = []
+        rechazados = {}
+        for numero, viaje, gasto in gastos:
+            if viaje.fecha_inicio not in actuales:
+                try:
+                    actual = self.buscar_viaje(viaje.fecha_inicio)
+                    if actual.identidad != viaje.identidad:
+                        raise ViajeException("el viaje cambio durante la importacion")
+                except ViajeException as e:
+                    actual = e
+                actuales[viaje.fecha_inicio] = actual
+            actual = actuales[viaje.fecha_inicio]
+            if isinstance(actual, ViajeException):
+                rechazados[numero] = str(actual)
+            else:
+                validos.append((actual, gasto))
+        if validos:
+            self.repositorio.agregar_gastos(validos)
+        return rechazados
+
+    def generar_reportes(self, viaje: Viaje, ruta: str = "archivos/reporte.txt"):
+        """genera el reporte del viaje especificado en el archivo reporte.txt. Si el
+        viaje no cambio desde la ultima vez, se reutiliza el reporte en cache
 
         Args:
             viaje (Viaje): el viaje sobre el cual se generan los reportes
+            ruta (str, optional): ruta del archivo de reporte
+
+        Returns:
+            str: mensaje indicando la correcta generacion de los reportes
+        """
+        self.cache_reportes.escribir(viaje, ruta)
+        return "Reporte generado con exito (ver archivo reporte.txt)"
+
+    def obtener_reporte(self, viaje: Viaje) -> str:
+        """obtiene el texto del reporte del viaje, reutilizando el reporte en cache si
+        el viaje no cambio desde la ultima vez
+
+        Args:
+            viaje (Viaje): el viaje sobre el cual se genera el reporte
+
+        Returns:
+            str: el reporte del viaje
+        """
+        return self.cache_reportes.obtener(viaje)
+
+    def generar_reportes_todos(
+        self, filtro=None, directorio: str = "archivos/reportes", procesos: int = None
+    ):
+        """genera en paralelo, con un pool de procesos, un reporte por cada viaje, un
+        archivo indice.txt que relaciona cada viaje con su reporte y un archivo
+        totales.txt con los totales entre todos los viajes, calculados a partir de los
+        totales agregados de cada viaje (ver analitica.totales_viajes)
+
+        Args:
+            filtro (Callable[[Viaje], bool], optional): selecciona los viajes a reportar
+            directorio (str, optional): directorio donde se escriben los reportes
+            procesos (int, optional): cantidad de procesos, por defecto uno por nucleo
 
         Returns:
             str: mensaje indicando la correcta generacion de los reportes
         """
-        return Reporte.generar_reportes(viaje)
+        viajes = [v for v in self.get_viajes() if filtro is None or filtro(v)]
+        os.makedirs(directorio, exist_ok=True)
+        rutas = [
+            os.path.join(
+                directorio,
+                f"reporte_{viaje.fecha_inicio}_{viaje.fecha_fin}_{viaje.destino}.txt",
+            )
+            for viaje in viajes
+        ]
+        datos = [
+            {
+                **Viaje(
+                    viaje.destino,
+                    viaje.fecha_inicio,
+                    viaje.fecha_fin,
+                    viaje.presupuesto_diario,
+                ).to_dict(),
+                "agregados": viaje.agregados(),
+            }
+            for viaje in viajes
+        ]
+        if procesos == 1 or len(viajes) <= 1:
+            list(map(Reporte.generar_reporte_archivo, datos, rutas))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            trabajadores = procesos or os.cpu_count() or 1
+            chunksize = max(1, len(viajes) // (trabajadores * 4))
+            with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+                list(
+                    pool.map(
+                        Reporte.generar_reporte_archivo, datos, rutas, chunksize=chunksize
+                    )
+                )
+        with open(os.path.join(directorio, "indice.txt"), "w", encoding="utf-8") as f:
+            for viaje, ruta in zip(viajes, rutas):
+                f.write(
+                    f"[{viaje.fecha_inicio} - {viaje.fecha_fin}] {viaje.destino}: "
+                    f"{os.path.basename(ruta)}\n"
+                )
+        with open(os.path.join(directorio, "totales.txt"), "w", encoding="utf-8") as f:
+            f.writelines(Reporte.lineas_totales(analitica.totales_viajes(viajes)))
+        return f"{len(viajes)} reportes generados con exito (ver directorio {directorio})"
@@ -0,0 +1,12 @@
+"""este modulo sirve para crear una excepcion personalizada relacionada a las
+escrituras concurrentes sobre los viajes almacenados
+"""
+
+
+class ConcurrenciaException(Exception):
+    """excepcion usada cuando otro proceso modifico los viajes almacenados despues de
+    leerlos, de modo que la operacion debe repetirse sobre los datos actuales
+
+    Args:
+        Exception: clase base para excepciones
+    """
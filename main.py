@@ -6,12 +6,43 @@ Incluye funcionalidades para:
 - Solicitar los datos de creacion de un viaje.
 - Solicitar los datos de creacion de un reporte.
 - Solicitar un viaje para generar sus reportes.
+- Importar gastos por lotes desde un archivo CSV o JSON Lines (comando importar-gastos).
+- Generar en paralelo los reportes de todos los viajes (comando reportes-todos).
+- Ejecutar por lotes operaciones leidas de un archivo o de la entrada estandar
+  (comando lote), con una sola escritura al final.
+- Atender solicitudes HTTP/JSON concurrentes con el mismo controlador (comando
+  servidor, ver services/servidor_http.py).
+- Elegir el almacenamiento de los viajes (opcion --almacenamiento): viajes.json por
+  defecto, una base de datos SQLite o un archivo por viaje.
+- Guardar tambien en disco la cache de reportes (opcion --cache-reportes); por
+  defecto la cache es solo en memoria.
 
 Importaciones:
+- argparse: para interpretar los comandos de la linea de comandos
+- logging: para configurar el registro de eventos al iniciar la aplicacion
+- datetime.date: para interpretar las fechas de los reportes por lotes
+- shlex: para separar los argumentos de cada operacion por lotes
+- sys: para leer las operaciones por lotes de la entrada estandar
 - ViajesController: la clase que maneja la logica de negocio de gestion de viajes y gastos
+- CacheReportes: cache de reportes de los viajes, opcionalmente en disco
+- leer_filas: lectura perezosa de las filas de un archivo de gastos
+- ViajeException: excepcion de las operaciones sobre viajes
+- GastoException: excepcion de las operaciones sobre gastos
+
+asyncio y services.servidor_http se importan solo al iniciar el servidor, y los
+repositorios SQLite y por viaje solo al elegirlos.
 """
 
+import argparse
+from datetime import date
+import logging
+import shlex
+import sys
 from controllers.viajes_controller import ViajesController
+from services.cache_reportes import CacheReportes
+from services.importador_gastos import leer_filas
+from exceptions.viaje_exception import ViajeException
+from exceptions.gasto_exception import GastoException
 
 controller = ViajesController()
 
@@ -106,5 +137,217 @@ def ver_reportes():
         print("Error al seleccionar la opcion")
 
 
+def importar_gastos(ruta: str):
+    """
+    - lee las filas de gastos del archivo dado
+    - solicita al controlador el registro de los gastos por lotes
+    - muestra al usuario los errores por fila y el resumen de la importacion
+
+    Args:
+        ruta (str): ruta del archivo CSV o JSON Lines con los gastos
+    """
+    try:
+        resultados = controller.registrar_gastos_lote(leer_filas(ruta))
+    except (OSError, ValueError) as e:
+        print(f"Error al leer el archivo de gastos: {e}")
+        return
+    errores = [resultado for resultado in resultados if "error" in resultado]
+    for error in errores:
+        print(f"  Fila {error['fila']}: {error['error']}")
+    print(
+        f"Gastos importados: {len(resultados) - len(errores)}, con errores: {len(errores)}"
+    )
+
+
+def reportes_todos(destino: str, directorio: str, procesos: int):
+    """
+    - solicita al controlador la generacion en paralelo de los reportes de los viajes
+    - muestra al usuario el resultado del proceso de generacion de los reportes
+
+    Args:
+        destino (str): si se indica, solo se reportan los viajes a este destino
+        directorio (str): directorio donde se escriben los reportes
+        procesos (int): cantidad de procesos a usar, por defecto uno por nucleo
+    """
+
+    def filtro(viaje):
+        return destino is None or viaje.destino == destino
+
+    print(controller.generar_reportes_todos(filtro, directorio, procesos))
+
+
+def ejecutar_operacion(argumentos):
+    """ejecuta una operacion por lotes sobre el controlador
+
+    Args:
+        argumentos (list[str]): nombre de la operacion seguido de sus argumentos:
+            - registrar-viaje DESTINO FECHA_INICIO FECHA_FIN PRESUPUESTO_DIARIO
+            - registrar-gasto FECHA VALOR METODO_PAGO TIPO_GASTO
+            - reporte FECHA [RUTA]
+            - reportes-todos [DIRECTORIO]
+
+    Raises:
+        ValueError: excepcion lanzada si la operacion o sus argumentos no son validos
+
+    Returns:
+        str: el resultado de la operacion
+    """
+    operacion, *valores = argumentos
+    if operacion == "registrar-viaje" and len(valores) == 4:
+        return controller.registrar_viaje(*valores)
+    if operacion == "registrar-gasto" and len(valores) == 4:
+        return controller.registrar_gasto(*valores)
+    if operacion == "reporte" and len(valores) in (1, 2):
+        viaje = controller.buscar_viaje(date.fromisoformat(valores[0]))
+        return controller.generar_reportes(viaje, *valores[1:])
+    if operacion == "reportes-todos" and len(valores) <= 1:
+        return controller.generar_reportes_todos(None, *valores)
+    raise ValueError(f"operacion no valida: {' '.join(argumentos)}")
+
+
+def ejecutar_lote(lineas):
+    """
+    - ejecuta una operacion por linea dentro de una sola sesion del controlador,
+      de modo que los viajes y gastos se escriben una sola vez al final
+    - ignora las lineas vacias y las que empiezan con #
+    - un error en una linea se reporta como error de esa linea, sin descartar las
+      operaciones anteriores de la sesion
+    - muestra al usuario el resultado de cada operacion y el resumen del lote
+
+    Args:
+        lineas (Iterable[str]): las operaciones, ver ejecutar_operacion
+    """
+    errores = 0
+    with controller.sesion():
+        for numero, linea in enumerate(lineas, start=1):
+            try:
+                argumentos = shlex.split(linea, comments=True)
+                if not argumentos:
+                    continue
+                resultado = ejecutar_operacion(argumentos)
+            except (ViajeException, GastoException, ValueError, OSError) as e:
+                errores += 1
+                print(f"  Linea {numero}: {e}")
+                continue
+            except Exception as e:
+                logging.exception("error inesperado en la linea %s del lote", numero)
+                errores += 1
+                print(f"  Linea {numero}: error inesperado: {e}")
+                continue
+            if not resultado:
+                errores += 1
+                resultado = "error en la operacion"
+            print(f"  Linea {numero}: {resultado}")
+    print(f"Operaciones con errores: {errores}")
+
+
+def servidor(host: str, puerto: int, hilos: int):
+    """
+    - atiende solicitudes HTTP/JSON con el controlador hasta que se interrumpa
+    - muestra al usuario cuando el servidor se detiene
+
+    Args:
+        host (str): direccion en la que escuchar
+        puerto (int): puerto en el que escuchar
+        hilos (int): tamaño del pool de hilos de las operaciones bloqueantes
+    """
+    import asyncio
+    from services.servidor_http import servir
+
+    try:
+        asyncio.run(servir(controller, host, puerto, hilos))
+    except KeyboardInterrupt:
+        print("Servidor detenido")
+
+
+def usar_almacenamiento(almacenamiento: str):
+    """reemplaza el controlador por uno con el repositorio de viajes indicado
+
+    Args:
+        almacenamiento (str): json (archivos/viajes.json), sqlite (archivos/viajes.db)
+            o shards (un archivo por viaje en archivos/viajes)
+    """
+    global controller
+    if almacenamiento == "sqlite":
+        from repositories.viajes_sqlite_repository import ViajesSqliteRepository
+
+        controller = ViajesController(ViajesSqliteRepository())
+    elif almacenamiento == "shards":
+        from repositories.viajes_shard_repository import ViajesShardRepository
+
+        controller = ViajesController(ViajesShardRepository())
+
+
+def configurar_logging():
+    """configura el registro de eventos de la aplicacion"""
+    logging.basicConfig(
+        level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+
+def cli(argumentos=None):
+    """
+    - configura el registro de eventos
+    - interpreta los argumentos de la linea de comandos
+    - sin comando inicia el menu interactivo
+
+    Args:
+        argumentos (list[str], optional): argumentos a interpretar, por defecto sys.argv
+    """
+    parser = argparse.ArgumentParser(description="Gestion de viajes y gastos")
+    parser.add_argument(
+        "--almacenamiento",
+        choices=("json", "sqlite", "shards"),
+        default="json",
+        help="donde se guardan los viajes (por defecto archivos/viajes.json)",
+    )
+    parser.add_argument(
+        "--cache-reportes",
+        metavar="DIRECTORIO",
+        help="guarda tambien en disco la cache de reportes (por defecto en memoria)",
+    )
+    comandos = parser.add_subparsers(dest="comando")
+    importar = comandos.add_parser(
+        "importar-gastos", help="importa gastos desde un archivo CSV o JSON Lines"
+    )
+    importar.add_argument("archivo", help="ruta del archivo .csv, .jsonl o .ndjson")
+    reportes = comandos.add_parser(
+        "reportes-todos", help="genera en paralelo un reporte por cada viaje"
+    )
+    reportes.add_argument("--destino", help="solo los viajes a este destino")
+    reportes.add_argument("--directorio", default="archivos/reportes")
+    reportes.add_argument("--procesos", type=int, help="cantidad de procesos")
+    lote = comandos.add_parser(
+        "lote", help="ejecuta operaciones por lotes, una por linea (ver ejecutar_operacion)"
+    )
+    lote.add_argument(
+        "archivo", nargs="?", default="-", help="archivo de operaciones, - para stdin"
+    )
+    servir = comandos.add_parser(
+        "servidor", help="atiende solicitudes HTTP/JSON (ver services/servidor_http.py)"
+    )
+    servir.add_argument("--host", default="127.0.0.1")
+    servir.add_argument("--puerto", type=int, default=8000)
+    servir.add_argument("--hilos", type=int, help="hilos para operaciones bloqueantes")
+    args = parser.parse_args(argumentos)
+    configurar_logging()
+    usar_almacenamiento(args.almacenamiento)
+    if args.cache_reportes:
+        controller.cache_reportes = CacheReportes(directorio=args.cache_reportes)
+    if args.comando == "importar-gastos":
+        importar_gastos(args.archivo)
+    elif args.comando == "reportes-todos":
+        reportes_todos(args.destino, args.directorio, args.procesos)
+    elif args.comando == "lote" and args.archivo == "-":
+        ejecutar_lote(sys.stdin)
+    elif args.comando == "servidor":
+        servidor(args.host, args.puerto, args.hilos)
+    elif args.comando == "lote":
+        with open(args.archivo, "r", encoding="utf-8") as archivo:
+            ejecutar_lote(archivo)
+    else:
+        main()
+
+
 if __name__ == "__main__":
-    main()
+    cli()
@@ -0,0 +1,46 @@
+"""
+Este módulo proporciona la analitica de gastos entre varios viajes.
+
+Los totales se calculan a partir de los totales agregados de cada viaje
+(Viaje.resumen), por lo que no es necesario cargar los gastos de los viajes que
+tienen sus agregados persistidos.
+
+Importaciones:
+- Gasto: La clase que representa un gasto.
+- METODOS_PAGO: los metodos de pago de los gastos.
+"""
+
+from .gasto import Gasto
+from .gastos_columnares import METODOS_PAGO
+
+
+def totales_viajes(viajes) -> dict:
+    """calcula los totales de gastos entre varios viajes a partir de los totales de
+    cada viaje (Viaje.resumen), sin cargar sus gastos si el viaje tiene sus totales
+    agregados persistidos
+
+    Args:
+        viajes (Iterable[Viaje]): los viajes a totalizar
+
+    Returns:
+        dict: con las llaves "total", "por_tipo" ({tipo: total}), "por_metodo"
+        ({metodo: total}) y "por_destino" ({destino: total}, ordenado por destino).
+        Los totales sin gastos son 0
+    """
+    resultado = {
+        "total": 0,
+        "por_tipo": dict.fromkeys(Gasto.tipos_gasto, 0),
+        "por_metodo": dict.fromkeys(METODOS_PAGO, 0),
+    }
+    por_destino = {}
+    for viaje in viajes:
+        resumen = viaje.resumen
+        resultado["total"] += resumen.total
+        por_destino[viaje.destino] = por_destino.get(viaje.destino, 0) + resumen.total
+        for tipo_gasto in Gasto.tipos_gasto:
+            efectivo, tarjeta, total = resumen.totales_tipo(tipo_gasto)
+            resultado["por_tipo"][tipo_gasto] += total
+            resultado["por_metodo"]["efectivo"] += efectivo
+            resultado["por_metodo"]["tarjeta"] += tarjeta
+    resultado["por_destino"] = dict(sorted(por_destino.items()))
+    return resultado
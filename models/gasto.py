@@ -11,6 +11,8 @@ from datetime import date
 class Gasto:
     """clse que representa un gasto"""
 
+    __slots__ = ("__fecha", "__valor", "__metodo_pago", "__tipo_gasto")
+
     tipos_gasto = [
         "transporte",
         "alojamiento",
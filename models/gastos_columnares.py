@@ -0,0 +1,137 @@
+"""
+Este módulo proporciona un almacenamiento columnar para los gastos de un viaje.
+
+En lugar de una lista de objetos Gasto, cada atributo se guarda en un arreglo
+contiguo: las fechas como ordinales, los valores como float64 y el metodo de pago y
+el tipo de gasto como codigos enteros pequeños. Los objetos Gasto se construyen
+solo cuando se accede a ellos.
+
+Importaciones:
+- array.array: para los arreglos contiguos de cada columna.
+- datetime.date: para convertir entre fechas y ordinales.
+- Gasto: La clase que representa un gasto.
+"""
+
+from array import array
+from datetime import date
+from .gasto import Gasto
+
+METODOS_PAGO = ("efectivo", "tarjeta")
+
+
+class GastosColumnares:
+    """secuencia de gastos almacenada por columnas que entrega objetos Gasto a demanda"""
+
+    __slots__ = ("__fechas", "__valores", "__metodos", "__tipos")
+
+    def __init__(self, gastos=()) -> None:
+        self.__fechas = array("i")
+        self.__valores = array("d")
+        self.__metodos = array("b")
+        self.__tipos = array("b")
+        for gasto in gastos:
+            self.append(gasto)
+
+    @property
+    def fechas(self) -> array:
+        """retorna el atributo __fechas
+
+        Returns:
+            array: ordinales de las fechas de los gastos
+        """
+        return self.__fechas
+
+    @property
+    def valores(self) -> array:
+        """retorna el atributo __valores
+
+        Returns:
+            array: valores de los gastos
+        """
+        return self.__valores
+
+    @property
+    def metodos(self) -> array:
+        """retorna el atributo __metodos
+
+        Returns:
+            array: codigos de metodo de pago, posiciones en METODOS_PAGO
+        """
+        return self.__metodos
+
+    @property
+    def tipos(self) -> array:
+        """retorna el atributo __tipos
+
+        Returns:
+            array: codigos de tipo de gasto, posiciones en Gasto.tipos_gasto
+        """
+        return self.__tipos
+
+    def append(self, gasto: Gasto):
+        """agrega un gasto al final de las columnas
+
+        Args:
+            gasto (Gasto): el gasto a agregar
+
+        Raises:
+            ValueError: excepcion lanzada si el metodo de pago o el tipo de gasto no es valido
+        """
+        metodo = METODOS_PAGO.index(gasto.metodo_pago)
+        tipo = Gasto.tipos_gasto.index(gasto.tipo_gasto)
+        self.__fechas.append(gasto.fecha.toordinal())
+        self.__valores.append(gasto.valor)
+        self.__metodos.append(metodo)
+        self.__tipos.append(tipo)
+
+    def __len__(self) -> int:
+        return len(self.__valores)
+
+    def __gasto(self, posicion: int) -> Gasto:
+        """construye el objeto Gasto de la posicion dada
+
+        Args:
+            posicion (int): posicion del gasto
+
+        Returns:
+            Gasto: el gasto de esa posicion
+        """
+        return Gasto(
+            date.fromordinal(self.__fechas[posicion]),
+            self.__valores[posicion],
+            METODOS_PAGO[self.__metodos[posicion]],
+            Gasto.tipos_gasto[self.__tipos[posicion]],
+        )
+
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            return [self.__gasto(i) for i in range(*posicion.indices(len(self)))]
+        if posicion < 0:
+            posicion += len(self)
+        if not 0 <= posicion < len(self):
+            raise IndexError("indice de gasto fuera de rango")
+        return self.__gasto(posicion)
+
+    def __iter__(self):
+        for posicion in range(len(self)):
+            yield self.__gasto(posicion)
+
+    def total(self) -> float:
+        """suma los valores de todos los gastos
+
+        Returns:
+            float: total de los gastos
+        """
+        return sum(self.__valores)
+
+    def total_dia(self, fecha: date) -> float:
+        """suma los valores de los gastos de la fecha dada
+
+        Args:
+            fecha (date): la fecha a consultar
+
+        Returns:
+            float: total de los gastos de la fecha
+        """
+        ordinal = fecha.toordinal()
+        return sum(v for f, v in zip(self.__fechas, self.__valores) if f == ordinal)
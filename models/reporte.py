@@ -3,103 +3,208 @@ Este modulo trabaja como servicio de generacion de reportes para viajes
 
 Incluye funcionalidades para:
 - generar reportes por dias y por tipos de gastos para un viaje
+- emitir el reporte linea a linea hacia un archivo o cualquier flujo de texto
 
 Importaciones:
 - datetime.timedelta: util para iterar entre dos fechas para la generacion de reportes por dias
+- os: para el reemplazo atomico del archivo de reporte
+- threading: para nombrar el archivo temporal de la escritura atomica por hilo
 - Viaje: La clase que representa un viaje.
 - Gasto: La clase que representa un gasto.
+- ResumenGastos: totales de los gastos agregados en una sola pasada.
 """
 
 from datetime import timedelta
+import os
+import threading
 from models.gasto import Gasto
 from models.viaje import Viaje
+from models.resumen_gastos import ResumenGastos
 
 
 class Reporte:
     """clase que brinda los servicios de generacion de reportes"""
 
     @staticmethod
-    def generar_reportes(viaje: Viaje):
+    def generar_reportes(
+        viaje: Viaje, ruta: str = "archivos/reporte.txt", atomico: bool = True
+    ):
         """genera un reporte general para el viaje dado y sobreescribe el archivo reporte.txt
 
         Args:
             viaje (Viaje): el viaje sobre el cual generar el reporte
+            ruta (str, optional): ruta del archivo de reporte
+            atomico (bool, optional): escribir en un archivo temporal y renombrarlo al
+                terminar, para que nunca se lea un reporte a medio escribir
 
         Returns:
             str: mensaje indicando la correcta generacion de los reportes
         """
-        contenido = "--- Reporte de gastos para el viaje entre las fechas "
-        contenido += (
-            f"{viaje.fecha_inicio} y {viaje.fecha_fin} en {viaje.destino} ---\n"
+        Reporte.escribir_reporte(viaje, ruta, atomico)
+        return "Reporte generado con exito (ver archivo reporte.txt)"
+
+    @staticmethod
+    def generar_reporte_archivo(viaje_data: dict, ruta: str):
+        """genera de forma atomica el reporte de un viaje en la ruta dada. Recibe el
+        viaje como dict para poder ejecutarse en un proceso independiente. Si el dict
+        incluye "agregados" (ver Viaje.agregados), el reporte se genera con esos totales
+        en lugar de los gastos
+
+        Args:
+            viaje_data (dict): el viaje en formato dict (ver Viaje.to_dict)
+            ruta (str): ruta del archivo de reporte
+
+        Returns:
+            str: la ruta del reporte generado
+        """
+        agregados = viaje_data.get("agregados")
+        Reporte.escribir_reporte(
+            Viaje.from_dict(viaje_data),
+            ruta,
+            atomico=True,
+            resumen=None if agregados is None else ResumenGastos.from_dict(agregados),
         )
-        gasto_total = sum(gasto.valor for gasto in viaje.gastos)
-        if len(viaje.gastos) > 0:
-            contenido += Reporte.reporte_dias(viaje)
-            contenido += Reporte.reporte_tipos(viaje)
+        return ruta
+
+    @staticmethod
+    def escribir_reporte(
+        viaje: Viaje, destino, atomico: bool = False, resumen: ResumenGastos = None
+    ):
+        """escribe linea a linea el reporte del viaje en el destino dado
+
+        Args:
+            viaje (Viaje): el viaje sobre el cual generar el reporte
+            destino (str | TextIO): ruta del archivo o flujo de texto abierto
+            atomico (bool, optional): si el destino es una ruta, escribir en un archivo
+                temporal del mismo directorio y reemplazar el destino al terminar
+            resumen (ResumenGastos, optional): totales a usar, por defecto los del viaje
+        """
+        if hasattr(destino, "write"):
+            destino.writelines(Reporte.lineas_reporte(viaje, resumen))
+            return
+        if not atomico:
+            with open(destino, "w", encoding="utf-8") as reporte:
+                reporte.writelines(Reporte.lineas_reporte(viaje, resumen))
+            return
+        temporal = f"{destino}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporal, "w", encoding="utf-8") as reporte:
+                reporte.writelines(Reporte.lineas_reporte(viaje, resumen))
+            os.replace(temporal, destino)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+
+    @staticmethod
+    def lineas_reporte(viaje: Viaje, resumen: ResumenGastos = None):
+        """genera una a una las lineas del reporte general del viaje
+
+        Args:
+            viaje (Viaje): el viaje sobre el cual generar el reporte
+            resumen (ResumenGastos, optional): totales a usar, por defecto los del viaje
+
+        Yields:
+            str: lineas del reporte, cada una terminada en salto de linea
+        """
+        if resumen is None:
+            resumen = viaje.resumen
+        yield "--- Reporte de gastos para el viaje entre las fechas "
+        yield f"{viaje.fecha_inicio} y {viaje.fecha_fin} en {viaje.destino} ---\n"
+        if resumen.cantidad > 0:
+            yield from Reporte.lineas_dias(viaje, resumen)
+            yield from Reporte.lineas_tipos(resumen)
         else:
-            contenido += "No hay gastos registrados para este viaje\n"
-        contenido += f"Gastos totales del viaje : {gasto_total}\n"
-        with open("archivos/reporte.txt", "w", encoding="utf-8") as reporte:
-            reporte.write(contenido)
-        return "Reporte generado con exito (ver archivo reporte.txt)"
+            yield "No hay gastos registrados para este viaje\n"
+        yield f"Gastos totales del viaje : {resumen.total}\n"
 
     @staticmethod
-    def reporte_dias(viaje: Viaje):
+    def reporte_dias(viaje: Viaje, resumen: ResumenGastos = None):
         """genera el reporte de gastos por dias del viaje
 
         Args:
             viaje (Viaje): el viaje sobre el cual se genera el reporte
+            resumen (ResumenGastos, optional): totales a usar, por defecto los del viaje
 
         Returns:
             str: contenido del reporte por dias
         """
+        if resumen is None:
+            resumen = viaje.resumen
+        return "".join(Reporte.lineas_dias(viaje, resumen))
+
+    @staticmethod
+    def lineas_dias(viaje: Viaje, resumen: ResumenGastos):
+        """genera una a una las lineas del reporte de gastos por dias del viaje
+
+        Args:
+            viaje (Viaje): el viaje sobre el cual se genera el reporte
+            resumen (ResumenGastos): resumen de los gastos del viaje
+
+        Yields:
+            str: lineas del reporte por dias
+        """
         delta = timedelta(days=1)
         fecha = viaje.fecha_inicio
-        contenido = "\nReporte de gastos por dias:\n"
+        yield "\nReporte de gastos por dias:\n"
         while fecha <= viaje.fecha_fin:
-            total_dia = 0
-            total_dia_efectivo = 0
-            total_dia_tarjeta = 0
-            for gasto in viaje.gastos:
-                if gasto.fecha == fecha:
-                    if gasto.metodo_pago == "efectivo":
-                        total_dia_efectivo += gasto.valor
-                        total_dia += gasto.valor
-                    else:
-                        total_dia_tarjeta += gasto.valor
-                        total_dia += gasto.valor
-            contenido += f"  Gastos {fecha}:\n"
-            contenido += f"    Efectivo: {total_dia_efectivo}\n"
-            contenido += f"    Tarjeta : {total_dia_tarjeta}\n"
-            contenido += f"    Total   : {total_dia}\n\n"
+            efectivo, tarjeta, total = resumen.totales_dia(fecha)
+            yield f"  Gastos {fecha}:\n"
+            yield f"    Efectivo: {efectivo}\n"
+            yield f"    Tarjeta : {tarjeta}\n"
+            yield f"    Total   : {total}\n\n"
             fecha += delta
-        return contenido
 
     @staticmethod
-    def reporte_tipos(viaje: Viaje):
+    def reporte_tipos(viaje: Viaje, resumen: ResumenGastos = None):
         """genera el reporte de gastos por tipos de gasto del viaje
 
         Args:
             viaje (Viaje): el viaje sobre el cual se genera el reporte
+            resumen (ResumenGastos, optional): totales a usar, por defecto los del viaje
 
         Returns:
             str: contenido del reporte por tipos
         """
-        contenido = "\nReporte de gastos por tipo:\n"
+        if resumen is None:
+            resumen = viaje.resumen
+        return "".join(Reporte.lineas_tipos(resumen))
+
+    @staticmethod
+    def lineas_tipos(resumen: ResumenGastos):
+        """genera una a una las lineas del reporte de gastos por tipos de gasto
+
+        Args:
+            resumen (ResumenGastos): resumen de los gastos del viaje
+
+        Yields:
+            str: lineas del reporte por tipos
+        """
+        yield "\nReporte de gastos por tipo:\n"
         for tipo_gasto in Gasto.tipos_gasto:
-            total_tipo = 0
-            total_tipo_efectivo = 0
-            total_tipo_tarjeta = 0
-            for gasto in viaje.gastos:
-                if gasto.tipo_gasto == tipo_gasto:
-                    if gasto.metodo_pago == "efectivo":
-                        total_tipo_efectivo += gasto.valor
-                        total_tipo += gasto.valor
-                    else:
-                        total_tipo_tarjeta += gasto.valor
-                        total_tipo += gasto.valor
-            contenido += f"  Gastos en {tipo_gasto}:\n"
-            contenido += f"    Efectivo: {total_tipo_efectivo}\n"
-            contenido += f"    Tarjeta : {total_tipo_tarjeta}\n"
-            contenido += f"    Total   : {total_tipo}\n\n"
-        return contenido
+            efectivo, tarjeta, total = resumen.totales_tipo(tipo_gasto)
+            yield f"  Gastos en {tipo_gasto}:\n"
+            yield f"    Efectivo: {efectivo}\n"
+            yield f"    Tarjeta : {tarjeta}\n"
+            yield f"    Total   : {total}\n\n"
+
+    @staticmethod
+    def lineas_totales(totales: dict):
+        """genera una a una las lineas del reporte de totales entre varios viajes
+
+        Args:
+            totales (dict): totales de los viajes (ver analitica.totales_viajes)
+
+        Yields:
+            str: lineas del reporte de totales
+        """
+        yield "--- Totales de gastos de los viajes ---\n"
+        for titulo, llave in (
+            ("tipo", "por_tipo"),
+            ("metodo de pago", "por_metodo"),
+            ("destino", "por_destino"),
+        ):
+            yield f"\nGastos por {titulo}:\n"
+            for nombre, valor in totales[llave].items():
+                yield f"  {nombre}: {valor}\n"
+        yield f"\nGastos totales de los viajes : {totales['total']}\n"
@@ -0,0 +1,178 @@
+"""
+Este módulo proporciona una abstraccion ResumenGastos con los totales agregados de
+los gastos de un viaje.
+
+Los gastos se recorren en una sola pasada, en la que se acumulan a la vez los totales
+por dia y por tipo de gasto, separados por metodo de pago, y el total general. Solo
+se guardan los totales que consultan los reportes y balances, para que los agregados
+persistidos de cada viaje no crezcan con la cantidad de combinaciones de dia, tipo y
+metodo de pago.
+
+Importaciones:
+- datetime.date: para el manejo de fechas.
+- Gasto: La clase que representa un gasto.
+- GastosColumnares: almacenamiento columnar de gastos, que se agrega sin construir
+  objetos Gasto.
+- METODOS_PAGO: codigos de los metodos de pago de los gastos codificados.
+"""
+
+from datetime import date
+from .gasto import Gasto
+from .gastos_columnares import GastosColumnares, METODOS_PAGO
+
+
+class ResumenGastos:
+    """clase que representa los totales agregados de un conjunto de gastos.
+
+    Los totales por dia y por tipo se consultan como (efectivo, tarjeta, total)"""
+
+    def __init__(self) -> None:
+        self.__por_dia = {}
+        self.__por_tipo = {}
+        self.__total = 0
+        self.__cantidad = 0
+
+    @staticmethod
+    def desde_gastos(gastos) -> "ResumenGastos":
+        """construye el resumen recorriendo una sola vez los gastos dados. Si los gastos
+        estan almacenados por columnas se recorren las columnas sin construir objetos Gasto
+
+        Args:
+            gastos (Iterable[Gasto] | GastosColumnares): los gastos a agregar
+
+        Returns:
+            ResumenGastos: el resumen de los gastos
+        """
+        if isinstance(gastos, GastosColumnares):
+            return ResumenGastos.desde_registros(
+                zip(gastos.fechas, gastos.valores, gastos.metodos, gastos.tipos)
+            )
+        resumen = ResumenGastos()
+        for gasto in gastos:
+            resumen.agregar(gasto)
+        return resumen
+
+    @staticmethod
+    def desde_registros(registros) -> "ResumenGastos":
+        """construye el resumen a partir de gastos codificados, sin construir objetos Gasto
+
+        Args:
+            registros (Iterable[tuple]): tuplas (ordinal de la fecha, valor, codigo de
+                metodo de pago, codigo de tipo de gasto), con los codigos como posiciones
+                en METODOS_PAGO y Gasto.tipos_gasto
+
+        Returns:
+            ResumenGastos: el resumen de los gastos
+        """
+        resumen = ResumenGastos()
+        fechas = {}
+        for ordinal, valor, metodo, tipo in registros:
+            fecha = fechas.get(ordinal)
+            if fecha is None:
+                fecha = fechas[ordinal] = date.fromordinal(ordinal)
+            resumen.__acumular(
+                fecha, valor, METODOS_PAGO[metodo], Gasto.tipos_gasto[tipo]
+            )
+        return resumen
+
+    def agregar(self, gasto: Gasto):
+        """acumula el gasto dado en todos los totales del resumen
+
+        Args:
+            gasto (Gasto): el gasto a acumular
+        """
+        self.__acumular(gasto.fecha, gasto.valor, gasto.metodo_pago, gasto.tipo_gasto)
+
+    def __acumular(self, fecha: date, valor: float, metodo_pago: str, tipo_gasto: str):
+        """acumula un gasto, dado por sus atributos, en todos los totales del resumen
+
+        Args:
+            fecha (date): fecha del gasto
+            valor (float): valor del gasto
+            metodo_pago (str): metodo de pago del gasto
+            tipo_gasto (str): tipo del gasto
+        """
+        metodo = 0 if metodo_pago == "efectivo" else 1
+        for totales, clave in ((self.__por_dia, fecha), (self.__por_tipo, tipo_gasto)):
+            acumulado = totales.get(clave)
+            if acumulado is None:
+                acumulado = totales[clave] = [0, 0, 0]
+            acumulado[metodo] += valor
+            acumulado[2] += valor
+        self.__total += valor
+        self.__cantidad += 1
+
+    @property
+    def total(self) -> float:
+        """retorna el atributo __total
+
+        Returns:
+            float: total de los gastos
+        """
+        return self.__total
+
+    @property
+    def cantidad(self) -> int:
+        """retorna el atributo __cantidad
+
+        Returns:
+            int: cantidad de gastos agregados
+        """
+        return self.__cantidad
+
+    def totales_dia(self, fecha: date):
+        """obtiene los totales de la fecha dada
+
+        Args:
+            fecha (date): la fecha a consultar
+
+        Returns:
+            tuple: (efectivo, tarjeta, total) de la fecha
+        """
+        return tuple(self.__por_dia.get(fecha, (0, 0, 0)))
+
+    def totales_tipo(self, tipo_gasto: str):
+        """obtiene los totales del tipo de gasto dado
+
+        Args:
+            tipo_gasto (str): el tipo de gasto a consultar
+
+        Returns:
+            tuple: (efectivo, tarjeta, total) del tipo de gasto
+        """
+        return tuple(self.__por_tipo.get(tipo_gasto, (0, 0, 0)))
+
+    def to_dict(self) -> dict:
+        """reescribe los totales del resumen en formato dict, serializable como JSON
+
+        Returns:
+            dict: los totales por dia y por tipo, el total y la cantidad
+        """
+        return {
+            "cantidad": self.__cantidad,
+            "total": self.__total,
+            "dias": [
+                [fecha.isoformat()] + totales for fecha, totales in self.__por_dia.items()
+            ],
+            "tipos": [[tipo] + totales for tipo, totales in self.__por_tipo.items()],
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "ResumenGastos":
+        """estructura un resumen a partir de los totales en formato dict, sin recorrer
+        los gastos
+
+        Args:
+            data (dict): los totales del resumen (ver ResumenGastos.to_dict)
+
+        Returns:
+            ResumenGastos: el resumen con esos totales
+        """
+        resumen = ResumenGastos()
+        resumen.__cantidad = data["cantidad"]
+        resumen.__total = data["total"]
+        resumen.__por_dia = {
+            date.fromisoformat(fecha): totales for fecha, *totales in data["dias"]
+        }
+        resumen.__por_tipo = {tipo: totales for tipo, *totales in data["tipos"]}
+        return resumen
@@ -3,11 +3,31 @@ Este módulo proporciona una abstraccion Viaje al controlador.
 
 Importaciones:
 - datetime.date: para el manejo de fechas.
+- zlib: para la suma de verificacion incremental que identifica la version del viaje.
 - Gasto: Clase que representa un gasto en el sistema de viajes.
+- GastosColumnares: almacenamiento columnar opcional para los gastos del viaje.
+- ResumenGastos: totales de los gastos del viaje mantenidos al agregar cada gasto.
 """
 
 from datetime import date
+import zlib
 from .gasto import Gasto
+from .gastos_columnares import GastosColumnares
+from .resumen_gastos import ResumenGastos
+
+
+class _GastosPendientes:
+    """carga perezosa de los gastos de un viaje junto con los gastos agregados despues,
+    que tampoco se han estructurado en el viaje"""
+
+    __slots__ = ("cargar", "agregados")
+
+    def __init__(self, cargar) -> None:
+        self.cargar = cargar
+        self.agregados = []
+
+    def __call__(self):
+        return list(self.cargar()) + [gasto.to_dict() for gasto in self.agregados]
 
 
 class Viaje:
@@ -15,18 +35,33 @@ class Viaje:
     clase que representa un viaje
     """
 
+    __slots__ = (
+        "__destino",
+        "__fecha_inicio",
+        "__fecha_fin",
+        "__presupuesto_diario",
+        "__gastos",
+        "__resumen",
+        "__pendientes",
+        "__version",
+    )
+
     def __init__(
         self,
         destino: str,
         fecha_inicio: date,
         fecha_fin: date,
         presupuesto_diario: float,
+        columnar: bool = False,
     ) -> None:
         self.__destino = destino
         self.__fecha_inicio = fecha_inicio
         self.__fecha_fin = fecha_fin
         self.__presupuesto_diario = presupuesto_diario
-        self.__gastos = []
+        self.__gastos = GastosColumnares() if columnar else []
+        self.__resumen = ResumenGastos()
+        self.__pendientes = None
+        self.__version = None
 
     @property
     def destino(self) -> str:
@@ -69,31 +104,149 @@ class Viaje:
         """retorna el atributo __gastos
 
         Returns:
-            list[Gasto]: listado de gastos del viaje
+            list[Gasto] | GastosColumnares: listado de gastos del viaje
         """
+        self.__materializar()
         return self.__gastos
 
+    @property
+    def resumen(self) -> ResumenGastos:
+        """retorna el atributo __resumen. Si el viaje se estructuro con sus agregados
+        persistidos no es necesario cargar los gastos
+
+        Returns:
+            ResumenGastos: totales de los gastos del viaje por dia, tipo y metodo de pago
+        """
+        if self.__resumen is None:
+            self.__materializar()
+        return self.__resumen
+
     def agregar_gasto(self, gasto: Gasto):
-        """añade a la lista de gastos del viaje el gasto dado
+        """añade a la lista de gastos del viaje el gasto dado y lo acumula en los totales.
+        Si los gastos aun no se han cargado pero los totales si, el gasto queda pendiente
+        junto con ellos
 
         Args:
             gasto (Gasto): el gasto a añador al viaje
         """
-        self.__gastos.append(gasto)
+        if self.__pendientes is not None and self.__resumen is not None:
+            if not isinstance(self.__pendientes, _GastosPendientes):
+                self.__pendientes = _GastosPendientes(self.__pendientes)
+            self.__pendientes.agregados.append(gasto)
+        else:
+            self.__materializar()
+            self.__gastos.append(gasto)
+        self.__resumen.agregar(gasto)
+        if self.__version is not None:
+            self.__version = Viaje.__acumular_version(self.__version, gasto)
+
+    @staticmethod
+    def __acumular_version(version: int, gasto: Gasto) -> int:
+        """actualiza la suma de verificacion de los gastos con un gasto mas
+
+        Args:
+            version (int): suma de verificacion de los gastos anteriores
+            gasto (Gasto): el gasto agregado
+
+        Returns:
+            int: suma de verificacion incluyendo el gasto
+        """
+        registro = (
+            f"{gasto.fecha.isoformat()},{gasto.valor!r},"
+            f"{gasto.metodo_pago},{gasto.tipo_gasto};"
+        )
+        return zlib.crc32(registro.encode("utf-8"), version)
+
+    @property
+    def identidad(self) -> tuple:
+        """identifica el viaje por sus atributos, sin incluir los gastos
+
+        Returns:
+            tuple: (destino, fecha de inicio, fecha de fin, presupuesto diario)
+        """
+        return (
+            self.destino,
+            self.fecha_inicio.isoformat(),
+            self.fecha_fin.isoformat(),
+            self.presupuesto_diario,
+        )
+
+    @property
+    def version(self) -> tuple:
+        """version de los gastos del viaje, que cambia con cada gasto agregado. Se
+        calcula la primera vez que se consulta y luego se actualiza al agregar gastos
+
+        Returns:
+            tuple: (cantidad de gastos, suma de verificacion de los gastos)
+        """
+        if self.__version is None:
+            version = 0
+            for gasto in self.gastos:
+                version = Viaje.__acumular_version(version, gasto)
+            self.__version = version
+        return (self.resumen.cantidad, self.__version)
+
+    def agregados(self) -> dict:
+        """obtiene los totales de los gastos del viaje y su version, para persistirlos
+        junto al viaje y estructurarlo despues sin cargar sus gastos (ver from_dict)
+
+        Returns:
+            dict: los totales del viaje (ver ResumenGastos.to_dict) y su version
+        """
+        return {**self.resumen.to_dict(), "version": self.version[1]}
+
+    def __cargar_gastos(self, gastos, resumen: ResumenGastos = None):
+        """añade los gastos dados y reconstruye los totales una sola vez
+
+        Args:
+            gastos (Iterable[Gasto]): los gastos a añadir
+            resumen (ResumenGastos, optional): totales ya calculados de esos gastos
+        """
+        for gasto in gastos:
+            self.__gastos.append(gasto)
+        if resumen is None:
+            resumen = ResumenGastos.desde_gastos(self.__gastos)
+        self.__resumen = resumen
+
+    def __materializar(self):
+        """estructura los gastos pendientes de cargar, si los hay"""
+        if self.__pendientes is not None:
+            gastos_data = self.__pendientes()
+            self.__pendientes = None
+            self.__cargar_gastos(
+                (Gasto.from_dict(gasto_data) for gasto_data in gastos_data),
+                self.__resumen,
+            )
+
+    @property
+    def gastos_cargados(self) -> bool:
+        """indica si los gastos del viaje ya fueron estructurados
+
+        Returns:
+            bool: False si los gastos aun estan pendientes de cargar
+        """
+        return self.__pendientes is None
+
+    def set_origen_gastos(self, cargar_gastos):
+        """reemplaza la funcion que carga los gastos pendientes, por ejemplo cuando el
+        archivo del que provienen se reescribe. No tiene efecto si ya estan cargados
+
+        Args:
+            cargar_gastos (Callable[[], list[dict]]): funcion que retorna los gastos en formato dict
+        """
+        if self.__pendientes is not None:
+            self.__pendientes = cargar_gastos
 
     def get_balance_dia(self, fecha):
         """calcula la diferencia entre el presupuesto diario y los gastos de la fecha dada
 
         Args:
-            fecha (_type_): la fecha sobre la que se calcula el balance
+            fecha (date): la fecha sobre la que se calcula el balance
 
         Returns:
             float: balance de la fecha dada
         """
-        balance = self.presupuesto_diario
-        for gasto in self.get_gastos_dia(fecha):
-            balance -= gasto.valor
-        return balance
+        return self.presupuesto_diario - self.resumen.totales_dia(fecha)[2]
 
     def get_gastos_dia(self, fecha: date):
         """obtiene los gastos de una fecha dada
@@ -106,7 +259,6 @@ class Viaje:
         """
         gastos_dia = []
         for gasto in self.gastos:
-            print(gasto.fecha == fecha)
             if gasto.fecha == fecha:
                 gastos_dia.append(gasto)
         return gastos_dia
@@ -122,15 +274,25 @@ class Viaje:
             "fecha_inicio": self.fecha_inicio.strftime("%Y-%m-%d"),
             "fecha_fin": self.fecha_fin.strftime("%Y-%m-%d"),
             "presupuesto_diario": self.presupuesto_diario,
-            "gastos": [gasto.to_dict() for gasto in self.gastos],
+            "gastos": (
+                self.__pendientes()
+                if self.__pendientes is not None
+                else [gasto.to_dict() for gasto in self.__gastos]
+            ),
         }
 
     @staticmethod
-    def from_dict(data: dict) -> "Viaje":
+    def from_dict(data: dict, columnar: bool = False, cargar_gastos=None) -> "Viaje":
         """estructura un objeto de tipo Viaje a partir de un dict con los atributos
 
         Args:
             data (dict): el dict con los atributos del viaje
+            columnar (bool, optional): almacenar los gastos por columnas (GastosColumnares)
+            cargar_gastos (Callable[[], list[dict]], optional): funcion que retorna los
+                gastos en formato dict. Si se indica, se ignoran los gastos de data y se
+                estructuran solo la primera vez que se accede a ellos. Si ademas data
+                incluye "agregados" (ver Viaje.agregados), los totales y la version se
+                toman de alli sin cargar los gastos
 
         Returns:
             Viaje: el objeto estructurado a partir del dict
@@ -138,8 +300,22 @@ class Viaje:
         fecha_inicio = date.fromisoformat(data["fecha_inicio"])
         fecha_fin = date.fromisoformat(data["fecha_fin"])
         viaje = Viaje(
-            data["destino"], fecha_inicio, fecha_fin, data["presupuesto_diario"]
+            data["destino"],
+            fecha_inicio,
+            fecha_fin,
+            data["presupuesto_diario"],
+            columnar,
+        )
+        if cargar_gastos is not None:
+            viaje.__pendientes = cargar_gastos
+            agregados = data.get("agregados")
+            if agregados is None:
+                viaje.__resumen = None
+            else:
+                viaje.__resumen = ResumenGastos.from_dict(agregados)
+                viaje.__version = agregados["version"]
+            return viaje
+        viaje.__cargar_gastos(
+            Gasto.from_dict(gasto_data) for gasto_data in data["gastos"]
         )
-        for gasto_data in data["gastos"]:
-            viaje.agregar_gasto(Gasto.from_dict(gasto_data))
         return viaje
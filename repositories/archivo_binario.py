@@ -0,0 +1,378 @@
+"""
+Este módulo lee y escribe los gastos de los viajes en un formato binario de registros
+de ancho fijo.
+
+El almacenamiento es un directorio con dos archivos:
+- gastos.<version>.bin: los gastos de todos los viajes, uno tras otro, cada uno
+  empaquetado como (ordinal de la fecha, valor, codigo de metodo de pago, codigo de
+  tipo de gasto) en 14 bytes. Los gastos de cada viaje quedan contiguos. Los valores
+  enteros se marcan con el bit ENTERO en el codigo de metodo de pago para que vuelvan
+  a leerse como int y los reportes no cambien.
+- encabezados.json: tabla con la version, el tamaño del archivo de gastos que le
+  corresponde y los encabezados de los viajes con la posicion y cantidad de sus
+  registros.
+
+Cada escritura crea un archivo de gastos con una version nueva y reemplaza la tabla
+de encabezados al final, de modo que una interrupcion o un lector concurrente nunca
+combinan registros nuevos con posiciones viejas. El lector verifica que el tamaño del
+archivo de gastos coincida con el de la tabla.
+
+La lectura mapea gastos.bin en memoria con mmap y recorre los registros de un viaje
+sin copiarlos ni construir objetos Gasto, de modo que los totales, los balances y los
+reportes de historiales muy grandes no dependan de interpretar JSON.
+
+Importaciones:
+- datetime.date: para convertir entre fechas y ordinales.
+- json: para la tabla de encabezados.
+- mmap: para leer los registros sin copiarlos a memoria.
+- os: para el reemplazo atomico de los archivos.
+- re: para reconocer los archivos de gastos de versiones anteriores.
+- struct: para empaquetar los registros de ancho fijo.
+- threading: para nombrar los archivos temporales de cada hilo.
+- Viaje: La clase que representa un viaje.
+- Gasto: La clase que representa un gasto.
+- METODOS_PAGO: codigos de los metodos de pago.
+- ResumenGastos: totales de los gastos agregados en una sola pasada.
+- Reporte: servicio de generacion de reportes.
+- ViajesRepository: para convertir desde y hacia viajes.json.
+"""
+
+from datetime import date
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+from models.viaje import Viaje
+from models.gasto import Gasto
+from models.gastos_columnares import METODOS_PAGO
+from models.resumen_gastos import ResumenGastos
+from models.reporte import Reporte
+from repositories.viajes_repository import ViajesRepository
+
+REGISTRO = struct.Struct("<idBB")
+ARCHIVO_GASTOS = "gastos.{}.bin"
+ARCHIVO_GASTOS_ANTERIOR = "gastos.bin"
+ARCHIVO_ENCABEZADOS = "encabezados.json"
+PATRON_GASTOS = re.compile(r"gastos\.\d+\.bin")
+ENTERO = 0x80
+REINTENTOS = 3
+
+
+def _reemplazar(ruta: str, escribir, modo: str):
+    """escribe un archivo temporal con la funcion dada y luego reemplaza la ruta
+
+    Args:
+        ruta (str): ruta del archivo a escribir
+        escribir (Callable[[IO], None]): funcion que escribe el contenido
+        modo (str): modo de apertura del archivo temporal
+    """
+    temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temporal, modo) as archivo:
+            escribir(archivo)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+def _leer_tabla(directorio: str) -> dict:
+    """lee la tabla de encabezados, aceptando el formato anterior sin version
+
+    Args:
+        directorio (str): directorio del almacenamiento binario
+
+    Returns:
+        dict: la tabla con version, archivo de gastos, tamaño y viajes
+    """
+    with open(os.path.join(directorio, ARCHIVO_ENCABEZADOS), encoding="utf-8") as f:
+        tabla = json.load(f)
+    if isinstance(tabla, list):
+        return {"version": 0, "tamano": None, "viajes": tabla}
+    return tabla
+
+
+def _archivo_gastos(tabla: dict) -> str:
+    """obtiene el nombre del archivo de gastos que corresponde a una tabla
+
+    Args:
+        tabla (dict): la tabla de encabezados
+
+    Returns:
+        str: el nombre del archivo de gastos
+    """
+    if tabla["version"] == 0:
+        return ARCHIVO_GASTOS_ANTERIOR
+    return ARCHIVO_GASTOS.format(tabla["version"])
+
+
+def escribir_binario(directorio: str, viajes):
+    """escribe los viajes dados en el formato binario
+
+    Los gastos se escriben en un archivo de una version nueva y la tabla de
+    encabezados se reemplaza al final; despues se eliminan los archivos de gastos
+    de versiones anteriores.
+
+    Args:
+        directorio (str): directorio del almacenamiento binario
+        viajes (list[Viaje]): los viajes a escribir
+    """
+    os.makedirs(directorio, exist_ok=True)
+    try:
+        version = _leer_tabla(directorio)["version"] + 1
+    except FileNotFoundError:
+        version = 1
+    archivo_gastos = ARCHIVO_GASTOS.format(version)
+    encabezados = []
+
+    def escribir_gastos(archivo):
+        inicio = 0
+        for viaje in viajes:
+            datos = bytearray()
+            for gasto in viaje.gastos:
+                metodo = METODOS_PAGO.index(gasto.metodo_pago)
+                if isinstance(gasto.valor, int):
+                    metodo |= ENTERO
+                datos += REGISTRO.pack(
+                    gasto.fecha.toordinal(),
+                    gasto.valor,
+                    metodo,
+                    Gasto.tipos_gasto.index(gasto.tipo_gasto),
+                )
+            archivo.write(datos)
+            cantidad = len(datos) // REGISTRO.size
+            encabezados.append(
+                {
+                    "destino": viaje.destino,
+                    "fecha_inicio": viaje.fecha_inicio.isoformat(),
+                    "fecha_fin": viaje.fecha_fin.isoformat(),
+                    "presupuesto_diario": viaje.presupuesto_diario,
+                    "inicio": inicio,
+                    "cantidad": cantidad,
+                }
+            )
+            inicio += cantidad
+
+    _reemplazar(os.path.join(directorio, archivo_gastos), escribir_gastos, "wb")
+    tabla = {
+        "version": version,
+        "tamano": os.path.getsize(os.path.join(directorio, archivo_gastos)),
+        "viajes": encabezados,
+    }
+    _reemplazar(
+        os.path.join(directorio, ARCHIVO_ENCABEZADOS),
+        lambda archivo: json.dump(tabla, archivo, indent=4),
+        "w",
+    )
+    for nombre in os.listdir(directorio):
+        anterior = nombre == ARCHIVO_GASTOS_ANTERIOR or PATRON_GASTOS.fullmatch(nombre)
+        if anterior and nombre != archivo_gastos:
+            try:
+                os.remove(os.path.join(directorio, nombre))
+            except OSError:
+                # un lector aun lo tiene abierto; se elimina en la proxima escritura
+                pass
+
+
+class GastosBinarios:
+    """lector del almacenamiento binario que recorre los registros mapeados en memoria.
+
+    Se usa como administrador de contexto para liberar el mapeo al terminar"""
+
+    def __init__(self, directorio: str) -> None:
+        """abre la tabla de encabezados y el archivo de gastos de su misma version
+
+        Args:
+            directorio (str): directorio del almacenamiento binario
+
+        Raises:
+            ValueError: si el archivo de gastos no tiene el tamaño de la tabla
+        """
+        for intento in range(REINTENTOS):
+            tabla = _leer_tabla(directorio)
+            try:
+                self.__archivo = open(
+                    os.path.join(directorio, _archivo_gastos(tabla)), "rb"
+                )
+                break
+            except FileNotFoundError:
+                # otra escritura reemplazo la tabla y elimino el archivo anterior
+                if intento == REINTENTOS - 1:
+                    raise
+        self.__encabezados = tabla["viajes"]
+        tamano = os.fstat(self.__archivo.fileno()).st_size
+        if tabla["tamano"] is not None and tamano != tabla["tamano"]:
+            self.__archivo.close()
+            raise ValueError(
+                f"El archivo de gastos tiene {tamano} bytes y la tabla de "
+                f"encabezados espera {tabla['tamano']}"
+            )
+        if tamano > 0:
+            self.__datos = mmap.mmap(
+                self.__archivo.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        else:
+            self.__datos = b""
+
+    def __enter__(self) -> "GastosBinarios":
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def cerrar(self):
+        """libera el mapeo en memoria y cierra el archivo de gastos"""
+        if isinstance(self.__datos, mmap.mmap):
+            self.__datos.close()
+        self.__archivo.close()
+
+    @property
+    def encabezados(self) -> list:
+        """retorna el atributo __encabezados
+
+        Returns:
+            list[dict]: encabezados de los viajes con la posicion de sus registros
+        """
+        return self.__encabezados
+
+    def buscar(self, fecha: date):
+        """obtiene el encabezado del viaje que contiene la fecha dada
+
+        Args:
+            fecha (date): la fecha a buscar
+
+        Returns:
+            dict | None: el encabezado del viaje o None si no existe
+        """
+        fecha_iso = fecha.isoformat()
+        for encabezado in self.__encabezados:
+            if encabezado["fecha_inicio"] <= fecha_iso <= encabezado["fecha_fin"]:
+                return encabezado
+        return None
+
+    def registros(self, encabezado: dict):
+        """recorre los registros de un viaje directamente sobre el archivo mapeado
+
+        Args:
+            encabezado (dict): el encabezado del viaje
+
+        Yields:
+            tuple: (ordinal de la fecha, valor, codigo de metodo de pago, codigo de
+                tipo de gasto) de cada gasto del viaje, con los valores enteros como int
+        """
+        inicio = encabezado["inicio"] * REGISTRO.size
+        fin = inicio + encabezado["cantidad"] * REGISTRO.size
+        vista = memoryview(self.__datos)[inicio:fin]
+        try:
+            for ordinal, valor, metodo, tipo in REGISTRO.iter_unpack(vista):
+                if metodo & ENTERO:
+                    yield ordinal, int(valor), metodo & ~ENTERO, tipo
+                else:
+                    yield ordinal, valor, metodo, tipo
+        finally:
+            vista.release()
+
+    def resumen(self, encabezado: dict) -> ResumenGastos:
+        """calcula los totales de un viaje sin construir objetos Gasto
+
+        Args:
+            encabezado (dict): el encabezado del viaje
+
+        Returns:
+            ResumenGastos: el resumen de los gastos del viaje
+        """
+        return ResumenGastos.desde_registros(self.registros(encabezado))
+
+    def get_balance_dia(self, encabezado: dict, fecha: date) -> float:
+        """calcula el balance de una fecha del viaje recorriendo sus registros
+
+        Args:
+            encabezado (dict): el encabezado del viaje
+            fecha (date): la fecha a consultar
+
+        Returns:
+            float: presupuesto diario menos el total gastado en la fecha
+        """
+        ordinal = fecha.toordinal()
+        total = 0
+        for fecha_gasto, valor, _, _ in self.registros(encabezado):
+            if fecha_gasto == ordinal:
+                total += valor
+        return encabezado["presupuesto_diario"] - total
+
+    def escribir_reporte(self, encabezado: dict, destino, atomico: bool = False):
+        """escribe el reporte de un viaje a partir de sus registros
+
+        Args:
+            encabezado (dict): el encabezado del viaje
+            destino (str | TextIO): ruta del archivo o flujo de texto abierto
+            atomico (bool, optional): ver Reporte.escribir_reporte
+        """
+        Reporte.escribir_reporte(
+            Viaje.from_dict(encabezado, cargar_gastos=list),
+            destino,
+            atomico,
+            self.resumen(encabezado),
+        )
+
+    def viaje(self, encabezado: dict) -> Viaje:
+        """estructura un viaje con todos sus gastos
+
+        Args:
+            encabezado (dict): el encabezado del viaje
+
+        Returns:
+            Viaje: el viaje con sus gastos
+        """
+        gastos = [
+            {
+                "fecha": date.fromordinal(ordinal).isoformat(),
+                "valor": valor,
+                "metodo_pago": METODOS_PAGO[metodo],
+                "tipo_gasto": Gasto.tipos_gasto[tipo],
+            }
+            for ordinal, valor, metodo, tipo in self.registros(encabezado)
+        ]
+        return Viaje.from_dict({**encabezado, "gastos": gastos})
+
+    def get_viajes(self):
+        """estructura todos los viajes con sus gastos
+
+        Returns:
+            list[Viaje]: los viajes del almacenamiento
+        """
+        return [self.viaje(encabezado) for encabezado in self.__encabezados]
+
+
+def desde_json(ruta_json: str, directorio: str) -> int:
+    """convierte un archivo viajes.json (y su bitacora) al formato binario
+
+    Args:
+        ruta_json (str): ruta del archivo viajes.json
+        directorio (str): directorio del almacenamiento binario
+
+    Returns:
+        int: cantidad de viajes convertidos
+    """
+    viajes = ViajesRepository(ruta_json).get_viajes()
+    escribir_binario(directorio, viajes)
+    return len(viajes)
+
+
+def a_json(directorio: str, ruta_json: str) -> int:
+    """convierte el formato binario a un archivo viajes.json
+
+    Args:
+        directorio (str): directorio del almacenamiento binario
+        ruta_json (str): ruta del archivo viajes.json a escribir
+
+    Returns:
+        int: cantidad de viajes convertidos
+    """
+    with GastosBinarios(directorio) as binarios:
+        viajes = binarios.get_viajes()
+    ViajesRepository(ruta_json).guardar(viajes)
+    return len(viajes)
@@ -0,0 +1,298 @@
+"""
+Este módulo lee y escribe el archivo viajes.json de forma incremental.
+
+El archivo es un arreglo JSON con un objeto por viaje. La lectura recorre el arreglo
+elemento a elemento, sin cargar el archivo completo en memoria, y entrega para cada
+viaje su posicion en bytes dentro del archivo, de modo que los gastos de un viaje se
+puedan volver a leer despues, solo cuando se necesiten.
+
+Cada viaje se escribe con sus gastos al final, precedidos por la clave
+"longitud_gastos" con la longitud del texto del arreglo de gastos. Al recorrer el
+archivo solo se decodifican los encabezados de los viajes y el arreglo de gastos se
+salta sin decodificarlo. Los viajes escritos sin esa clave se decodifican completos.
+
+Importaciones:
+- codecs: para decodificar el archivo por bloques.
+- json: para la serializacion y deserializacion de los viajes.
+- os: para verificar que el archivo no haya cambiado antes de releerlo.
+"""
+
+import codecs
+import json
+import os
+
+TAMANO_BLOQUE = 1 << 20
+ESPACIOS = " \t\n\r"
+DELIMITADORES = ESPACIOS + ",:]}"
+HOLGURA_CIERRE = 64
+
+
+class _LectorBloques:
+    """lector de un archivo UTF-8 por bloques que lleva la cuenta de la posicion en
+    bytes del caracter actual"""
+
+    def __init__(self, archivo, tamano_bloque: int) -> None:
+        self.archivo = archivo
+        self.tamano_bloque = tamano_bloque
+        self.decodificador = codecs.getincrementaldecoder("utf-8")()
+        self.texto = ""
+        self.posicion = 0
+        self.desplazamiento = 0
+        self.fin_archivo = False
+
+    def leer_mas(self, minimo: int = 0) -> bool:
+        """descarta el texto ya consumido y agrega el siguiente bloque del archivo
+
+        Args:
+            minimo (int, optional): cantidad minima de bytes a leer
+
+        Returns:
+            bool: False si ya se habia llegado al final del archivo
+        """
+        if self.fin_archivo:
+            return False
+        bloque = self.archivo.read(max(self.tamano_bloque, minimo))
+        self.fin_archivo = not bloque
+        self.texto = self.texto[self.posicion :] + self.decodificador.decode(
+            bloque, final=self.fin_archivo
+        )
+        self.posicion = 0
+        return True
+
+    def siguiente(self) -> str:
+        """salta los espacios en blanco y retorna el siguiente caracter sin consumirlo
+
+        Returns:
+            str: el siguiente caracter, o "" al final del archivo
+        """
+        while True:
+            while (
+                self.posicion < len(self.texto)
+                and self.texto[self.posicion] in ESPACIOS
+            ):
+                self.posicion += 1
+                self.desplazamiento += 1
+            if self.posicion < len(self.texto):
+                return self.texto[self.posicion]
+            if not self.leer_mas():
+                return ""
+
+    def consumir(self, esperado: str):
+        """consume el caracter esperado, que debe ser ASCII
+
+        Args:
+            esperado (str): el caracter esperado
+
+        Raises:
+            json.decoder.JSONDecodeError: excepcion lanzada si el caracter no es el esperado
+        """
+        if self.siguiente() != esperado:
+            raise json.decoder.JSONDecodeError(
+                f"se esperaba '{esperado}'", self.texto, self.posicion
+            )
+        self.posicion += 1
+        self.desplazamiento += 1
+
+    def saltar_arreglo(self, longitud: int) -> bool:
+        """salta, sin decodificarlo, el arreglo JSON que empieza en el siguiente caracter
+        si tiene la longitud dada y es el ultimo valor del objeto
+
+        Args:
+            longitud (int): longitud en caracteres del texto del arreglo
+
+        Returns:
+            bool: False si el texto no es un arreglo de esa longitud seguido del cierre
+            del objeto, sin consumirlo
+        """
+        self.siguiente()
+        while len(self.texto) - self.posicion < longitud + HOLGURA_CIERRE:
+            if not self.leer_mas(longitud + HOLGURA_CIERRE):
+                break
+        fin = self.posicion + longitud
+        fragmento = self.texto[self.posicion : fin]
+        if not (
+            len(fragmento) == longitud
+            and fragmento.startswith("[")
+            and fragmento.endswith("]")
+            and self.texto[fin : fin + HOLGURA_CIERRE].lstrip(ESPACIOS).startswith("}")
+        ):
+            return False
+        self.posicion += longitud
+        self.desplazamiento += len(fragmento.encode("utf-8"))
+        return True
+
+    def decodificar_encabezado(self, decodificador: json.JSONDecoder):
+        """decodifica el siguiente objeto JSON de un viaje clave a clave, saltando el
+        arreglo de gastos si el objeto indica antes su longitud (ver escribir_viajes)
+
+        Args:
+            decodificador (json.JSONDecoder): el decodificador a usar
+
+        Raises:
+            json.decoder.JSONDecodeError: excepcion lanzada si el objeto no es valido
+
+        Returns:
+            tuple[dict, int, int]: el viaje, sin sus gastos si se saltaron, su posicion
+            en bytes y su longitud en bytes
+        """
+        self.siguiente()
+        inicio = self.desplazamiento
+        self.consumir("{")
+        viaje_data = {}
+        if self.siguiente() != "}":
+            while True:
+                clave = self.decodificar(decodificador)[0]
+                self.consumir(":")
+                longitud = viaje_data.get("longitud_gastos")
+                if not (
+                    clave == "gastos"
+                    and isinstance(longitud, int)
+                    and self.saltar_arreglo(longitud)
+                ):
+                    viaje_data[clave] = self.decodificar(decodificador)[0]
+                if self.siguiente() == "}":
+                    break
+                self.consumir(",")
+        self.consumir("}")
+        return viaje_data, inicio, self.desplazamiento - inicio
+
+    def decodificar(self, decodificador: json.JSONDecoder):
+        """decodifica el siguiente valor JSON, leyendo mas bloques si esta incompleto.
+        Un numero cortado al final del bloque se decodifica sin error, por lo que
+        tambien se lee mas si el valor no termina en un delimitador
+
+        Args:
+            decodificador (json.JSONDecoder): el decodificador a usar
+
+        Returns:
+            tuple[object, int, int]: el valor, su posicion en bytes y su longitud en bytes
+        """
+        self.siguiente()
+        faltante = self.tamano_bloque
+        while True:
+            try:
+                valor, fin = decodificador.raw_decode(self.texto, self.posicion)
+                if (
+                    fin < len(self.texto) and self.texto[fin] in DELIMITADORES
+                ) or not self.leer_mas(faltante):
+                    break
+            except json.decoder.JSONDecodeError:
+                if not self.leer_mas(faltante):
+                    raise
+            faltante = len(self.texto)
+        inicio = self.desplazamiento
+        longitud = len(self.texto[self.posicion : fin].encode("utf-8"))
+        self.posicion = fin
+        self.desplazamiento += longitud
+        return valor, inicio, longitud
+
+
+def iter_viajes(ruta: str, tamano_bloque: int = TAMANO_BLOQUE):
+    """recorre uno a uno los viajes del archivo. En memoria solo se mantiene el
+    bloque actual y el encabezado del viaje que se esta decodificando
+
+    Args:
+        ruta (str): ruta del archivo viajes.json
+        tamano_bloque (int, optional): cantidad de bytes leidos por bloque
+
+    Raises:
+        json.decoder.JSONDecodeError: excepcion lanzada si el archivo no es un arreglo JSON valido
+
+    Yields:
+        tuple[dict, int, int]: el viaje en formato dict, sin sus gastos si el archivo
+        indica su longitud, la posicion en bytes donde empieza y su longitud en bytes
+    """
+    decodificador = json.JSONDecoder()
+    with open(ruta, "rb") as f:
+        lector = _LectorBloques(f, tamano_bloque)
+        lector.consumir("[")
+        if lector.siguiente() == "]":
+            return
+        while True:
+            yield lector.decodificar_encabezado(decodificador)
+            if lector.siguiente() == "]":
+                return
+            lector.consumir(",")
+
+
+def firma(ruta: str):
+    """obtiene la fecha de modificacion y el tamaño del archivo
+
+    Args:
+        ruta (str): ruta del archivo
+
+    Returns:
+        tuple[int, int]: (mtime en nanosegundos, tamaño)
+    """
+    estado = os.stat(ruta)
+    return (estado.st_mtime_ns, estado.st_size)
+
+
+def leer_gastos(ruta: str, firma_archivo: tuple, inicio: int, longitud: int):
+    """vuelve a leer del archivo los gastos de un viaje a partir de su posicion
+
+    Args:
+        ruta (str): ruta del archivo viajes.json
+        firma_archivo (tuple): firma del archivo cuando se obtuvo la posicion
+        inicio (int): posicion en bytes donde empieza el viaje
+        longitud (int): longitud en bytes del viaje
+
+    Raises:
+        ValueError: excepcion lanzada si el archivo cambio desde que se obtuvo la posicion
+
+    Returns:
+        list[dict]: los gastos del viaje en formato dict
+    """
+    with open(ruta, "rb") as f:
+        estado = os.fstat(f.fileno())
+        if (estado.st_mtime_ns, estado.st_size) != tuple(firma_archivo):
+            raise ValueError("el archivo de viajes cambio, vuelva a cargar los viajes")
+        f.seek(inicio)
+        return json.loads(f.read(longitud))["gastos"]
+
+
+def serializar_viaje(viaje_data: dict) -> str:
+    """serializa el viaje indentado, con sus gastos al final precedidos por la clave
+    "longitud_gastos" con la longitud de su texto, para poder saltarlos al leer. Como
+    la serializacion escapa los caracteres no ASCII, la longitud en caracteres es
+    tambien la longitud en bytes
+
+    Args:
+        viaje_data (dict): el viaje en formato dict
+
+    Returns:
+        str: el texto JSON del viaje
+    """
+    if "gastos" not in viaje_data:
+        return json.dumps(viaje_data, indent=4)
+    gastos = json.dumps(viaje_data["gastos"], indent=4).replace("\n", "\n    ")
+    encabezado = {clave: valor for clave, valor in viaje_data.items() if clave != "gastos"}
+    encabezado["longitud_gastos"] = len(gastos)
+    return f'{json.dumps(encabezado, indent=4)[:-2]},\n    "gastos": {gastos}\n}}'
+
+
+def escribir_viajes(ruta: str, viajes_data):
+    """escribe el arreglo de viajes con un viaje por elemento indentado (ver
+    serializar_viaje)
+
+    Args:
+        ruta (str): ruta del archivo a escribir
+        viajes_data (Iterable[dict]): los viajes en formato dict
+
+    Returns:
+        list[tuple[int, int]]: posicion en bytes y longitud de cada viaje escrito
+    """
+    posiciones = []
+    with open(ruta, "wb") as f:
+        f.write(b"[")
+        desplazamiento = 1
+        for viaje_data in viajes_data:
+            separador = b"\n" if not posiciones else b",\n"
+            contenido = serializar_viaje(viaje_data).encode("utf-8")
+            f.write(separador)
+            f.write(contenido)
+            desplazamiento += len(separador)
+            posiciones.append((desplazamiento, len(contenido)))
+            desplazamiento += len(contenido)
+        f.write(b"\n]" if posiciones else b"]")
+    return posiciones
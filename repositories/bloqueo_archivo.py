@@ -0,0 +1,72 @@
+"""
+Este módulo proporciona un bloqueo exclusivo entre hilos y procesos sobre un archivo.
+
+Se usa para serializar las operaciones de lectura, modificacion y escritura de los
+repositorios cuando varios procesos trabajan sobre el mismo directorio de datos. El
+bloqueo entre procesos es consultivo (fcntl.flock): solo lo respetan los procesos que
+tambien lo solicitan. En plataformas sin fcntl solo se bloquea entre hilos.
+
+Importaciones:
+- os: para crear el directorio del archivo de bloqueo.
+- threading: para el bloqueo entre hilos del mismo proceso.
+- fcntl: para el bloqueo entre procesos, si esta disponible.
+"""
+
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class BloqueoArchivo:
+    """bloqueo exclusivo y reentrante entre hilos y procesos, usado con with"""
+
+    def __init__(self, ruta: str) -> None:
+        self.ruta = ruta
+        self.__hilos = threading.RLock()
+        self.__archivo = None
+        self.__profundidad = 0
+
+    @property
+    def hilos(self) -> threading.RLock:
+        """retorna el atributo __hilos
+
+        Returns:
+            threading.RLock: bloqueo entre los hilos del proceso, sin bloquear el archivo
+        """
+        return self.__hilos
+
+    def __enter__(self) -> "BloqueoArchivo":
+        self.__hilos.acquire()
+        try:
+            if self.__profundidad == 0:
+                directorio = os.path.dirname(self.ruta)
+                if directorio:
+                    os.makedirs(directorio, exist_ok=True)
+                archivo = open(self.ruta, "ab")
+                try:
+                    if fcntl is not None:
+                        fcntl.flock(archivo.fileno(), fcntl.LOCK_EX)
+                except BaseException:
+                    archivo.close()
+                    raise
+                self.__archivo = archivo
+            self.__profundidad += 1
+        except BaseException:
+            self.__hilos.release()
+            raise
+        return self
+
+    def __exit__(self, *excepcion):
+        self.__profundidad -= 1
+        try:
+            if self.__profundidad == 0:
+                archivo, self.__archivo = self.__archivo, None
+                if fcntl is not None:
+                    fcntl.flock(archivo.fileno(), fcntl.LOCK_UN)
+                archivo.close()
+        finally:
+            self.__hilos.release()
@@ -0,0 +1,101 @@
+"""
+Este módulo proporciona un indice de intervalos de fechas para los viajes.
+
+El indice mantiene los viajes ordenados por fecha de inicio y permite verificar
+cruces de fechas con busqueda binaria en lugar de recorrer todos los viajes. Ademas
+asocia cada fecha de cada viaje con su viaje, para encontrar en tiempo constante el
+viaje que contiene una fecha.
+
+Importaciones:
+- bisect: para la busqueda binaria e insercion ordenada.
+- datetime.date: para el manejo de fechas.
+- Viaje: La clase que representa un viaje.
+"""
+
+import bisect
+from datetime import date
+from models.viaje import Viaje
+
+
+class IndiceViajes:
+    """indice ordenado por fecha de inicio de los intervalos de fechas de los viajes"""
+
+    def __init__(self, viajes=None) -> None:
+        self.__inicios = []
+        self.__viajes = []
+        self.__max_fin = []
+        self.__por_fecha = {}
+        viajes = list(viajes or [])
+        for viaje in sorted(viajes, key=lambda v: v.fecha_inicio):
+            self.__inicios.append(viaje.fecha_inicio)
+            self.__viajes.append(viaje)
+        self.__recalcular_max_fin(0)
+        for viaje in viajes:
+            self.__indexar_fechas(viaje)
+
+    def __len__(self) -> int:
+        return len(self.__viajes)
+
+    def __recalcular_max_fin(self, desde: int):
+        """recalcula el maximo acumulado de fechas de fin a partir de la posicion dada
+
+        Args:
+            desde (int): posicion desde la cual recalcular
+        """
+        del self.__max_fin[desde:]
+        maximo = self.__max_fin[desde - 1] if desde > 0 else None
+        for viaje in self.__viajes[desde:]:
+            if maximo is None or viaje.fecha_fin > maximo:
+                maximo = viaje.fecha_fin
+            self.__max_fin.append(maximo)
+
+    def agregar(self, viaje: Viaje):
+        """inserta el viaje en el indice manteniendo el orden por fecha de inicio
+
+        Args:
+            viaje (Viaje): el viaje a indexar
+        """
+        posicion = bisect.bisect_right(self.__inicios, viaje.fecha_inicio)
+        self.__inicios.insert(posicion, viaje.fecha_inicio)
+        self.__viajes.insert(posicion, viaje)
+        self.__recalcular_max_fin(posicion)
+        self.__indexar_fechas(viaje)
+
+    def __indexar_fechas(self, viaje: Viaje):
+        """asocia cada fecha del viaje, como ordinal, al viaje. Si una fecha ya esta
+        asociada a otro viaje se conserva la asociacion existente
+
+        Args:
+            viaje (Viaje): el viaje a indexar
+        """
+        for ordinal in range(
+            viaje.fecha_inicio.toordinal(), viaje.fecha_fin.toordinal() + 1
+        ):
+            self.__por_fecha.setdefault(ordinal, viaje)
+
+    def buscar(self, fecha: date):
+        """obtiene el viaje que contiene la fecha dada
+
+        Args:
+            fecha (date): la fecha a buscar
+
+        Returns:
+            Viaje | None: el viaje que contiene la fecha o None si no existe
+        """
+        return self.__por_fecha.get(fecha.toordinal())
+
+    def hay_cruce(self, fecha_inicio: date, fecha_fin: date) -> bool:
+        """verifica si el intervalo dado se cruza con algun viaje indexado, incluyendo
+        el caso en que el intervalo contiene completamente a otro viaje
+
+        Args:
+            fecha_inicio (date): fecha de inicio del intervalo
+            fecha_fin (date): fecha de fin del intervalo
+
+        Returns:
+            bool: True si existe algun viaje que se cruce con el intervalo
+        """
+        posicion = bisect.bisect_right(self.__inicios, fecha_fin)
+        if posicion == 0:
+            return False
+        return self.__max_fin[posicion - 1] >= fecha_inicio
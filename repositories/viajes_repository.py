@@ -0,0 +1,469 @@
+"""
+Este módulo proporciona el repositorio de viajes respaldado por el archivo viajes.json.
+
+El repositorio mantiene en memoria los viajes ya estructurados y solo vuelve a leer
+los archivos cuando cambia su fecha de modificacion, su tamaño o su inodo.
+
+Al cargar solo se estructuran los encabezados de los viajes y sus totales agregados
+(ver Viaje.agregados), que se guardan junto a cada viaje; los gastos de cada viaje se
+leen del archivo la primera vez que se accede a ellos. Los reportes y balances se
+obtienen de los totales, que se actualizan con cada gasto registrado.
+
+Los viajes y gastos nuevos no reescriben viajes.json: se agregan como una linea al
+final de la bitacora viajes.journal, que se reaplica sobre viajes.json al cargar.
+Cuando la bitacora supera un umbral de registros se compacta reescribiendo
+viajes.json con el estado completo y descartando la bitacora.
+
+Dentro de una sesion (ver ViajesRepository.sesion) los cambios solo se aplican en
+memoria y se escriben todos juntos al cerrarla, con una unica escritura.
+
+Varios procesos pueden trabajar sobre los mismos archivos: cada escritura se hace con
+el bloqueo exclusivo de viajes.lock (ver BloqueoArchivo) y verifica antes que los
+archivos no hayan cambiado desde que se leyeron los viajes que modifica. Si cambiaron
+se lanza ConcurrenciaException y la operacion debe repetirse con los datos actuales.
+viajes.json siempre se reescribe en un archivo temporal que luego lo reemplaza.
+
+Importaciones:
+- contextlib.contextmanager: para definir las sesiones de escritura diferida.
+- datetime.date: para el manejo de fechas.
+- functools.partial: para asociar a cada viaje la lectura perezosa de sus gastos.
+- json: para la serializacion y deserializacion de los registros de la bitacora.
+- os: para consultar los metadatos de los archivos.
+- Viaje: La clase que representa un viaje.
+- Gasto: La clase que representa un gasto.
+- IndiceViajes: Indice de intervalos de fechas de los viajes.
+- BloqueoArchivo: bloqueo exclusivo entre hilos y procesos.
+- ConcurrenciaException: excepcion lanzada si otro proceso modifico los archivos.
+- archivo_viajes: lectura incremental y escritura del archivo viajes.json.
+"""
+
+from contextlib import contextmanager
+from datetime import date
+from functools import partial
+import json
+import os
+from models.viaje import Viaje
+from models.gasto import Gasto
+from repositories.indice_viajes import IndiceViajes
+from repositories.bloqueo_archivo import BloqueoArchivo
+from repositories import archivo_viajes
+from exceptions.concurrencia_exception import ConcurrenciaException
+
+
+class ViajesRepository:
+    """repositorio con cache en memoria de los viajes almacenados en viajes.json"""
+
+    def __init__(
+        self,
+        ruta: str = "archivos/viajes.json",
+        max_registros_journal: int = 500,
+        columnar: bool = False,
+    ) -> None:
+        self.ruta = ruta
+        self.columnar = columnar
+        self.ruta_journal = os.path.splitext(ruta)[0] + ".journal"
+        self.max_registros_journal = max_registros_journal
+        self.__cargado = False
+        self.__firma = None
+        self.__viajes = []
+        self.__indice = IndiceViajes()
+        self.__journal = None
+        self.__diferidos = None
+        self.__invalido = False
+        self.__bloqueo = BloqueoArchivo(os.path.splitext(ruta)[0] + ".lock")
+
+    @staticmethod
+    def __firma_archivo(ruta: str):
+        """obtiene los metadatos de un archivo que determinan si debe recargarse
+
+        Args:
+            ruta (str): ruta del archivo
+
+        Returns:
+            tuple | None: (mtime, tamaño, inodo) del archivo o None si no existe
+        """
+        try:
+            estado = os.stat(ruta)
+        except FileNotFoundError:
+            return None
+        return (estado.st_mtime_ns, estado.st_size, estado.st_ino)
+
+    def __firma_actual(self):
+        """obtiene la firma conjunta de viajes.json y de su bitacora
+
+        Returns:
+            tuple: firmas del archivo de viajes y de la bitacora
+        """
+        return (
+            self.__firma_archivo(self.ruta),
+            self.__firma_archivo(self.ruta_journal),
+        )
+
+    def __refrescar(self):
+        """recarga los viajes desde los archivos solo si cambiaron desde la ultima
+        lectura. Dentro de una sesion se conserva el estado en memoria"""
+        if self.__cargado and self.__diferidos is not None:
+            return
+        firma = self.__firma_actual()
+        if self.__cargado and firma == self.__firma:
+            return
+        self.__invalido = False
+        viajes = self.__leer(firma[0])
+        self.__journal = self.__reaplicar_journal(viajes, firma[0])
+        self.__cargar(viajes, firma)
+
+    def __leer(self, firma_archivo):
+        """lee los encabezados de los viajes del archivo viajes.json recorriendolo viaje
+        a viaje. Los gastos de cada viaje se vuelven a leer del archivo solo cuando se
+        accede a ellos
+
+        Args:
+            firma_archivo (tuple | None): firma actual del archivo viajes.json
+
+        Returns:
+            list[Viaje]: lista de viajes leidos, vacia si el archivo no existe o es
+            invalido. Si es invalido no se permite agregar viajes ni gastos sobre el
+        """
+        if firma_archivo is None:
+            return []
+        try:
+            return [
+                Viaje.from_dict(
+                    viaje_data,
+                    self.columnar,
+                    partial(
+                        archivo_viajes.leer_gastos,
+                        self.ruta,
+                        firma_archivo[:2],
+                        inicio,
+                        longitud,
+                    ),
+                )
+                for viaje_data, inicio, longitud in archivo_viajes.iter_viajes(self.ruta)
+            ]
+        except FileNotFoundError:
+            return []
+        except json.decoder.JSONDecodeError:
+            self.__invalido = True
+            return []
+
+    def __reaplicar_journal(self, viajes, firma_base):
+        """aplica sobre los viajes dados los registros de la bitacora que correspondan
+        a la version actual de viajes.json. Una bitacora de otra version se ignora y
+        desde la primera linea incompleta o invalida (escritura interrumpida) se descarta
+
+        Args:
+            viajes (list[Viaje]): los viajes leidos de viajes.json, se modifican en sitio
+            firma_base (tuple | None): firma actual del archivo viajes.json
+
+        Returns:
+            tuple[int, int] | None: cantidad de registros aplicados y bytes validos de la
+            bitacora, o None si no hay una bitacora valida para viajes.json
+        """
+        if firma_base is None:
+            return None
+        try:
+            with open(self.ruta_journal, "rb") as f:
+                encabezado = f.readline()
+                if not encabezado.endswith(b"\n"):
+                    return None
+                if json.loads(encabezado).get("base") != list(firma_base[:2]):
+                    return None
+                por_inicio = {viaje.fecha_inicio: viaje for viaje in viajes}
+                registros = 0
+                validos = len(encabezado)
+                for linea in f:
+                    if not linea.endswith(b"\n"):
+                        break
+                    try:
+                        registro = json.loads(linea)
+                        if "gasto" in registro:
+                            viaje = por_inicio[date.fromisoformat(registro["viaje"])]
+                            viaje.agregar_gasto(Gasto.from_dict(registro["gasto"]))
+                        else:
+                            viaje = Viaje.from_dict(registro["viaje"], self.columnar)
+                            por_inicio[viaje.fecha_inicio] = viaje
+                            viajes.append(viaje)
+                    except (KeyError, ValueError):
+                        break
+                    registros += 1
+                    validos += len(linea)
+                return registros, validos
+        except (FileNotFoundError, json.decoder.JSONDecodeError):
+            return None
+
+    def __cargar(self, viajes, firma):
+        """reemplaza el estado en memoria del repositorio
+
+        Args:
+            viajes (list[Viaje]): los viajes que quedan en memoria
+            firma (tuple): los metadatos de los archivos correspondientes a esos viajes
+        """
+        self.__viajes = viajes
+        self.__indice = IndiceViajes(viajes)
+        self.__firma = firma
+        self.__cargado = True
+
+    def __verificar_version(self, viajes=()):
+        """verifica, con el bloqueo tomado, que los archivos no hayan cambiado desde la
+        ultima lectura y que los viajes dados sean los que estan en memoria
+
+        Args:
+            viajes (Iterable[Viaje], optional): los viajes que se van a modificar
+
+        Raises:
+            ConcurrenciaException: excepcion lanzada si otro proceso modifico los archivos
+                o si los viajes dados son de una lectura anterior
+            ValueError: excepcion lanzada si viajes.json no es un JSON valido
+        """
+        if not self.__cargado:
+            self.__refrescar()
+        elif self.__diferidos is None and self.__firma_actual() != self.__firma:
+            self.__cargado = False
+            raise ConcurrenciaException(
+                "los viajes fueron modificados por otro proceso, vuelva a intentarlo"
+            )
+        if self.__invalido:
+            raise ValueError(f"{self.ruta} no es un JSON valido, no se puede modificar")
+        for viaje in viajes:
+            if self.__indice.buscar(viaje.fecha_inicio) is not viaje:
+                raise ConcurrenciaException(
+                    "el viaje fue modificado por otro proceso, vuelva a intentarlo"
+                )
+
+    def get_viajes(self):
+        """obtiene el listado de viajes, leyendo los archivos solo si cambiaron
+
+        Returns:
+            list[Viaje]: copia de la lista de viajes en memoria
+        """
+        with self.__bloqueo.hilos:
+            self.__refrescar()
+            return list(self.__viajes)
+
+    def get_viaje(self, fecha: date):
+        """obtiene el viaje que contiene la fecha dada
+
+        Args:
+            fecha (date): la fecha a buscar
+
+        Returns:
+            Viaje | None: el viaje que contiene la fecha o None si no existe
+        """
+        with self.__bloqueo.hilos:
+            self.__refrescar()
+            return self.__indice.buscar(fecha)
+
+    def hay_cruce(self, fecha_inicio: date, fecha_fin: date) -> bool:
+        """verifica si el intervalo dado se cruza con algun viaje almacenado
+
+        Args:
+            fecha_inicio (date): fecha de inicio del intervalo
+            fecha_fin (date): fecha de fin del intervalo
+
+        Returns:
+            bool: True si existe algun viaje que se cruce con el intervalo
+        """
+        with self.__bloqueo.hilos:
+            self.__refrescar()
+            return self.__indice.hay_cruce(fecha_inicio, fecha_fin)
+
+    def agregar_viaje(self, viaje: Viaje):
+        """agrega un viaje al repositorio registrandolo en la bitacora
+
+        Args:
+            viaje (Viaje): el viaje a agregar
+
+        Raises:
+            ConcurrenciaException: excepcion lanzada si otro proceso modifico los viajes
+                desde la ultima lectura, en la que se valido el viaje
+        """
+        with self.__bloqueo:
+            self.__verificar_version()
+            if self.__diferidos is not None:
+                self.__diferidos.append({"viaje": viaje.to_dict()})
+            elif self.__firma[0] is None:
+                self.guardar(self.__viajes + [viaje])
+                return
+            else:
+                self.__agregar_journal([{"viaje": viaje.to_dict()}])
+            self.__viajes.append(viaje)
+            self.__indice.agregar(viaje)
+            self.__compactar_si_excede()
+
+    def agregar_gasto(self, viaje: Viaje, gasto: Gasto):
+        """agrega un gasto a un viaje del repositorio registrandolo en la bitacora
+
+        Args:
+            viaje (Viaje): el viaje, obtenido de este repositorio, al que pertenece el gasto
+            gasto (Gasto): el gasto a agregar
+        """
+        self.agregar_gastos([(viaje, gasto)])
+
+    def agregar_gastos(self, gastos):
+        """agrega un lote de gastos con una sola escritura: una unica adicion a la
+        bitacora o, si el lote haria superar el umbral de compactacion, una unica
+        reescritura de viajes.json
+
+        Args:
+            gastos (list[tuple[Viaje, Gasto]]): pares (viaje del repositorio, gasto)
+
+        Raises:
+            ConcurrenciaException: excepcion lanzada si otro proceso modifico los viajes
+                desde que se obtuvieron los viajes dados
+        """
+        with self.__bloqueo:
+            self.__verificar_version(viaje for viaje, _ in gastos)
+            for viaje, gasto in gastos:
+                viaje.agregar_gasto(gasto)
+            registros = [
+                {"viaje": viaje.fecha_inicio.isoformat(), "gasto": gasto.to_dict()}
+                for viaje, gasto in gastos
+            ]
+            if self.__diferidos is not None:
+                self.__diferidos.extend(registros)
+            else:
+                self.__escribir_registros(registros)
+
+    def __escribir_registros(self, registros):
+        """escribe los registros dados con una sola escritura: una unica adicion a la
+        bitacora o, si no existe viajes.json o se superaria el umbral de compactacion,
+        una unica reescritura de viajes.json con el estado en memoria
+
+        Args:
+            registros (list[dict]): los registros de bitacora ya aplicados en memoria
+        """
+        aplicados = self.__journal[0] if self.__journal else 0
+        if (
+            self.__firma[0] is None
+            or aplicados + len(registros) >= self.max_registros_journal
+        ):
+            self.guardar(self.__viajes)
+            return
+        self.__agregar_journal(registros)
+
+    @contextmanager
+    def sesion(self):
+        """sesion de escritura diferida: dentro de ella los viajes y gastos agregados
+        solo se aplican en memoria, sin volver a leer los archivos, y al cerrarla se
+        escriben todos con una sola escritura (ver __escribir_registros). Si la sesion
+        termina con una excepcion no se escribe nada y el estado en memoria se descarta.
+        La sesion mantiene el bloqueo de los archivos hasta cerrarla. Las sesiones
+        anidadas se unen a la sesion exterior
+
+        Yields:
+            ViajesRepository: el mismo repositorio
+        """
+        with self.__bloqueo:
+            if self.__diferidos is not None:
+                yield self
+                return
+            self.__refrescar()
+            self.__diferidos = []
+            try:
+                yield self
+            except BaseException:
+                self.__diferidos = None
+                self.__cargado = False
+                raise
+            registros, self.__diferidos = self.__diferidos, None
+            if registros:
+                self.__escribir_registros(registros)
+
+    def __agregar_journal(self, registros):
+        """agrega registros al final de la bitacora. Si no hay una bitacora valida para
+        la version actual de viajes.json la crea de nuevo, y si termina en una linea
+        incompleta la recorta antes de agregar
+
+        Args:
+            registros (list[dict]): los registros a agregar, uno por linea
+        """
+        datos = "".join(json.dumps(registro) + "\n" for registro in registros)
+        datos = datos.encode("utf-8")
+        try:
+            if self.__journal is None:
+                encabezado = json.dumps({"base": list(self.__firma[0][:2])}) + "\n"
+                encabezado = encabezado.encode("utf-8")
+                with open(self.ruta_journal, "wb") as f:
+                    f.write(encabezado + datos)
+                self.__journal = (0, len(encabezado))
+            else:
+                with open(self.ruta_journal, "ab") as f:
+                    if f.tell() != self.__journal[1]:
+                        f.truncate(self.__journal[1])
+                    f.write(datos)
+        except OSError:
+            self.__cargado = False
+            raise
+        self.__journal = (
+            self.__journal[0] + len(registros),
+            self.__journal[1] + len(datos),
+        )
+        self.__firma = self.__firma_actual()
+
+    def __compactar_si_excede(self):
+        """compacta la bitacora si supera el maximo de registros permitido"""
+        if self.__diferidos is not None:
+            return
+        if self.__journal and self.__journal[0] >= self.max_registros_journal:
+            self.compactar()
+
+    def compactar(self):
+        """reescribe viajes.json con el estado completo y descarta la bitacora
+
+        Raises:
+            ValueError: excepcion lanzada si viajes.json no es un JSON valido
+        """
+        with self.__bloqueo:
+            self.__refrescar()
+            if self.__invalido:
+                raise ValueError(f"{self.ruta} no es un JSON valido, no se puede compactar")
+            self.guardar(self.__viajes)
+
+    def guardar(self, viajes):
+        """reescribe el archivo viajes.json con la lista de viajes dada, descarta la
+        bitacora y actualiza la cache. Dentro de una sesion tambien descarta los
+        cambios pendientes, que quedan incluidos en viajes.json
+
+        Args:
+            viajes (list[Viaje]): la lista de viajes a guardar
+        """
+        with self.__bloqueo:
+            self.__escribir(viajes)
+            try:
+                os.remove(self.ruta_journal)
+            except FileNotFoundError:
+                pass
+            self.__journal = None
+            self.__invalido = False
+            if self.__diferidos is not None:
+                self.__diferidos = []
+            self.__cargar(list(viajes), self.__firma_actual())
+
+    def __escribir(self, viajes):
+        """escribe la lista de viajes en un archivo temporal que luego reemplaza a
+        viajes.json, invalidando la cache si falla. Los viajes cuyos gastos aun no se
+        han cargado pasan a leerlos del archivo nuevo
+
+        Args:
+            viajes (list[Viaje]): la lista de viajes a escribir
+        """
+        temporal = self.ruta + ".tmp"
+        try:
+            posiciones = archivo_viajes.escribir_viajes(
+                temporal,
+                ({**viaje.to_dict(), "agregados": viaje.agregados()} for viaje in viajes),
+            )
+            os.replace(temporal, self.ruta)
+        except BaseException:
+            self.__cargado = False
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+        firma_archivo = archivo_viajes.firma(self.ruta)
+        for viaje, (inicio, longitud) in zip(viajes, posiciones):
+            viaje.set_origen_gastos(
+                partial(
+                    archivo_viajes.leer_gastos, self.ruta, firma_archivo, inicio, longitud
+                )
+            )
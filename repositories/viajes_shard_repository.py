@@ -0,0 +1,425 @@
+"""
+Este módulo proporciona un repositorio de viajes repartido en un archivo por viaje.
+
+Es una alternativa a ViajesRepository con la misma interfaz. En el directorio de
+almacenamiento hay un manifiesto pequeño (manifest.json) con los encabezados de los
+viajes y un archivo por viaje con sus gastos. Listar y validar viajes solo lee el
+manifiesto, y registrar un gasto solo lee y reescribe el archivo de su viaje.
+
+Dentro de una sesion (ver ViajesShardRepository.sesion) los cambios solo se aplican
+en memoria y al cerrarla se escribe una vez cada archivo modificado.
+
+Como en ViajesRepository, varios hilos y procesos pueden trabajar sobre el mismo
+directorio: cada escritura se hace con el bloqueo exclusivo del archivo
+<directorio>.manifest.lock, junto al directorio (ver BloqueoArchivo), y verifica
+antes que el manifiesto, al agregar un viaje, o el archivo del viaje, al agregar
+gastos, no hayan cambiado desde que se leyeron. Si cambiaron se lanza ConcurrenciaException y la operacion debe repetirse con los datos actuales. Los
+archivos temporales de cada escritura tienen un nombre propio del proceso y del hilo.
+
+Importaciones:
+- contextlib.contextmanager: para definir las sesiones de escritura diferida.
+- datetime.date: para el manejo de fechas.
+- functools.partial: para asociar a cada viaje la lectura perezosa de sus gastos.
+- json: para la serializacion y deserializacion de los viajes.
+- os: para el manejo de archivos y sus metadatos.
+- threading: para nombrar el archivo temporal de cada escritura por hilo.
+- Viaje: La clase que representa un viaje.
+- Gasto: La clase que representa un gasto.
+- IndiceViajes: Indice de intervalos de fechas de los viajes.
+- BloqueoArchivo: bloqueo exclusivo entre hilos y procesos.
+- ConcurrenciaException: excepcion lanzada si otro proceso modifico los archivos.
+- ViajesRepository: para migrar los viajes de un archivo viajes.json existente.
+"""
+
+from contextlib import contextmanager
+from datetime import date
+from functools import partial
+import json
+import os
+import threading
+from models.viaje import Viaje
+from models.gasto import Gasto
+from repositories.indice_viajes import IndiceViajes
+from repositories.bloqueo_archivo import BloqueoArchivo
+from exceptions.concurrencia_exception import ConcurrenciaException
+from repositories.viajes_repository import ViajesRepository
+
+
+def escribir_json(ruta: str, data):
+    """escribe data como JSON en un archivo temporal que luego reemplaza a la ruta dada
+
+    Args:
+        ruta (str): ruta del archivo a escribir
+        data (object): el contenido a escribir
+    """
+    temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+class ViajesShardRepository:
+    """repositorio de viajes con un manifiesto de encabezados y un archivo por viaje"""
+
+    def __init__(self, directorio: str = "archivos/viajes") -> None:
+        self.directorio = directorio
+        self.ruta_manifiesto = os.path.join(directorio, "manifest.json")
+        self.__cargado = False
+        self.__firma = None
+        self.__viajes = []
+        self.__indice = IndiceViajes()
+        self.__firmas_shards = {}
+        self.__pendientes = None
+        self.__manifiesto_pendiente = False
+        self.__bloqueo = BloqueoArchivo(
+            os.path.normpath(directorio) + ".manifest.lock"
+        )
+
+    @staticmethod
+    def __firma_archivo(ruta: str):
+        """obtiene los metadatos de un archivo que determinan si debe recargarse
+
+        Args:
+            ruta (str): ruta del archivo
+
+        Returns:
+            tuple | None: (mtime, tamaño, inodo) del archivo o None si no existe
+        """
+        try:
+            estado = os.stat(ruta)
+        except FileNotFoundError:
+            return None
+        return (estado.st_mtime_ns, estado.st_size, estado.st_ino)
+
+    @staticmethod
+    def archivo_viaje(viaje: Viaje) -> str:
+        """nombre del archivo que guarda los gastos del viaje
+
+        Args:
+            viaje (Viaje): el viaje
+
+        Returns:
+            str: nombre del archivo, relativo al directorio de almacenamiento
+        """
+        return f"{viaje.fecha_inicio.isoformat()}.json"
+
+    def __ruta(self, archivo: str) -> str:
+        return os.path.join(self.directorio, archivo)
+
+    def __refrescar(self):
+        """recarga los encabezados desde el manifiesto solo si este cambio. Dentro de
+        una sesion se conserva el estado en memoria"""
+        if self.__cargado and self.__pendientes is not None:
+            return
+        firma = self.__firma_archivo(self.ruta_manifiesto)
+        if self.__cargado and firma == self.__firma:
+            return
+        try:
+            with open(self.ruta_manifiesto, "r", encoding="utf-8") as f:
+                encabezados = json.load(f)
+        except (FileNotFoundError, json.decoder.JSONDecodeError):
+            encabezados = []
+        viajes = [
+            Viaje.from_dict(
+                encabezado, cargar_gastos=partial(self.__leer_gastos, encabezado["archivo"])
+            )
+            for encabezado in encabezados
+        ]
+        self.__firmas_shards = {}
+        self.__cargar(viajes, firma)
+
+    def __cargar(self, viajes, firma):
+        """reemplaza el estado en memoria del repositorio
+
+        Args:
+            viajes (list[Viaje]): los viajes que quedan en memoria
+            firma (tuple | None): los metadatos del manifiesto correspondientes
+        """
+        self.__viajes = viajes
+        self.__indice = IndiceViajes(viajes)
+        self.__firma = firma
+        self.__cargado = True
+
+    def __leer_gastos(self, archivo: str):
+        """lee los gastos del archivo de un viaje y registra su firma
+
+        Args:
+            archivo (str): nombre del archivo del viaje
+
+        Returns:
+            list[dict]: los gastos del viaje en formato dict
+        """
+        ruta = self.__ruta(archivo)
+        firma = self.__firma_archivo(ruta)
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                gastos = json.load(f)
+        except FileNotFoundError:
+            gastos = []
+        self.__firmas_shards[archivo] = firma
+        return gastos
+
+    def __shard_vigente(self, viaje: Viaje) -> bool:
+        """verifica que el archivo de un viaje con gastos cargados no haya cambiado
+
+        Args:
+            viaje (Viaje): el viaje a verificar
+
+        Returns:
+            bool: False si otro proceso modifico el archivo del viaje
+        """
+        archivo = self.archivo_viaje(viaje)
+        if archivo not in self.__firmas_shards:
+            return True
+        firma = self.__firma_archivo(self.__ruta(archivo))
+        return firma == self.__firmas_shards[archivo]
+
+    def __verificar_version(self, viajes=()):
+        """verifica, con el bloqueo tomado, que el manifiesto no haya cambiado desde la
+        ultima lectura y que los viajes dados sean los que estan en memoria, con su
+        archivo de gastos sin cambios. Dentro de una sesion el bloqueo se mantiene
+        desde que se abre, por lo que solo se verifica la identidad de los viajes
+
+        Args:
+            viajes (Iterable[Viaje], optional): los viajes cuyos gastos se van a modificar
+
+        Raises:
+            ConcurrenciaException: excepcion lanzada si otro proceso modifico los archivos
+                o si los viajes dados son de una lectura anterior
+        """
+        if not self.__cargado:
+            self.__refrescar()
+        elif (
+            self.__pendientes is None
+            and self.__firma_archivo(self.ruta_manifiesto) != self.__firma
+        ):
+            self.__cargado = False
+            raise ConcurrenciaException(
+                "los viajes fueron modificados por otro proceso, vuelva a intentarlo"
+            )
+        for viaje in viajes:
+            if self.__indice.buscar(viaje.fecha_inicio) is not viaje or (
+                self.__pendientes is None and not self.__shard_vigente(viaje)
+            ):
+                self.__cargado = False
+                raise ConcurrenciaException(
+                    "el viaje fue modificado por otro proceso, vuelva a intentarlo"
+                )
+
+    def get_viajes(self):
+        """obtiene el listado de viajes leyendo solo el manifiesto
+
+        Returns:
+            list[Viaje]: copia de la lista de viajes en memoria
+        """
+        with self.__bloqueo.hilos:
+            self.__refrescar()
+            return list(self.__viajes)
+
+    def get_viaje(self, fecha: date):
+        """obtiene el viaje que contiene la fecha dada
+
+        Args:
+            fecha (date): la fecha a buscar
+
+        Returns:
+            Viaje | None: el viaje que contiene la fecha o None si no existe
+        """
+        with self.__bloqueo.hilos:
+            self.__refrescar()
+            viaje = self.__indice.buscar(fecha)
+            if self.__pendientes is not None:
+                return viaje
+            if viaje is not None and not self.__shard_vigente(viaje):
+                self.__cargado = False
+                self.__refrescar()
+                viaje = self.__indice.buscar(fecha)
+            return viaje
+
+    def hay_cruce(self, fecha_inicio: date, fecha_fin: date) -> bool:
+        """verifica si el intervalo dado se cruza con algun viaje almacenado
+
+        Args:
+            fecha_inicio (date): fecha de inicio del intervalo
+            fecha_fin (date): fecha de fin del intervalo
+
+        Returns:
+            bool: True si existe algun viaje que se cruce con el intervalo
+        """
+        with self.__bloqueo.hilos:
+            self.__refrescar()
+            return self.__indice.hay_cruce(fecha_inicio, fecha_fin)
+
+    @staticmethod
+    def __encabezado(viaje: Viaje) -> dict:
+        """obtiene la entrada del manifiesto de un viaje
+
+        Args:
+            viaje (Viaje): el viaje
+
+        Returns:
+            dict: encabezado del viaje con el nombre de su archivo de gastos
+        """
+        return {
+            "destino": viaje.destino,
+            "fecha_inicio": viaje.fecha_inicio.isoformat(),
+            "fecha_fin": viaje.fecha_fin.isoformat(),
+            "presupuesto_diario": viaje.presupuesto_diario,
+            "archivo": ViajesShardRepository.archivo_viaje(viaje),
+        }
+
+    def __escribir_manifiesto(self, viajes):
+        """reescribe el manifiesto con los encabezados de los viajes dados
+
+        Args:
+            viajes (list[Viaje]): los viajes del manifiesto
+        """
+        os.makedirs(self.directorio, exist_ok=True)
+        escribir_json(self.ruta_manifiesto, [self.__encabezado(v) for v in viajes])
+
+    def __escribir_shard(self, viaje: Viaje):
+        """reescribe el archivo de gastos de un viaje y registra su firma
+
+        Args:
+            viaje (Viaje): el viaje cuyos gastos se escriben
+        """
+        os.makedirs(self.directorio, exist_ok=True)
+        archivo = self.archivo_viaje(viaje)
+        ruta = self.__ruta(archivo)
+        escribir_json(ruta, viaje.to_dict()["gastos"])
+        self.__firmas_shards[archivo] = self.__firma_archivo(ruta)
+
+    def agregar_viaje(self, viaje: Viaje):
+        """agrega un viaje escribiendo su archivo de gastos y el manifiesto
+
+        Args:
+            viaje (Viaje): el viaje a agregar
+
+        Raises:
+            ConcurrenciaException: excepcion lanzada si otro proceso modifico los viajes
+                desde la ultima lectura, en la que se valido el viaje
+        """
+        with self.__bloqueo:
+            self.__verificar_version()
+            if self.__pendientes is not None:
+                self.__pendientes[self.archivo_viaje(viaje)] = viaje
+                self.__manifiesto_pendiente = True
+            else:
+                self.__escribir_shard(viaje)
+                self.__escribir_manifiesto(self.__viajes + [viaje])
+                self.__firma = self.__firma_archivo(self.ruta_manifiesto)
+            self.__viajes.append(viaje)
+            self.__indice.agregar(viaje)
+
+    def agregar_gasto(self, viaje: Viaje, gasto: Gasto):
+        """agrega un gasto a un viaje reescribiendo solo el archivo de ese viaje
+
+        Args:
+            viaje (Viaje): el viaje, obtenido de este repositorio, al que pertenece el gasto
+            gasto (Gasto): el gasto a agregar
+        """
+        self.agregar_gastos([(viaje, gasto)])
+
+    def agregar_gastos(self, gastos):
+        """agrega un lote de gastos reescribiendo una vez el archivo de cada viaje afectado
+
+        Args:
+            gastos (list[tuple[Viaje, Gasto]]): pares (viaje del repositorio, gasto)
+
+        Raises:
+            ConcurrenciaException: excepcion lanzada si otro proceso modifico los
+                archivos de los viajes desde que se obtuvieron los viajes dados
+        """
+        with self.__bloqueo:
+            self.__verificar_version(viaje for viaje, _ in gastos)
+            afectados = {}
+            for viaje, gasto in gastos:
+                viaje.agregar_gasto(gasto)
+                afectados[self.archivo_viaje(viaje)] = viaje
+            if self.__pendientes is not None:
+                self.__pendientes.update(afectados)
+                return
+            for viaje in afectados.values():
+                self.__escribir_shard(viaje)
+
+    @contextmanager
+    def sesion(self):
+        """sesion de escritura diferida: dentro de ella los viajes y gastos agregados
+        solo se aplican en memoria, sin volver a leer los archivos, y al cerrarla se
+        escribe una sola vez cada archivo de viaje modificado y, si hay viajes nuevos,
+        el manifiesto. Si la sesion termina con una excepcion no se escribe nada y el
+        estado en memoria se descarta. La sesion mantiene el bloqueo de los archivos
+        hasta cerrarla. Las sesiones anidadas se unen a la exterior
+
+        Yields:
+            ViajesShardRepository: el mismo repositorio
+        """
+        with self.__bloqueo:
+            if self.__pendientes is not None:
+                yield self
+                return
+            self.__refrescar()
+            if not all(
+                self.__firma_archivo(self.__ruta(archivo)) == firma
+                for archivo, firma in self.__firmas_shards.items()
+            ):
+                self.__cargado = False
+                self.__refrescar()
+            self.__pendientes = {}
+            try:
+                yield self
+            except BaseException:
+                self.__pendientes = None
+                self.__manifiesto_pendiente = False
+                self.__cargado = False
+                raise
+            pendientes, self.__pendientes = self.__pendientes, None
+            manifiesto, self.__manifiesto_pendiente = self.__manifiesto_pendiente, False
+            if not pendientes:
+                return
+            for viaje in pendientes.values():
+                self.__escribir_shard(viaje)
+            if manifiesto:
+                self.__escribir_manifiesto(self.__viajes)
+                self.__firma = self.__firma_archivo(self.ruta_manifiesto)
+
+    def guardar(self, viajes):
+        """reescribe el manifiesto y los archivos de todos los viajes dados, eliminando
+        los archivos de viajes que ya no existen. Dentro de una sesion tambien descarta
+        los cambios pendientes, que quedan incluidos en los archivos
+
+        Args:
+            viajes (list[Viaje]): la lista de viajes a guardar
+        """
+        with self.__bloqueo:
+            for viaje in viajes:
+                self.__escribir_shard(viaje)
+            self.__escribir_manifiesto(viajes)
+            vigentes = {self.archivo_viaje(viaje) for viaje in viajes}
+            for archivo in os.listdir(self.directorio):
+                if archivo.endswith(".json") and archivo != "manifest.json":
+                    if archivo not in vigentes:
+                        os.remove(self.__ruta(archivo))
+            self.__cargar(list(viajes), self.__firma_archivo(self.ruta_manifiesto))
+            if self.__pendientes is not None:
+                self.__pendientes = {}
+                self.__manifiesto_pendiente = False
+
+    def importar_json(self, ruta_json: str = "archivos/viajes.json"):
+        """migra los viajes de un archivo viajes.json (y su bitacora) a este
+        almacenamiento, reemplazando su contenido actual
+
+        Args:
+            ruta_json (str): ruta del archivo viajes.json a migrar
+
+        Returns:
+            int: cantidad de viajes migrados
+        """
+        viajes = ViajesRepository(ruta_json).get_viajes()
+        self.guardar(viajes)
+        return len(viajes)
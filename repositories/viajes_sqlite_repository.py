@@ -0,0 +1,378 @@
+"""
+Este módulo proporciona un repositorio de viajes respaldado por una base de datos SQLite.
+
+Es una alternativa a ViajesRepository con la misma interfaz: los viajes y gastos se
+guardan en las tablas viajes y gastos, con indices sobre las fechas, de modo que buscar
+el viaje de una fecha, validar cruces y registrar un gasto son consultas indexadas e
+inserciones de una sola fila.
+
+Los totales agregados de cada viaje (ver Viaje.agregados) se guardan en la tabla
+agregados, junto con el id del ultimo gasto que incluyen, y se actualizan en la misma
+transaccion que cada gasto. Los viajes se estructuran con esos totales y sus gastos
+solo se consultan cuando se accede a ellos.
+
+La conexion se puede usar desde varios hilos (por ejemplo el pool del servidor HTTP):
+todas las operaciones sobre ella se serializan con un bloqueo reentrante, que las
+sesiones mantienen hasta cerrarse.
+
+Importaciones:
+- contextlib.contextmanager: para definir las sesiones de escritura diferida.
+- datetime.date: para el manejo de fechas.
+- functools.partial: para asociar a cada viaje la consulta perezosa de sus gastos.
+- json: para serializar los totales agregados de los viajes.
+- sqlite3: para el acceso a la base de datos.
+- threading: para serializar el uso de la conexion entre hilos.
+- Viaje: La clase que representa un viaje.
+- Gasto: La clase que representa un gasto.
+- ViajesRepository: para importar los viajes de un archivo viajes.json existente.
+"""
+
+from contextlib import contextmanager
+from datetime import date
+from functools import partial
+import json
+import sqlite3
+import threading
+from models.viaje import Viaje
+from models.gasto import Gasto
+from repositories.viajes_repository import ViajesRepository
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS viajes (
+    id INTEGER PRIMARY KEY,
+    destino TEXT NOT NULL,
+    fecha_inicio TEXT NOT NULL UNIQUE,
+    fecha_fin TEXT NOT NULL,
+    presupuesto_diario REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_viajes_fechas ON viajes (fecha_inicio, fecha_fin);
+CREATE TABLE IF NOT EXISTS gastos (
+    id INTEGER PRIMARY KEY,
+    viaje_id INTEGER NOT NULL REFERENCES viajes (id),
+    fecha TEXT NOT NULL,
+    valor REAL NOT NULL,
+    metodo_pago TEXT NOT NULL,
+    tipo_gasto TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_gastos_fecha ON gastos (fecha);
+CREATE INDEX IF NOT EXISTS idx_gastos_viaje ON gastos (viaje_id);
+CREATE TABLE IF NOT EXISTS agregados (
+    viaje_id INTEGER PRIMARY KEY REFERENCES viajes (id),
+    datos TEXT NOT NULL,
+    ultimo_gasto INTEGER
+);
+-- los viajes registrados sin gastos guardaban ultimo_gasto NULL, que se interpreta
+-- como ausencia de limite al cargar sus gastos
+UPDATE agregados SET ultimo_gasto = 0 WHERE ultimo_gasto IS NULL;
+"""
+
+
+class ViajesSqliteRepository:
+    """repositorio de viajes almacenados en una base de datos SQLite"""
+
+    def __init__(self, ruta: str = "archivos/viajes.db") -> None:
+        self.ruta = ruta
+        self.conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self.conexion.executescript(ESQUEMA)
+        self.__en_sesion = False
+        self.__bloqueo = threading.RLock()
+
+    def cerrar(self):
+        """cierra la conexion con la base de datos"""
+        with self.__bloqueo:
+            self.conexion.close()
+
+    @contextmanager
+    def __transaccion(self):
+        """transaccion de una operacion, que se confirma al terminar salvo dentro de
+        una sesion, donde se confirma al cerrar la sesion"""
+        with self.__bloqueo:
+            if self.__en_sesion:
+                yield
+                return
+            with self.conexion:
+                yield
+
+    @contextmanager
+    def sesion(self):
+        """sesion de escritura diferida: todas las operaciones dentro de ella forman
+        una sola transaccion, que se confirma al cerrarla o se revierte si termina con
+        una excepcion. Las sesiones anidadas se unen a la sesion exterior
+
+        Yields:
+            ViajesSqliteRepository: el mismo repositorio
+        """
+        with self.__bloqueo:
+            if self.__en_sesion:
+                yield self
+                return
+            self.__en_sesion = True
+            try:
+                with self.conexion:
+                    yield self
+            finally:
+                self.__en_sesion = False
+
+    def __viaje(self, fila) -> Viaje:
+        """estructura un viaje a partir de una fila de la tabla viajes con sus totales
+        agregados. Sus gastos se consultan la primera vez que se accede a ellos
+
+        Args:
+            fila (tuple): (id, destino, fecha_inicio, fecha_fin, presupuesto_diario,
+                agregados en formato JSON o None, id del ultimo gasto agregado)
+
+        Returns:
+            Viaje: el viaje estructurado
+        """
+        return Viaje.from_dict(
+            {
+                "destino": fila[1],
+                "fecha_inicio": fila[2],
+                "fecha_fin": fila[3],
+                "presupuesto_diario": fila[4],
+                "agregados": None if fila[5] is None else json.loads(fila[5]),
+            },
+            cargar_gastos=partial(self.__leer_gastos, fila[0], fila[6]),
+        )
+
+    def __leer_gastos(self, viaje_id: int, ultimo_gasto: int = None):
+        """consulta los gastos de un viaje. Se limita a los gastos incluidos en los
+        totales con que se estructuro el viaje, porque los agregados despues en este
+        repositorio ya estan en el viaje
+
+        Args:
+            viaje_id (int): id del viaje
+            ultimo_gasto (int, optional): id del ultimo gasto a consultar, 0 si el viaje
+                se registro sin gastos, todos si es None (viaje sin totales agregados)
+
+        Returns:
+            list[dict]: los gastos del viaje en formato dict, en orden de registro
+        """
+        with self.__bloqueo:
+            filas = self.conexion.execute(
+                "SELECT fecha, valor, metodo_pago, tipo_gasto FROM gastos "
+                "WHERE viaje_id = ? AND (? IS NULL OR id <= ?) ORDER BY id",
+                (viaje_id, ultimo_gasto, ultimo_gasto),
+            ).fetchall()
+        return [
+            {
+                "fecha": fila[0],
+                "valor": fila[1],
+                "metodo_pago": fila[2],
+                "tipo_gasto": fila[3],
+            }
+            for fila in filas
+        ]
+
+    def get_viajes(self):
+        """obtiene el listado completo de viajes con sus totales agregados
+
+        Returns:
+            list[Viaje]: lista de viajes ordenada por fecha de inicio
+        """
+        with self.__bloqueo:
+            filas = self.conexion.execute(
+                "SELECT id, destino, fecha_inicio, fecha_fin, presupuesto_diario, "
+                "datos, ultimo_gasto "
+                "FROM viajes LEFT JOIN agregados ON agregados.viaje_id = viajes.id "
+                "ORDER BY fecha_inicio"
+            ).fetchall()
+        return [self.__viaje(fila) for fila in filas]
+
+    def __ultimo_viaje_hasta(self, fecha: date):
+        """obtiene el viaje con la mayor fecha de inicio menor o igual a la fecha dada.
+        Como los viajes no se cruzan, es el unico que puede contener esa fecha
+
+        Args:
+            fecha (date): la fecha limite
+
+        Returns:
+            tuple | None: (id, destino, fecha_inicio, fecha_fin, presupuesto_diario,
+            agregados, id del ultimo gasto agregado)
+        """
+        with self.__bloqueo:
+            return self.conexion.execute(
+                "SELECT id, destino, fecha_inicio, fecha_fin, presupuesto_diario, "
+                "datos, ultimo_gasto "
+                "FROM viajes LEFT JOIN agregados ON agregados.viaje_id = viajes.id "
+                "WHERE fecha_inicio <= ? ORDER BY fecha_inicio DESC LIMIT 1",
+                (fecha.isoformat(),),
+            ).fetchone()
+
+    def get_viaje(self, fecha: date):
+        """obtiene el viaje que contiene la fecha dada
+
+        Args:
+            fecha (date): la fecha a buscar
+
+        Returns:
+            Viaje | None: el viaje que contiene la fecha o None si no existe
+        """
+        fila = self.__ultimo_viaje_hasta(fecha)
+        if fila is None or fila[3] < fecha.isoformat():
+            return None
+        return self.__viaje(fila)
+
+    def hay_cruce(self, fecha_inicio: date, fecha_fin: date) -> bool:
+        """verifica si el intervalo dado se cruza con algun viaje almacenado
+
+        Args:
+            fecha_inicio (date): fecha de inicio del intervalo
+            fecha_fin (date): fecha de fin del intervalo
+
+        Returns:
+            bool: True si existe algun viaje que se cruce con el intervalo
+        """
+        fila = self.__ultimo_viaje_hasta(fecha_fin)
+        return fila is not None and fila[3] >= fecha_inicio.isoformat()
+
+    def __insertar_viaje(self, viaje: Viaje):
+        """inserta un viaje y sus gastos sin confirmar la transaccion
+
+        Args:
+            viaje (Viaje): el viaje a insertar
+        """
+        cursor = self.conexion.execute(
+            "INSERT INTO viajes (destino, fecha_inicio, fecha_fin, presupuesto_diario) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                viaje.destino,
+                viaje.fecha_inicio.isoformat(),
+                viaje.fecha_fin.isoformat(),
+                viaje.presupuesto_diario,
+            ),
+        )
+        self.conexion.executemany(
+            "INSERT INTO gastos (viaje_id, fecha, valor, metodo_pago, tipo_gasto) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                (
+                    cursor.lastrowid,
+                    gasto.fecha.isoformat(),
+                    gasto.valor,
+                    gasto.metodo_pago,
+                    gasto.tipo_gasto,
+                )
+                for gasto in viaje.gastos
+            ),
+        )
+        self.conexion.execute(
+            "INSERT INTO agregados (viaje_id, datos, ultimo_gasto) "
+            "SELECT ?, ?, COALESCE(MAX(id), 0) FROM gastos WHERE viaje_id = ?",
+            (cursor.lastrowid, json.dumps(viaje.agregados()), cursor.lastrowid),
+        )
+
+    def agregar_viaje(self, viaje: Viaje):
+        """agrega un viaje a la base de datos
+
+        Args:
+            viaje (Viaje): el viaje a agregar
+        """
+        with self.__transaccion():
+            self.__insertar_viaje(viaje)
+
+    def agregar_gasto(self, viaje: Viaje, gasto: Gasto):
+        """agrega un gasto a un viaje insertando una sola fila
+
+        Args:
+            viaje (Viaje): el viaje al que pertenece el gasto
+            gasto (Gasto): el gasto a agregar
+        """
+        self.agregar_gastos([(viaje, gasto)])
+
+    def __totales_guardados(self, fecha_inicio: str):
+        """estructura el viaje con los totales agregados tal como estan guardados, sin
+        sus gastos, para calcular los totales nuevos sobre ellos. Se consulta dentro de
+        la transaccion de escritura, de modo que incluye los gastos agregados por
+        otras conexiones aunque el viaje en memoria no los tenga
+
+        Args:
+            fecha_inicio (str): fecha de inicio del viaje en formato ISO
+
+        Returns:
+            Viaje | None: el viaje con los totales guardados, o None si no existe
+        """
+        fila = self.conexion.execute(
+            "SELECT id, destino, fecha_inicio, fecha_fin, presupuesto_diario, "
+            "datos, ultimo_gasto "
+            "FROM viajes LEFT JOIN agregados ON agregados.viaje_id = viajes.id "
+            "WHERE fecha_inicio = ?",
+            (fecha_inicio,),
+        ).fetchone()
+        return None if fila is None else self.__viaje(fila)
+
+    def agregar_gastos(self, gastos):
+        """agrega un lote de gastos en una sola transaccion, que tambien actualiza los
+        totales agregados de los viajes afectados. La transaccion toma el bloqueo de
+        escritura de la base de datos antes de leer los totales guardados, para que
+        las escrituras concurrentes de otros procesos no se pisen. Los viajes en
+        memoria solo se modifican despues de confirmar la transaccion, de modo que si
+        falla quedan como estaban (dentro de una sesion, despues de ejecutar sus
+        sentencias)
+
+        Args:
+            gastos (list[tuple[Viaje, Gasto]]): pares (viaje, gasto) a agregar
+        """
+        with self.__transaccion():
+            if not self.conexion.in_transaction:
+                self.conexion.execute("BEGIN IMMEDIATE")
+            afectados = {}
+            for viaje, gasto in gastos:
+                clave = viaje.fecha_inicio.isoformat()
+                if clave not in afectados:
+                    afectados[clave] = self.__totales_guardados(clave)
+                if afectados[clave] is not None:
+                    afectados[clave].agregar_gasto(gasto)
+            self.conexion.executemany(
+                "INSERT INTO gastos (viaje_id, fecha, valor, metodo_pago, tipo_gasto) "
+                "SELECT id, ?, ?, ?, ? FROM viajes WHERE fecha_inicio = ?",
+                (
+                    (
+                        gasto.fecha.isoformat(),
+                        gasto.valor,
+                        gasto.metodo_pago,
+                        gasto.tipo_gasto,
+                        viaje.fecha_inicio.isoformat(),
+                    )
+                    for viaje, gasto in gastos
+                ),
+            )
+            self.conexion.executemany(
+                "INSERT OR REPLACE INTO agregados (viaje_id, datos, ultimo_gasto) "
+                "SELECT id, ?, (SELECT MAX(id) FROM gastos WHERE viaje_id = viajes.id) "
+                "FROM viajes WHERE fecha_inicio = ?",
+                (
+                    (json.dumps(guardado.agregados()), clave)
+                    for clave, guardado in afectados.items()
+                    if guardado is not None
+                ),
+            )
+        for viaje, gasto in gastos:
+            viaje.agregar_gasto(gasto)
+
+    def guardar(self, viajes):
+        """reemplaza todo el contenido de la base de datos con la lista de viajes dada
+
+        Args:
+            viajes (list[Viaje]): la lista de viajes a guardar
+        """
+        with self.__transaccion():
+            self.conexion.execute("DELETE FROM agregados")
+            self.conexion.execute("DELETE FROM gastos")
+            self.conexion.execute("DELETE FROM viajes")
+            for viaje in viajes:
+                self.__insertar_viaje(viaje)
+
+    def importar_json(self, ruta_json: str = "archivos/viajes.json"):
+        """importa los viajes de un archivo viajes.json (y su bitacora), reemplazando
+        el contenido actual de la base de datos
+
+        Args:
+            ruta_json (str): ruta del archivo viajes.json a importar
+
+        Returns:
+            int: cantidad de viajes importados
+        """
+        viajes = ViajesRepository(ruta_json).get_viajes()
+        self.guardar(viajes)
+        return len(viajes)
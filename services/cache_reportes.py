@@ -0,0 +1,158 @@
+"""
+Este módulo proporciona una cache de reportes de viajes.
+
+Los reportes se guardan por identidad y version del viaje (ver Viaje.identidad y
+Viaje.version), de modo que solo se recalculan cuando el viaje cambia. La cache tiene
+un nivel en memoria y otro opcional en disco, ambos con capacidad limitada y
+desalojo del reporte usado hace mas tiempo (LRU).
+
+Importaciones:
+- collections.OrderedDict: para el orden de uso de los reportes en memoria.
+- os: para el manejo de los archivos de la cache y del reporte.
+- Viaje: La clase que representa un viaje.
+- Reporte: servicio de generacion de reportes.
+
+hashlib, usado para nombrar los archivos de la cache en disco, se importa solo al
+usar la cache en disco.
+"""
+
+from collections import OrderedDict
+import os
+from models.viaje import Viaje
+from models.reporte import Reporte
+
+
+def _escribir_texto(ruta: str, contenido: str):
+    """escribe el texto en un archivo temporal que luego reemplaza a la ruta dada
+
+    Args:
+        ruta (str): ruta del archivo a escribir
+        contenido (str): el texto a escribir
+    """
+    temporal = ruta + ".tmp"
+    try:
+        with open(temporal, "w", encoding="utf-8") as f:
+            f.write(contenido)
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+class CacheReportes:
+    """cache LRU en memoria y en disco de los reportes de los viajes"""
+
+    def __init__(
+        self, capacidad: int = 32, directorio: str = None, capacidad_disco: int = 256
+    ) -> None:
+        self.capacidad = capacidad
+        self.directorio = directorio
+        self.capacidad_disco = capacidad_disco
+        self.__reportes = OrderedDict()
+        self.__escritos = {}
+
+    @staticmethod
+    def clave(viaje: Viaje) -> tuple:
+        """obtiene la llave de cache del viaje
+
+        Args:
+            viaje (Viaje): el viaje
+
+        Returns:
+            tuple: identidad y version del viaje
+        """
+        return viaje.identidad + viaje.version
+
+    def __ruta_disco(self, clave: tuple) -> str:
+        import hashlib
+
+        nombre = hashlib.sha256(repr(clave).encode("utf-8")).hexdigest()
+        return os.path.join(self.directorio, f"{nombre}.txt")
+
+    def __leer_disco(self, clave: tuple):
+        """lee de la cache en disco el reporte de la llave dada
+
+        Args:
+            clave (tuple): la llave del reporte
+
+        Returns:
+            str | None: el reporte o None si no esta en disco
+        """
+        if self.directorio is None:
+            return None
+        ruta = self.__ruta_disco(clave)
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                contenido = f.read()
+            os.utime(ruta)
+        except OSError:
+            return None
+        return contenido
+
+    def __escribir_disco(self, clave: tuple, contenido: str):
+        """guarda el reporte en disco y desaloja los usados hace mas tiempo
+
+        Args:
+            clave (tuple): la llave del reporte
+            contenido (str): el reporte
+        """
+        if self.directorio is None:
+            return
+        os.makedirs(self.directorio, exist_ok=True)
+        _escribir_texto(self.__ruta_disco(clave), contenido)
+        archivos = [
+            os.path.join(self.directorio, nombre)
+            for nombre in os.listdir(self.directorio)
+            if nombre.endswith(".txt")
+        ]
+        if len(archivos) > self.capacidad_disco:
+            archivos.sort(key=os.path.getmtime)
+            for ruta in archivos[: len(archivos) - self.capacidad_disco]:
+                os.remove(ruta)
+
+    def obtener(self, viaje: Viaje) -> str:
+        """obtiene el reporte del viaje, generandolo solo si no esta en cache
+
+        Args:
+            viaje (Viaje): el viaje
+
+        Returns:
+            str: el reporte del viaje
+        """
+        clave = self.clave(viaje)
+        contenido = self.__reportes.get(clave)
+        if contenido is not None:
+            self.__reportes.move_to_end(clave)
+            return contenido
+        contenido = self.__leer_disco(clave)
+        if contenido is None:
+            contenido = "".join(Reporte.lineas_reporte(viaje))
+            self.__escribir_disco(clave, contenido)
+        self.__reportes[clave] = contenido
+        if len(self.__reportes) > self.capacidad:
+            self.__reportes.popitem(last=False)
+        return contenido
+
+    def escribir(self, viaje: Viaje, ruta: str):
+        """escribe de forma atomica el reporte del viaje en la ruta dada. Si la ruta ya
+        contiene el reporte de esta version del viaje, no se reescribe
+
+        Args:
+            viaje (Viaje): el viaje
+            ruta (str): ruta del archivo de reporte
+        """
+        clave = self.clave(viaje)
+        escrito = self.__escritos.get(ruta)
+        if escrito is not None and escrito == (clave, self.__firma(ruta)):
+            return
+        _escribir_texto(ruta, self.obtener(viaje))
+        self.__escritos[ruta] = (clave, self.__firma(ruta))
+
+    @staticmethod
+    def __firma(ruta: str):
+        try:
+            estado = os.stat(ruta)
+        except FileNotFoundError:
+            return None
+        return (estado.st_mtime_ns, estado.st_size, estado.st_ino)
@@ -0,0 +1,42 @@
+"""
+Este módulo lee archivos de gastos para su importacion por lotes.
+
+Soporta archivos CSV con encabezado (fecha,valor,metodo_pago,tipo_gasto) y archivos
+JSON Lines con un objeto por linea. Las filas se leen de forma perezosa, sin cargar
+el archivo completo en memoria. Una linea JSON invalida no detiene la lectura: en su
+lugar se entrega un ValueError, que la importacion reporta como error de esa fila.
+Los archivos CSV pueden empezar con la marca de orden de bytes (BOM) de UTF-8.
+
+Importaciones:
+- csv: para la lectura de archivos CSV.
+- json: para la lectura de archivos JSON Lines.
+- os: para identificar la extension del archivo.
+"""
+
+import csv
+import json
+import os
+
+EXTENSIONES_JSONL = (".jsonl", ".ndjson")
+
+
+def leer_filas(ruta: str):
+    """lee una a una las filas de gastos de un archivo CSV o JSON Lines
+
+    Args:
+        ruta (str): ruta del archivo a leer, el formato se deduce de la extension
+
+    Yields:
+        dict | ValueError: fila con las llaves fecha, valor, metodo_pago y tipo_gasto,
+        o el error de una linea JSON invalida
+    """
+    with open(ruta, "r", encoding="utf-8-sig", newline="") as f:
+        if os.path.splitext(ruta)[1].lower() in EXTENSIONES_JSONL:
+            for linea in f:
+                if linea.strip():
+                    try:
+                        yield json.loads(linea)
+                    except json.decoder.JSONDecodeError as e:
+                        yield ValueError(f"linea JSON invalida: {e}")
+        else:
+            yield from csv.DictReader(f)
@@ -0,0 +1,393 @@
+"""
+Este módulo proporciona un servicio HTTP/JSON asincrono sobre ViajesController.
+
+El servidor usa asyncio.start_server con un analizador minimo de HTTP/1.1 (conexiones
+persistentes, cuerpos con Content-Length) y atiende concurrentemente a todos los
+clientes con un unico controlador, cuyos viajes se mantienen en memoria entre
+solicitudes. Las consultas, los reportes y las escrituras en el repositorio se
+ejecutan en el pool de hilos del servidor para no detener el ciclo de eventos.
+
+Los viajes y gastos se registran con las variantes asincronas del controlador
+(ViajesController.registrar_viaje_async y registrar_gasto_async): las esperas de red
+por las tasas de cambio de varios clientes se solapan y solo el registro en si, que
+valida contra los viajes almacenados y escribe en el repositorio, se serializa.
+
+Rutas:
+- GET /viajes: lista de viajes, sin sus gastos, con el total gastado.
+- POST /viajes: registra un viaje, cuerpo {destino, fecha_inicio, fecha_fin,
+  presupuesto_diario}.
+- POST /gastos: registra un gasto, cuerpo {fecha, valor, metodo_pago, tipo_gasto}.
+- GET /reportes?fecha=YYYY-MM-DD: reporte en texto del viaje que contiene la fecha.
+
+Importaciones:
+- asyncio: para el servidor y el ciclo de eventos.
+- concurrent.futures.ThreadPoolExecutor: pool de hilos de las operaciones bloqueantes.
+- datetime.date: para interpretar las fechas de las solicitudes.
+- http.HTTPStatus: para los codigos y textos de estado de las respuestas.
+- json: para leer y escribir los cuerpos de las solicitudes y respuestas.
+- logging: para registrar los errores de las conexiones y de las solicitudes.
+- threading: para serializar la generacion de reportes.
+- urllib.parse: para separar la ruta y los parametros de consulta.
+- ViajesController: la clase que maneja la logica de negocio de viajes y gastos.
+- ViajeException: excepcion de las operaciones sobre viajes.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http import HTTPStatus
+import json
+import logging
+import threading
+from urllib.parse import parse_qs, urlsplit
+from controllers.viajes_controller import ViajesController
+from exceptions.viaje_exception import ViajeException
+
+
+class SolicitudInvalida(Exception):
+    """excepcion usada cuando una solicitud HTTP no se puede atender
+
+    Args:
+        Exception: clase base para excepciones
+    """
+
+    def __init__(self, estado: HTTPStatus, mensaje: str) -> None:
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+class ServidorViajes:
+    """servidor HTTP/JSON asincrono que atiende las solicitudes con un controlador"""
+
+    MAX_CUERPO = 1024 * 1024
+
+    def __init__(self, controller: ViajesController, hilos: int = None) -> None:
+        self.controller = controller
+        self.__hilos = ThreadPoolExecutor(
+            max_workers=hilos, thread_name_prefix="servidor-viajes"
+        )
+        self.__reportes = threading.Lock()
+
+    async def iniciar(self, host: str = "127.0.0.1", puerto: int = 8000):
+        """inicia el servidor en la direccion dada
+
+        Args:
+            host (str, optional): direccion en la que escuchar
+            puerto (int, optional): puerto en el que escuchar, 0 para uno libre
+
+        Returns:
+            asyncio.Server: el servidor iniciado
+        """
+        return await asyncio.start_server(self.atender, host, puerto)
+
+    def cerrar(self):
+        """espera a que terminen las operaciones en curso y libera el pool de hilos"""
+        self.__hilos.shutdown(wait=True)
+
+    async def __en_hilo(self, funcion, *argumentos):
+        """ejecuta una funcion bloqueante en el pool de hilos
+
+        Args:
+            funcion (Callable): la funcion a ejecutar
+            *argumentos: los argumentos de la funcion
+
+        Returns:
+            object: el resultado de la funcion
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self.__hilos, funcion, *argumentos
+        )
+
+    async def atender(
+        self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter
+    ):
+        """atiende las solicitudes de una conexion hasta que el cliente la cierre. Los
+        errores inesperados de una solicitud se registran y se responden con estado 500
+
+        Args:
+            lector (asyncio.StreamReader): flujo de lectura de la conexion
+            escritor (asyncio.StreamWriter): flujo de escritura de la conexion
+        """
+        try:
+            while True:
+                solicitud = await self.__leer_solicitud(lector)
+                if solicitud is None:
+                    break
+                metodo, ruta, encabezados, cuerpo = solicitud
+                try:
+                    estado, tipo, contenido = await self.despachar(metodo, ruta, cuerpo)
+                except SolicitudInvalida as e:
+                    estado, tipo, contenido = self.__json(e.estado, {"error": str(e)})
+                except Exception:
+                    logging.exception("error inesperado atendiendo %s %s", metodo, ruta)
+                    estado, tipo, contenido = self.__json(
+                        HTTPStatus.INTERNAL_SERVER_ERROR,
+                        {"error": "error interno del servidor"},
+                    )
+                mantener = encabezados.get("connection", "").lower() != "close"
+                escritor.write(self.__respuesta(estado, tipo, contenido, mantener))
+                await escritor.drain()
+                if not mantener:
+                    break
+        except SolicitudInvalida as e:
+            estado, tipo, contenido = self.__json(e.estado, {"error": str(e)})
+            escritor.write(self.__respuesta(estado, tipo, contenido, False))
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            logging.debug("conexion terminada: %s", e)
+        finally:
+            escritor.close()
+
+    async def __leer_solicitud(self, lector: asyncio.StreamReader):
+        """lee una solicitud HTTP de la conexion
+
+        Args:
+            lector (asyncio.StreamReader): flujo de lectura de la conexion
+
+        Raises:
+            SolicitudInvalida: excepcion lanzada si la solicitud esta mal formada
+
+        Returns:
+            tuple | None: metodo, ruta, encabezados y cuerpo, o None si la conexion
+            se cerro antes de iniciar una solicitud
+        """
+        linea = await lector.readline()
+        if not linea.strip():
+            return None
+        try:
+            metodo, ruta, _ = linea.decode("latin-1").split()
+        except ValueError as e:
+            raise SolicitudInvalida(
+                HTTPStatus.BAD_REQUEST, "linea de solicitud invalida"
+            ) from e
+        encabezados = {}
+        while True:
+            linea = await lector.readline()
+            if linea in (b"\r\n", b"\n", b""):
+                break
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            encabezados[nombre.strip().lower()] = valor.strip()
+        try:
+            longitud = int(encabezados.get("content-length", 0))
+        except ValueError as e:
+            raise SolicitudInvalida(
+                HTTPStatus.BAD_REQUEST, "Content-Length invalido"
+            ) from e
+        if not 0 <= longitud <= self.MAX_CUERPO:
+            raise SolicitudInvalida(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "cuerpo de la solicitud muy grande"
+            )
+        cuerpo = await lector.readexactly(longitud) if longitud else b""
+        return metodo.upper(), ruta, encabezados, cuerpo
+
+    @staticmethod
+    def __json(estado: HTTPStatus, datos):
+        """construye una respuesta JSON
+
+        Args:
+            estado (HTTPStatus): el estado de la respuesta
+            datos (object): los datos a serializar
+
+        Returns:
+            tuple: estado, tipo de contenido y contenido de la respuesta
+        """
+        return estado, "application/json", json.dumps(datos).encode("utf-8")
+
+    @staticmethod
+    def __respuesta(estado: HTTPStatus, tipo: str, contenido: bytes, mantener: bool):
+        """serializa una respuesta HTTP/1.1
+
+        Args:
+            estado (HTTPStatus): el estado de la respuesta
+            tipo (str): el tipo de contenido
+            contenido (bytes): el cuerpo de la respuesta
+            mantener (bool): si la conexion se mantiene abierta
+
+        Returns:
+            bytes: la respuesta completa
+        """
+        encabezados = (
+            f"HTTP/1.1 {estado.value} {estado.phrase}\r\n"
+            f"Content-Type: {tipo}; charset=utf-8\r\n"
+            f"Content-Length: {len(contenido)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n"
+        )
+        return encabezados.encode("latin-1") + contenido
+
+    @staticmethod
+    def __leer_json(cuerpo: bytes, campos):
+        """interpreta el cuerpo JSON de una solicitud
+
+        Args:
+            cuerpo (bytes): el cuerpo de la solicitud
+            campos (tuple[str]): los campos requeridos
+
+        Raises:
+            SolicitudInvalida: excepcion lanzada si el cuerpo no es un objeto JSON con
+                los campos requeridos
+
+        Returns:
+            list: los valores de los campos, en el orden dado
+        """
+        try:
+            datos = json.loads(cuerpo or b"{}")
+        except ValueError as e:
+            raise SolicitudInvalida(
+                HTTPStatus.BAD_REQUEST, "el cuerpo no es JSON valido"
+            ) from e
+        if not isinstance(datos, dict):
+            raise SolicitudInvalida(
+                HTTPStatus.BAD_REQUEST, "el cuerpo debe ser un objeto JSON"
+            )
+        faltantes = [campo for campo in campos if campo not in datos]
+        if faltantes:
+            raise SolicitudInvalida(
+                HTTPStatus.BAD_REQUEST, f"campos requeridos: {', '.join(faltantes)}"
+            )
+        return [str(datos[campo]) for campo in campos]
+
+    async def despachar(self, metodo: str, ruta: str, cuerpo: bytes):
+        """atiende una solicitud segun su metodo y ruta
+
+        Args:
+            metodo (str): el metodo HTTP
+            ruta (str): la ruta, con sus parametros de consulta
+            cuerpo (bytes): el cuerpo de la solicitud
+
+        Raises:
+            SolicitudInvalida: excepcion lanzada si la ruta o la solicitud no son
+                validas
+
+        Returns:
+            tuple: estado, tipo de contenido y contenido de la respuesta
+        """
+        partes = urlsplit(ruta)
+        rutas = {
+            ("GET", "/viajes"): lambda: self.get_viajes(),
+            ("POST", "/viajes"): lambda: self.registrar_viaje(cuerpo),
+            ("POST", "/gastos"): lambda: self.registrar_gasto(cuerpo),
+            ("GET", "/reportes"): lambda: self.get_reporte(parse_qs(partes.query)),
+        }
+        atender = rutas.get((metodo, partes.path.rstrip("/") or "/"))
+        if atender is None:
+            if any(path == partes.path.rstrip("/") for _, path in rutas):
+                raise SolicitudInvalida(
+                    HTTPStatus.METHOD_NOT_ALLOWED, "metodo no permitido"
+                )
+            raise SolicitudInvalida(HTTPStatus.NOT_FOUND, "ruta no encontrada")
+        return await atender()
+
+    async def get_viajes(self):
+        """lista los viajes almacenados, sin sus gastos
+
+        Returns:
+            tuple: respuesta con la lista de viajes
+        """
+
+        def listar():
+            return [
+                {
+                    "destino": viaje.destino,
+                    "fecha_inicio": viaje.fecha_inicio.isoformat(),
+                    "fecha_fin": viaje.fecha_fin.isoformat(),
+                    "presupuesto_diario": viaje.presupuesto_diario,
+                    "gastos_totales": resumen.total,
+                }
+                for viaje, resumen in self.controller.get_resumenes()
+            ]
+
+        return self.__json(HTTPStatus.OK, await self.__en_hilo(listar))
+
+    async def registrar_viaje(self, cuerpo: bytes):
+        """registra un viaje con los datos del cuerpo de la solicitud
+
+        Args:
+            cuerpo (bytes): objeto JSON con destino, fecha_inicio, fecha_fin y
+                presupuesto_diario
+
+        Returns:
+            tuple: respuesta con el resultado del registro
+        """
+        argumentos = self.__leer_json(
+            cuerpo, ("destino", "fecha_inicio", "fecha_fin", "presupuesto_diario")
+        )
+        mensaje = await self.controller.registrar_viaje_async(
+            *argumentos, ejecutor=self.__hilos
+        )
+        if not mensaje:
+            return self.__json(
+                HTTPStatus.BAD_REQUEST, {"error": "no se pudo registrar el viaje"}
+            )
+        return self.__json(HTTPStatus.CREATED, {"mensaje": mensaje})
+
+    async def registrar_gasto(self, cuerpo: bytes):
+        """registra un gasto con los datos del cuerpo de la solicitud
+
+        Args:
+            cuerpo (bytes): objeto JSON con fecha, valor, metodo_pago y tipo_gasto
+
+        Returns:
+            tuple: respuesta con el resultado del registro y el balance del dia
+        """
+        argumentos = self.__leer_json(
+            cuerpo, ("fecha", "valor", "metodo_pago", "tipo_gasto")
+        )
+        mensaje = await self.controller.registrar_gasto_async(
+            *argumentos, ejecutor=self.__hilos
+        )
+        if not mensaje:
+            return self.__json(
+                HTTPStatus.BAD_REQUEST, {"error": "no se pudo registrar el gasto"}
+            )
+        return self.__json(HTTPStatus.CREATED, {"mensaje": mensaje})
+
+    async def get_reporte(self, consulta: dict):
+        """obtiene el reporte del viaje que contiene la fecha consultada
+
+        Args:
+            consulta (dict): parametros de consulta, con la fecha del viaje
+
+        Raises:
+            SolicitudInvalida: excepcion lanzada si la fecha no es valida o no hay un
+                viaje que la contenga
+
+        Returns:
+            tuple: respuesta con el reporte en texto
+        """
+        try:
+            fecha = date.fromisoformat(consulta["fecha"][0])
+        except (KeyError, ValueError) as e:
+            raise SolicitudInvalida(
+                HTTPStatus.BAD_REQUEST, "parametro fecha requerido (YYYY-MM-DD)"
+            ) from e
+
+        def reporte():
+            viaje = self.controller.buscar_viaje(fecha)
+            with self.__reportes:
+                return self.controller.obtener_reporte(viaje)
+
+        try:
+            contenido = await self.__en_hilo(reporte)
+        except ViajeException as e:
+            raise SolicitudInvalida(HTTPStatus.NOT_FOUND, str(e)) from e
+        return HTTPStatus.OK, "text/plain", contenido.encode("utf-8")
+
+
+async def servir(
+    controller: ViajesController, host: str, puerto: int, hilos: int = None
+):
+    """atiende solicitudes con el controlador dado hasta que se interrumpa
+
+    Args:
+        controller (ViajesController): el controlador compartido por las solicitudes
+        host (str): direccion en la que escuchar
+        puerto (int): puerto en el que escuchar
+        hilos (int, optional): tamaño del pool de hilos de las operaciones bloqueantes
+    """
+    servidor = ServidorViajes(controller, hilos)
+    try:
+        async with await servidor.iniciar(host, puerto) as servidor_tcp:
+            for socket in servidor_tcp.sockets:
+                logging.info("atendiendo en http://%s:%s", *socket.getsockname()[:2])
+            await servidor_tcp.serve_forever()
+    finally:
+        servidor.cerrar()
@@ -0,0 +1,178 @@
+"""
+Este módulo proporciona los proveedores de tasas de cambio usados para convertir
+montos de la moneda del destino a peso colombiano.
+
+Incluye:
+- ProveedorTasas: interfaz comun de los proveedores.
+- ProveedorTasasRemoto: consume la API que simula la tasa de cambio, reutilizando
+  una unica sesion HTTP.
+- ProveedorTasasFijas: tasas definidas en memoria, util para pruebas y fixtures.
+- ProveedorTasasArchivo: tasas leidas de un archivo JSON local.
+- TasasCache: cache con tiempo de vida (TTL) sobre cualquier proveedor, con
+  persistencia opcional en disco.
+
+Importaciones:
+- abc: para declarar la interfaz abstracta de los proveedores.
+- json: para leer y escribir las tasas en archivos.
+- logging: para registrar el uso de tasas vencidas.
+- os: para el reemplazo atomico del archivo de cache.
+- time: para medir la vigencia de las tasas en cache.
+
+requests, usado para hacer solicitudes HTTP a la API de tasas, se importa solo la
+primera vez que ProveedorTasasRemoto hace una solicitud, para no cargar la pila HTTP
+al iniciar la aplicacion ni en los viajes que no convierten moneda.
+"""
+
+from abc import ABC, abstractmethod
+import json
+import logging
+import os
+import time
+
+
+class ProveedorTasas(ABC):
+    """interfaz de un proveedor de tasas de cambio a peso colombiano"""
+
+    @abstractmethod
+    def get_tasa(self, lugar: str) -> float:
+        """obtiene la tasa de cambio de la moneda del lugar dado a peso colombiano
+
+        Args:
+            lugar (str): el lugar del viaje (usa o europa)
+
+        Raises:
+            ValueError: excepcion lanzada si no se puede obtener la tasa
+
+        Returns:
+            float: cantidad de pesos colombianos por unidad de la moneda del lugar
+        """
+
+
+class ProveedorTasasRemoto(ProveedorTasas):
+    """proveedor que consume la API que simula la tasa de cambio del dolar"""
+
+    URL = "https://csrng.net/csrng/csrng.php?min=3500&max=4500"
+
+    def __init__(self, timeout: float = 10) -> None:
+        self.timeout = timeout
+        self.__sesion = None
+
+    @property
+    def sesion(self):
+        """retorna la sesion HTTP reutilizada entre solicitudes, creandola si no existe
+
+        Returns:
+            requests.Session: la sesion HTTP del proveedor
+        """
+        if self.__sesion is None:
+            import requests
+
+            self.__sesion = requests.Session()
+        return self.__sesion
+
+    def get_tasa(self, lugar: str) -> float:
+        import requests
+
+        try:
+            respuesta = self.sesion.get(self.URL, timeout=self.timeout).json()
+        except requests.exceptions.Timeout as e:
+            raise ValueError(
+                "La solicitud para obtener la tasa de cambio ha expirado"
+            ) from e
+        except requests.exceptions.RequestException as e:
+            raise ValueError("No fue posible obtener la tasa de cambio") from e
+        try:
+            valor_moneda = respuesta[0]["random"]
+            if isinstance(valor_moneda, bool) or not isinstance(
+                valor_moneda, (int, float)
+            ):
+                raise TypeError(f"tasa no numerica: {valor_moneda!r}")
+        except (KeyError, IndexError, TypeError) as e:
+            raise ValueError(
+                f"Respuesta inesperada de la API de tasas de cambio: {respuesta!r}"
+            ) from e
+        if lugar == "usa":
+            return valor_moneda
+        return valor_moneda + 200
+
+
+class ProveedorTasasFijas(ProveedorTasas):
+    """proveedor con tasas de cambio fijas definidas en memoria"""
+
+    def __init__(self, tasas: dict) -> None:
+        self.tasas = dict(tasas)
+
+    def get_tasa(self, lugar: str) -> float:
+        try:
+            return self.tasas[lugar]
+        except KeyError as e:
+            raise ValueError(f"no hay tasa de cambio para {lugar}") from e
+
+
+class ProveedorTasasArchivo(ProveedorTasasFijas):
+    """proveedor con tasas de cambio leidas de un archivo JSON local
+    con la forma {"usa": 4000, "europa": 4200}"""
+
+    def __init__(self, ruta: str = "archivos/tasas.json") -> None:
+        with open(ruta, "r", encoding="utf-8") as f:
+            super().__init__(json.load(f))
+
+
+class TasasCache(ProveedorTasas):
+    """cache con tiempo de vida sobre un proveedor de tasas. Si el proveedor falla
+    y existe una tasa vencida en cache, se usa esa tasa en lugar de fallar"""
+
+    def __init__(
+        self,
+        proveedor: ProveedorTasas,
+        ttl: float = 3600,
+        ruta_cache: str = None,
+        reloj=time.time,
+    ) -> None:
+        self.proveedor = proveedor
+        self.ttl = ttl
+        self.ruta_cache = ruta_cache
+        self.reloj = reloj
+        self.__tasas = self.__leer_cache()
+
+    def __leer_cache(self):
+        """lee las tasas persistidas en el archivo de cache si esta configurado
+
+        Returns:
+            dict: tasas en cache con la forma {lugar: [tasa, momento de obtencion]}
+        """
+        if self.ruta_cache is None:
+            return {}
+        try:
+            with open(self.ruta_cache, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.decoder.JSONDecodeError):
+            return {}
+
+    def __escribir_cache(self):
+        """persiste las tasas en cache en el archivo configurado, si lo hay"""
+        if self.ruta_cache is None:
+            return
+        temporal = self.ruta_cache + ".tmp"
+        try:
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump(self.__tasas, f)
+            os.replace(temporal, self.ruta_cache)
+        except OSError as e:
+            logging.warning("no se pudo guardar la cache de tasas: %s", e)
+
+    def get_tasa(self, lugar: str) -> float:
+        ahora = self.reloj()
+        guardada = self.__tasas.get(lugar)
+        if guardada is not None and ahora - guardada[1] < self.ttl:
+            return guardada[0]
+        try:
+            tasa = self.proveedor.get_tasa(lugar)
+        except ValueError as e:
+            if guardada is None:
+                raise
+            logging.warning("usando tasa de cambio vencida para %s: %s", lugar, e)
+            return guardada[0]
+        self.__tasas[lugar] = [tasa, ahora]
+        self.__escribir_cache()
+        return tasa
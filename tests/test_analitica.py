@@ -0,0 +1,44 @@
+"Analitica entre viajes Unit Tests"
+
+from datetime import date
+from unittest import TestCase, mock
+
+from models import analitica
+from models.gasto import Gasto
+from models.viaje import Viaje
+
+
+class TestAnalitica(TestCase):
+    """analitica entre viajes tests suite"""
+
+    def setUp(self):
+        self.viaje = Viaje("usa", date(2024, 6, 7), date(2024, 6, 9), 100.0)
+        for gasto in [
+            Gasto(date(2024, 6, 7), 10.5, "efectivo", "transporte"),
+            Gasto(date(2024, 6, 7), 5.25, "tarjeta", "compras"),
+            Gasto(date(2024, 6, 9), 2.5, "tarjeta", "transporte"),
+        ]:
+            self.viaje.agregar_gasto(gasto)
+
+    def test_totales_viajes(self):
+        """Test para los totales entre varios viajes"""
+        otro = Viaje("europa", date(2024, 7, 1), date(2024, 7, 2), 10.0, columnar=True)
+        otro.agregar_gasto(Gasto(date(2024, 7, 1), 1.0, "efectivo", "compras"))
+        totales = analitica.totales_viajes([self.viaje, otro])
+        self.assertEqual(totales["total"], 19.25)
+        self.assertEqual(totales["por_destino"], {"europa": 1.0, "usa": 18.25})
+        self.assertEqual(totales["por_metodo"], {"efectivo": 11.5, "tarjeta": 7.75})
+        self.assertEqual(totales["por_tipo"]["compras"], 6.25)
+        self.assertEqual(totales["por_tipo"]["alojamiento"], 0)
+        self.assertEqual(analitica.totales_viajes([])["por_destino"], {})
+
+    def test_totales_viajes_sin_cargar_gastos(self):
+        """Test para totalizar viajes con sus totales persistidos sin cargar sus gastos"""
+        data = {**self.viaje.to_dict(), "agregados": self.viaje.agregados()}
+        perezoso = Viaje.from_dict(
+            data, cargar_gastos=mock.Mock(side_effect=AssertionError)
+        )
+        self.assertEqual(
+            analitica.totales_viajes([perezoso]), analitica.totales_viajes([self.viaje])
+        )
+        self.assertFalse(perezoso.gastos_cargados)
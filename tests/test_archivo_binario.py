@@ -0,0 +1,115 @@
+"Archivo binario de gastos Unit Tests"
+
+import io
+import json
+import os
+import tempfile
+from datetime import date
+from unittest import TestCase
+
+from models.gasto import Gasto
+from models.reporte import Reporte
+from models.viaje import Viaje
+from repositories.archivo_binario import (
+    REGISTRO,
+    GastosBinarios,
+    a_json,
+    desde_json,
+    escribir_binario,
+)
+from repositories.viajes_repository import ViajesRepository
+
+
+class TestArchivoBinario(TestCase):
+    """Archivo binario de gastos tests suite"""
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "binario")
+        self.viaje = Viaje("usa", date(2024, 6, 7), date(2024, 6, 10), 100.0)
+        self.viaje.agregar_gasto(Gasto(date(2024, 6, 7), 10.0, "tarjeta", "alojamiento"))
+        self.viaje.agregar_gasto(Gasto(date(2024, 6, 7), 2.5, "efectivo", "compras"))
+        self.viaje.agregar_gasto(Gasto(date(2024, 6, 9), 30.0, "efectivo", "transporte"))
+        self.vacio = Viaje("europa", date(2024, 7, 1), date(2024, 7, 2), 50.0)
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def test_registros_ancho_fijo(self):
+        """Test para el tamaño del archivo de registros"""
+        escribir_binario(self.ruta, [self.viaje, self.vacio])
+        self.assertEqual(REGISTRO.size, 14)
+        self.assertEqual(
+            os.path.getsize(os.path.join(self.ruta, "gastos.1.bin")), 3 * REGISTRO.size
+        )
+
+    def test_reescritura_reemplaza_tabla_al_final(self):
+        """Test para la version del archivo de gastos y la verificacion de tamaño"""
+        escribir_binario(self.ruta, [self.viaje])
+        escribir_binario(self.ruta, [self.viaje, self.vacio])
+        self.assertEqual(
+            sorted(os.listdir(self.ruta)), ["encabezados.json", "gastos.2.bin"]
+        )
+        with open(os.path.join(self.ruta, "gastos.2.bin"), "ab") as archivo:
+            archivo.write(b"\0" * REGISTRO.size)
+        with self.assertRaises(ValueError):
+            GastosBinarios(self.ruta)
+
+    def test_valores_enteros(self):
+        """Test para conservar los valores enteros al leer los registros"""
+        viaje = Viaje("colombia", date(2024, 8, 1), date(2024, 8, 3), 50000)
+        viaje.agregar_gasto(Gasto(date(2024, 8, 1), 10, "efectivo", "alimentacion"))
+        viaje.agregar_gasto(Gasto(date(2024, 8, 2), 2.5, "tarjeta", "compras"))
+        escribir_binario(self.ruta, [viaje])
+        with GastosBinarios(self.ruta) as binarios:
+            encabezado = binarios.encabezados[0]
+            copia = binarios.viaje(encabezado)
+            reporte = io.StringIO()
+            binarios.escribir_reporte(encabezado, reporte)
+        self.assertEqual(copia.to_dict(), viaje.to_dict())
+        self.assertIsInstance(copia.gastos[0].valor, int)
+        esperado = io.StringIO()
+        Reporte.escribir_reporte(viaje, esperado)
+        self.assertEqual(reporte.getvalue(), esperado.getvalue())
+
+    def test_formato_anterior(self):
+        """Test para leer la tabla de encabezados sin version"""
+        escribir_binario(self.ruta, [self.viaje])
+        with open(os.path.join(self.ruta, "encabezados.json"), encoding="utf-8") as f:
+            tabla = json.load(f)
+        with open(os.path.join(self.ruta, "encabezados.json"), "w", encoding="utf-8") as f:
+            json.dump(tabla["viajes"], f)
+        os.replace(
+            os.path.join(self.ruta, "gastos.1.bin"), os.path.join(self.ruta, "gastos.bin")
+        )
+        with GastosBinarios(self.ruta) as binarios:
+            self.assertEqual(binarios.resumen(binarios.encabezados[0]).total, 42.5)
+
+    def test_resumen_balance_y_reporte(self):
+        """Test para consultar los registros mapeados sin construir gastos"""
+        escribir_binario(self.ruta, [self.viaje, self.vacio])
+        with GastosBinarios(self.ruta) as binarios:
+            encabezado = binarios.buscar(date(2024, 6, 8))
+            self.assertEqual(binarios.resumen(encabezado).total, 42.5)
+            self.assertEqual(binarios.get_balance_dia(encabezado, date(2024, 6, 7)), 87.5)
+            self.assertIsNone(binarios.buscar(date(2024, 6, 20)))
+            for viaje in (self.viaje, self.vacio):
+                reporte = io.StringIO()
+                binarios.escribir_reporte(
+                    binarios.buscar(viaje.fecha_inicio), reporte
+                )
+                esperado = io.StringIO()
+                Reporte.escribir_reporte(viaje, esperado)
+                self.assertEqual(reporte.getvalue(), esperado.getvalue())
+
+    def test_conversion_json(self):
+        """Test para convertir desde y hacia viajes.json"""
+        ruta_json = os.path.join(self.directorio.name, "viajes.json")
+        ruta_copia = os.path.join(self.directorio.name, "copia.json")
+        ViajesRepository(ruta_json).guardar([self.viaje, self.vacio])
+        self.assertEqual(desde_json(ruta_json, self.ruta), 2)
+        self.assertEqual(a_json(self.ruta, ruta_copia), 2)
+        self.assertEqual(
+            [v.to_dict() for v in ViajesRepository(ruta_copia).get_viajes()],
+            [self.viaje.to_dict(), self.vacio.to_dict()],
+        )
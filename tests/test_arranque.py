@@ -0,0 +1,42 @@
+"Arranque de la aplicacion Unit Tests"
+
+import subprocess
+import sys
+from unittest import TestCase
+
+from benchmarks.arranque import RAIZ, interpretar
+
+
+class TestArranque(TestCase):
+    """Arranque de la aplicacion tests suite"""
+
+    def test_importar_main_no_carga_dependencias_pesadas(self):
+        """Test para verificar que importar main no carga requests ni configura logging"""
+        codigo = (
+            "import logging, sys, main; "
+            "pesados = ('requests', 'multiprocessing'); "
+            "print(sorted(m for m in pesados if m in sys.modules)); "
+            "print(len(logging.getLogger().handlers))"
+        )
+        salida = subprocess.run(
+            [sys.executable, "-c", codigo],
+            cwd=RAIZ,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.splitlines()
+        self.assertEqual(salida, ["[]", "0"])
+
+    def test_interpretar_importtime(self):
+        """Test para interpretar solo los modulos importados por el modulo medido"""
+        reporte = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 | site\n"
+            "import time:        20 |         20 |   json.decoder\n"
+            "import time:        30 |         50 |   json\n"
+            "import time:        10 |         60 | main\n"
+        )
+        self.assertEqual(
+            interpretar(reporte, "main"),
+            {"json.decoder": (20, 20), "json": (30, 50), "main": (10, 60)},
+        )
@@ -0,0 +1,125 @@
+"Importacion de gastos por lotes Unit Tests"
+
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from controllers.viajes_controller import ViajesController
+from repositories.viajes_repository import ViajesRepository
+from services.importador_gastos import leer_filas
+from services.tasas_cambio import ProveedorTasasFijas
+
+
+class TestImportadorGastos(TestCase):
+    """importacion de gastos por lotes tests suite"""
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.repositorio = ViajesRepository(
+            os.path.join(self.directorio.name, "viajes.json")
+        )
+        self.proveedor = ProveedorTasasFijas({"usa": 4000})
+        self.controller = ViajesController(self.repositorio, self.proveedor)
+        self.controller.registrar_viaje("usa", "2024-06-07", "2024-06-10", 100)
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def escribir(self, nombre: str, contenido: str):
+        """escribe un archivo de prueba en el directorio temporal"""
+        ruta = os.path.join(self.directorio.name, nombre)
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(contenido)
+        return ruta
+
+    def test_leer_filas_csv_y_jsonl(self):
+        """Test para la lectura de archivos CSV y JSON Lines"""
+        csv_ruta = self.escribir(
+            "gastos.csv",
+            "fecha,valor,metodo_pago,tipo_gasto\n2024-06-07,10,efectivo,compras\n",
+        )
+        jsonl_ruta = self.escribir(
+            "gastos.jsonl",
+            '{"fecha": "2024-06-07", "valor": 10, "metodo_pago": "efectivo", '
+            '"tipo_gasto": "compras"}\n\n',
+        )
+        esperado = {
+            "fecha": "2024-06-07",
+            "metodo_pago": "efectivo",
+            "tipo_gasto": "compras",
+        }
+        for ruta in (csv_ruta, jsonl_ruta):
+            filas = list(leer_filas(ruta))
+            self.assertEqual(len(filas), 1)
+            self.assertEqual(float(filas[0].pop("valor")), 10)
+            self.assertEqual(filas[0], esperado)
+
+    def test_registrar_gastos_lote(self):
+        """Test para el metodo registrar_gastos_lote"""
+        filas = [
+            {"fecha": "2024-06-07", "valor": "10", "metodo_pago": "efectivo",
+             "tipo_gasto": "compras"},
+            {"fecha": "2024-06-20", "valor": "10", "metodo_pago": "efectivo",
+             "tipo_gasto": "compras"},
+            {"fecha": "2024-06-08", "valor": "5", "metodo_pago": "nequi",
+             "tipo_gasto": "compras"},
+            {"fecha": "2024-06-08", "valor": "5", "metodo_pago": "tarjeta"},
+            {"fecha": "2024-06-09", "valor": "2.5", "metodo_pago": "tarjeta",
+             "tipo_gasto": "transporte"},
+        ]
+        with mock.patch.object(
+            self.proveedor, "get_tasa", wraps=self.proveedor.get_tasa
+        ) as get_tasa, mock.patch.object(
+            self.repositorio, "agregar_gastos", wraps=self.repositorio.agregar_gastos
+        ) as agregar_gastos:
+            resultados = self.controller.registrar_gastos_lote(filas)
+        self.assertEqual(
+            [("error" in resultado) for resultado in resultados],
+            [False, True, True, True, False],
+        )
+        get_tasa.assert_called_once_with("usa")
+        agregar_gastos.assert_called_once()
+        viaje = ViajesRepository(self.repositorio.ruta).get_viajes()[0]
+        self.assertEqual([gasto.valor for gasto in viaje.gastos], [40_000, 10_000])
+
+    def test_linea_jsonl_invalida_y_csv_con_bom(self):
+        """Test para reportar como error de fila una linea JSON invalida, sin detener
+        la importacion, y leer un CSV que empieza con BOM"""
+        jsonl_ruta = self.escribir(
+            "gastos.jsonl",
+            '{"fecha": "2024-06-07", "valor": 10, "metodo_pago": "efectivo", '
+            '"tipo_gasto": "compras"}\n{"fecha": "2024-06-0\n'
+            '{"fecha": "2024-06-08", "valor": 5, "metodo_pago": "tarjeta", '
+            '"tipo_gasto": "compras"}\n',
+        )
+        csv_ruta = self.escribir(
+            "gastos.csv",
+            "\ufefffecha,valor,metodo_pago,tipo_gasto\n2024-06-09,1,efectivo,compras\n",
+        )
+        resultados = self.controller.registrar_gastos_lote(leer_filas(jsonl_ruta))
+        self.assertEqual(
+            [("error" in resultado) for resultado in resultados], [False, True, False]
+        )
+        self.assertIn("JSON", resultados[1]["error"])
+        resultados = self.controller.registrar_gastos_lote(leer_filas(csv_ruta))
+        self.assertEqual(resultados, [{"fila": 1, "resultado": "ok"}])
+        viaje = ViajesRepository(self.repositorio.ruta).get_viajes()[0]
+        self.assertEqual(len(viaje.gastos), 3)
+
+    def test_viaje_eliminado_durante_la_importacion(self):
+        """Test para reportar por fila los gastos cuyo viaje desaparece antes de
+        escribirlos"""
+
+        def filas():
+            yield {
+                "fecha": "2024-06-07",
+                "valor": "10",
+                "metodo_pago": "efectivo",
+                "tipo_gasto": "compras",
+            }
+            ViajesRepository(self.repositorio.ruta).guardar([])
+
+        resultados = self.controller.registrar_gastos_lote(filas())
+        self.assertEqual(len(resultados), 1)
+        self.assertIn("viaje", resultados[0]["error"])
+        self.assertEqual(ViajesRepository(self.repositorio.ruta).get_viajes(), [])
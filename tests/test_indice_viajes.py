@@ -0,0 +1,33 @@
+"IndiceViajes Unit Tests"
+
+from datetime import date
+from unittest import TestCase
+
+from models.viaje import Viaje
+from repositories.indice_viajes import IndiceViajes
+
+
+class TestIndiceViajes(TestCase):
+    """IndiceViajes tests suite"""
+
+    def setUp(self):
+        self.enero = Viaje("usa", date(2024, 1, 1), date(2024, 1, 31), 1.0)
+        self.marzo = Viaje("europa", date(2024, 3, 1), date(2024, 3, 5), 1.0)
+        self.indice = IndiceViajes([self.marzo, self.enero])
+
+    def test_hay_cruce(self):
+        """Test para la verificacion de cruces, incluyendo viajes contenidos"""
+        self.assertFalse(self.indice.hay_cruce(date(2024, 2, 1), date(2024, 2, 20)))
+        self.assertTrue(self.indice.hay_cruce(date(2024, 1, 10), date(2024, 1, 12)))
+        self.assertTrue(self.indice.hay_cruce(date(2024, 2, 1), date(2024, 3, 1)))
+        self.assertTrue(self.indice.hay_cruce(date(2023, 12, 1), date(2024, 4, 1)))
+
+    def test_buscar(self):
+        """Test para la busqueda del viaje que contiene una fecha"""
+        self.assertIs(self.indice.buscar(date(2024, 1, 31)), self.enero)
+        self.assertIsNone(self.indice.buscar(date(2024, 2, 1)))
+        febrero = Viaje("usa", date(2024, 2, 1), date(2024, 2, 3), 1.0)
+        self.indice.agregar(febrero)
+        self.assertIs(self.indice.buscar(date(2024, 2, 3)), febrero)
+        self.assertTrue(self.indice.hay_cruce(date(2024, 2, 3), date(2024, 2, 10)))
+        self.assertEqual(len(self.indice), 3)
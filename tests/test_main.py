@@ -0,0 +1,46 @@
+"Operaciones por lotes de main Unit Tests"
+
+import io
+import os
+import tempfile
+from contextlib import redirect_stdout
+from unittest import TestCase, mock
+
+import main
+from controllers.viajes_controller import ViajesController
+from repositories.viajes_repository import ViajesRepository
+from services.cache_reportes import CacheReportes
+from services.tasas_cambio import ProveedorTasasFijas
+
+
+class TestLote(TestCase):
+    """operaciones por lotes tests suite"""
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "viajes.json")
+        self.controller = ViajesController(
+            ViajesRepository(self.ruta), ProveedorTasasFijas({}), CacheReportes()
+        )
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def test_error_en_una_linea_conserva_las_anteriores(self):
+        """Test para reportar el error de una linea sin descartar la sesion"""
+        inexistente = os.path.join(self.directorio.name, "no", "existe", "r.txt")
+        lineas = [
+            "registrar-viaje colombia 2024-01-01 2024-01-03 100",
+            "registrar-gasto 2024-01-02 10 efectivo compras",
+            f"reporte 2024-01-02 {inexistente}",
+        ]
+        salida = io.StringIO()
+        with mock.patch.object(main, "controller", self.controller), redirect_stdout(
+            salida
+        ):
+            main.ejecutar_lote(lineas)
+        self.assertIn("  Linea 3: ", salida.getvalue())
+        self.assertIn("Operaciones con errores: 1", salida.getvalue())
+        viajes = ViajesRepository(self.ruta).get_viajes()
+        self.assertEqual(len(viajes), 1)
+        self.assertEqual(len(viajes[0].gastos), 1)
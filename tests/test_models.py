@@ -0,0 +1,67 @@
+"Gasto y Viaje Unit Tests"
+
+from datetime import date
+from unittest import TestCase
+
+from models.gasto import Gasto
+from models.gastos_columnares import GastosColumnares
+from models.resumen_gastos import ResumenGastos
+from models.viaje import Viaje
+
+
+class TestModels(TestCase):
+    """Gasto y Viaje tests suite"""
+
+    def crear_viaje(self):
+        """crea un viaje con dos gastos"""
+        viaje = Viaje("usa", date(2024, 6, 7), date(2024, 6, 9), 100.0)
+        viaje.agregar_gasto(Gasto(date(2024, 6, 7), 10.0, "efectivo", "transporte"))
+        viaje.agregar_gasto(Gasto(date(2024, 6, 8), 5.0, "tarjeta", "compras"))
+        return viaje
+
+    def test_modelos_sin_dict(self):
+        """Test para verificar que los modelos usan __slots__"""
+        viaje = self.crear_viaje()
+        self.assertFalse(hasattr(viaje, "__dict__"))
+        self.assertFalse(hasattr(viaje.gastos[0], "__dict__"))
+        with self.assertRaises(AttributeError):
+            viaje.gastos[0].otro = 1
+
+    def test_to_dict_from_dict(self):
+        """Test para verificar la conversion de ida y vuelta a dict"""
+        data = self.crear_viaje().to_dict()
+        self.assertEqual(Viaje.from_dict(data).to_dict(), data)
+        self.assertEqual(
+            data["gastos"][0],
+            {
+                "fecha": "2024-06-07",
+                "valor": 10.0,
+                "metodo_pago": "efectivo",
+                "tipo_gasto": "transporte",
+            },
+        )
+
+    def test_gastos_columnares(self):
+        """Test para el almacenamiento columnar de los gastos de un viaje"""
+        data = self.crear_viaje().to_dict()
+        viaje = Viaje.from_dict(data, columnar=True)
+        self.assertIsInstance(viaje.gastos, GastosColumnares)
+        self.assertEqual(viaje.to_dict(), data)
+        self.assertEqual(len(viaje.gastos), 2)
+        self.assertEqual(viaje.gastos[-1].tipo_gasto, "compras")
+        self.assertEqual(viaje.get_balance_dia(date(2024, 6, 7)), 90.0)
+        resumen = ResumenGastos.desde_gastos(viaje.gastos)
+        self.assertEqual(resumen.totales_dia(date(2024, 6, 8)), (0, 5.0, 5.0))
+        with self.assertRaises(ValueError):
+            viaje.agregar_gasto(Gasto(date(2024, 6, 7), 1.0, "nequi", "compras"))
+
+    def test_totales_dia_incrementales(self):
+        """Test para los totales por dia mantenidos al agregar gastos"""
+        viaje = self.crear_viaje()
+        self.assertEqual(viaje.get_balance_dia(date(2024, 6, 7)), 90.0)
+        viaje.agregar_gasto(Gasto(date(2024, 6, 7), 20.0, "tarjeta", "compras"))
+        self.assertEqual(viaje.get_balance_dia(date(2024, 6, 7)), 70.0)
+        self.assertEqual(viaje.get_balance_dia(date(2024, 6, 9)), 100.0)
+        self.assertEqual(viaje.resumen.totales_dia(date(2024, 6, 7)), (10.0, 20.0, 30.0))
+        cargado = Viaje.from_dict(viaje.to_dict())
+        self.assertEqual(cargado.resumen.to_dict(), viaje.resumen.to_dict())
@@ -0,0 +1,54 @@
+"Mediciones de rendimiento Unit Tests"
+
+import os
+import tempfile
+from unittest import TestCase
+
+from benchmarks import datos, rendimiento
+from repositories.viajes_repository import ViajesRepository
+
+
+class TestRendimiento(TestCase):
+    """mediciones de rendimiento tests suite"""
+
+    def test_datos_deterministas_y_sin_cruces(self):
+        """Test para verificar que la misma semilla genera los mismos viajes, sin
+        cruces y con fechas independientes de la cantidad de gastos"""
+        viajes = list(datos.generar_viajes(20, 5, semilla=3))
+        self.assertEqual(
+            [viaje.to_dict() for viaje in viajes],
+            [viaje.to_dict() for viaje in datos.generar_viajes(20, 5, semilla=3)],
+        )
+        for anterior, siguiente in zip(viajes, viajes[1:]):
+            self.assertLess(anterior.fecha_fin, siguiente.fecha_inicio)
+        for viaje in viajes:
+            self.assertEqual(len(viaje.gastos), 5)
+            for gasto in viaje.gastos:
+                self.assertTrue(viaje.fecha_inicio <= gasto.fecha <= viaje.fecha_fin)
+        self.assertEqual(
+            datos.fechas_viajes(20, semilla=3),
+            [(viaje.fecha_inicio, viaje.fecha_fin) for viaje in viajes],
+        )
+
+    def test_ejecutar_y_comparar(self):
+        """Test para ejecutar las mediciones del tamaño menor y comparar resultados"""
+        with tempfile.TemporaryDirectory() as directorio:
+            resultado = rendimiento.ejecutar(["xs"], 3, directorio)
+            viajes = ViajesRepository(os.path.join(directorio, "xs", "viajes.json"))
+            cantidad = sum(viaje.resumen.cantidad for viaje in viajes.get_viajes())
+        xs = resultado["tamanos"]["xs"]
+        self.assertEqual((xs["viajes"], xs["gastos"]), (10, 500))
+        self.assertEqual(cantidad, 500 + rendimiento.GASTOS_REGISTRADOS)
+        self.assertEqual(
+            list(xs["mediciones"]),
+            [
+                "get_viajes_frio",
+                "get_viajes_caliente",
+                "validar_fechas",
+                "get_balance_dia",
+                "generar_reportes",
+                "registrar_gasto",
+            ],
+        )
+        razones = rendimiento.comparar(resultado, resultado)
+        self.assertEqual(set(razones["xs"].values()), {1.0})
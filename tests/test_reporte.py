@@ -0,0 +1,115 @@
+"Reporte Unit Tests"
+
+import io
+import os
+import tempfile
+from datetime import date
+from unittest import TestCase
+
+from controllers.viajes_controller import ViajesController
+from models.gasto import Gasto
+from models.reporte import Reporte
+from models.resumen_gastos import ResumenGastos
+from models.viaje import Viaje
+from repositories.viajes_repository import ViajesRepository
+from services.cache_reportes import CacheReportes
+
+
+class TestReporte(TestCase):
+    """Reporte tests suite"""
+
+    def setUp(self):
+        self.viaje = Viaje("colombia", date(2024, 6, 7), date(2024, 6, 9), 100.0)
+        for gasto in [
+            Gasto(date(2024, 6, 7), 10.0, "efectivo", "transporte"),
+            Gasto(date(2024, 6, 7), 5.0, "tarjeta", "compras"),
+            Gasto(date(2024, 6, 9), 2.5, "tarjeta", "transporte"),
+        ]:
+            self.viaje.agregar_gasto(gasto)
+
+    def test_resumen_gastos(self):
+        """Test para los totales agregados en una sola pasada"""
+        resumen = ResumenGastos.desde_gastos(self.viaje.gastos)
+        self.assertEqual(resumen.total, 17.5)
+        self.assertEqual(resumen.cantidad, 3)
+        self.assertEqual(resumen.totales_dia(date(2024, 6, 7)), (10.0, 5.0, 15.0))
+        self.assertEqual(resumen.totales_dia(date(2024, 6, 8)), (0, 0, 0))
+        self.assertEqual(resumen.totales_tipo("transporte"), (10.0, 2.5, 12.5))
+        self.assertEqual(resumen.totales_tipo("compras"), (0, 5.0, 5.0))
+
+    def test_reporte_dias(self):
+        """Test para el metodo reporte_dias"""
+        contenido = Reporte.reporte_dias(self.viaje)
+        self.assertIn(
+            "  Gastos 2024-06-07:\n    Efectivo: 10.0\n    Tarjeta : 5.0\n"
+            "    Total   : 15.0\n\n",
+            contenido,
+        )
+        self.assertIn(
+            "  Gastos 2024-06-08:\n    Efectivo: 0\n    Tarjeta : 0\n    Total   : 0\n",
+            contenido,
+        )
+
+    def test_reporte_tipos(self):
+        """Test para el metodo reporte_tipos"""
+        contenido = Reporte.reporte_tipos(self.viaje)
+        self.assertIn(
+            "  Gastos en transporte:\n    Efectivo: 10.0\n    Tarjeta : 2.5\n"
+            "    Total   : 12.5\n\n",
+            contenido,
+        )
+        self.assertEqual(contenido.count("  Gastos en "), len(Gasto.tipos_gasto))
+
+    def test_escribir_reporte_en_flujo_y_archivo(self):
+        """Test para el metodo escribir_reporte con un flujo y con escritura atomica"""
+        flujo = io.StringIO()
+        Reporte.escribir_reporte(self.viaje, flujo)
+        self.assertTrue(flujo.getvalue().endswith("Gastos totales del viaje : 17.5\n"))
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "reporte.txt")
+            Reporte.escribir_reporte(self.viaje, ruta, atomico=True)
+            self.assertEqual(os.listdir(directorio), ["reporte.txt"])
+            with open(ruta, "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), flujo.getvalue())
+
+    def test_generar_reportes_todos(self):
+        """Test para la generacion en paralelo de los reportes de todos los viajes"""
+        with tempfile.TemporaryDirectory() as directorio:
+            repositorio = ViajesRepository(os.path.join(directorio, "viajes.json"))
+            otro = Viaje("usa", date(2024, 7, 1), date(2024, 7, 2), 10.0)
+            repositorio.guardar([self.viaje, otro])
+            controller = ViajesController(repositorio)
+            salida = os.path.join(directorio, "reportes")
+            controller.generar_reportes_todos(directorio=salida, procesos=2)
+            with open(os.path.join(salida, "indice.txt"), "r", encoding="utf-8") as f:
+                indice = f.read().splitlines()
+            self.assertEqual(len(indice), 2)
+            ruta = os.path.join(salida, "reporte_2024-06-07_2024-06-09_colombia.txt")
+            with open(ruta, "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "".join(Reporte.lineas_reporte(self.viaje)))
+            with open(os.path.join(salida, "totales.txt"), "r", encoding="utf-8") as f:
+                totales = f.read()
+            self.assertIn("  colombia: 17.5\n  usa: 0", totales)
+            self.assertTrue(totales.endswith("Gastos totales de los viajes : 17.5\n"))
+
+    def test_cache_reportes(self):
+        """Test para reutilizar el reporte de un viaje que no cambio"""
+        with tempfile.TemporaryDirectory() as directorio:
+            cache = CacheReportes(capacidad=1, directorio=os.path.join(directorio, "c"))
+            ruta = os.path.join(directorio, "reporte.txt")
+            version = self.viaje.version
+            cache.escribir(self.viaje, ruta)
+            modificado = os.stat(ruta).st_mtime_ns
+            self.assertIs(cache.obtener(self.viaje), cache.obtener(self.viaje))
+            cache.escribir(self.viaje, ruta)
+            self.assertEqual(os.stat(ruta).st_mtime_ns, modificado)
+            self.viaje.agregar_gasto(Gasto(date(2024, 6, 8), 1.0, "efectivo", "compras"))
+            self.assertNotEqual(self.viaje.version, version)
+            cache.escribir(self.viaje, ruta)
+            with open(ruta, "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "".join(Reporte.lineas_reporte(self.viaje)))
+            copia = Viaje.from_dict(self.viaje.to_dict())
+            self.assertEqual(copia.version, self.viaje.version)
+            otra = CacheReportes(directorio=os.path.join(directorio, "c"))
+            self.assertEqual(otra.obtener(copia), cache.obtener(self.viaje))
+            self.assertEqual(len(os.listdir(os.path.join(directorio, "c"))), 2)
@@ -0,0 +1,148 @@
+"Servidor HTTP Unit Tests"
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+from unittest import IsolatedAsyncioTestCase, mock
+
+from controllers.viajes_controller import ViajesController
+from repositories.viajes_repository import ViajesRepository
+from services.cache_reportes import CacheReportes
+from services.servidor_http import ServidorViajes
+from services.tasas_cambio import ProveedorTasasFijas
+
+
+class TestServidorHttp(IsolatedAsyncioTestCase):
+    """servidor HTTP tests suite"""
+
+    async def asyncSetUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.controller = ViajesController(
+            ViajesRepository(os.path.join(self.directorio.name, "viajes.json")),
+            ProveedorTasasFijas({"usa": 4000}),
+            CacheReportes(),
+        )
+        self.servidor = ServidorViajes(self.controller, hilos=4)
+        self.servidor_tcp = await self.servidor.iniciar("127.0.0.1", 0)
+        self.puerto = self.servidor_tcp.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.servidor_tcp.close()
+        await self.servidor_tcp.wait_closed()
+        self.servidor.cerrar()
+        self.directorio.cleanup()
+
+    async def solicitar(self, metodo: str, ruta: str, datos=None):
+        """envia una solicitud al servidor y retorna el estado y el cuerpo"""
+        lector, escritor = await asyncio.open_connection("127.0.0.1", self.puerto)
+        cuerpo = b"" if datos is None else json.dumps(datos).encode("utf-8")
+        escritor.write(
+            f"{metodo} {ruta} HTTP/1.1\r\nHost: prueba\r\nConnection: close\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n\r\n".encode("latin-1")
+            + cuerpo
+        )
+        respuesta = await lector.read()
+        escritor.close()
+        encabezados, _, contenido = respuesta.partition(b"\r\n\r\n")
+        return int(encabezados.split()[1]), contenido.decode("utf-8")
+
+    async def test_registrar_y_consultar(self):
+        """Test para registrar un viaje y gastos concurrentes y consultar el reporte"""
+        estado, _ = await self.solicitar(
+            "POST",
+            "/viajes",
+            {
+                "destino": "usa",
+                "fecha_inicio": "2024-06-07",
+                "fecha_fin": "2024-06-10",
+                "presupuesto_diario": 100,
+            },
+        )
+        self.assertEqual(estado, 201)
+        gasto = {"fecha": "2024-06-08", "valor": 1, "metodo_pago": "efectivo"}
+        respuestas = await asyncio.gather(
+            *(
+                self.solicitar("POST", "/gastos", {**gasto, "tipo_gasto": "compras"})
+                for _ in range(10)
+            )
+        )
+        self.assertEqual([estado for estado, _ in respuestas], [201] * 10)
+        estado, contenido = await self.solicitar("GET", "/viajes")
+        self.assertEqual(estado, 200)
+        self.assertEqual(json.loads(contenido)[0]["gastos_totales"], 40000.0)
+        estado, contenido = await self.solicitar("GET", "/reportes?fecha=2024-06-09")
+        self.assertEqual(estado, 200)
+        self.assertIn("Gastos totales del viaje : 40000.0", contenido)
+
+    async def test_solicitudes_invalidas(self):
+        """Test para verificar las respuestas de error del servidor"""
+        estado, _ = await self.solicitar("GET", "/reportes?fecha=2024-06-09")
+        self.assertEqual(estado, 404)
+        estado, _ = await self.solicitar("GET", "/reportes")
+        self.assertEqual(estado, 400)
+        estado, contenido = await self.solicitar("POST", "/gastos", {"fecha": "x"})
+        self.assertEqual(estado, 400)
+        self.assertIn("valor", json.loads(contenido)["error"])
+        estado, _ = await self.solicitar(
+            "POST",
+            "/gastos",
+            {
+                "fecha": "2024-06-08",
+                "valor": 1,
+                "metodo_pago": "efectivo",
+                "tipo_gasto": "compras",
+            },
+        )
+        self.assertEqual(estado, 400)
+        estado, _ = await self.solicitar("DELETE", "/viajes")
+        self.assertEqual(estado, 405)
+        estado, _ = await self.solicitar("GET", "/otra")
+        self.assertEqual(estado, 404)
+
+    async def test_conexion_persistente(self):
+        """Test para atender varias solicitudes en la misma conexion"""
+        lector, escritor = await asyncio.open_connection("127.0.0.1", self.puerto)
+        for _ in range(2):
+            escritor.write(b"GET /viajes HTTP/1.1\r\nHost: prueba\r\n\r\n")
+            encabezados = await lector.readuntil(b"\r\n\r\n")
+            self.assertTrue(encabezados.startswith(b"HTTP/1.1 200 OK"))
+            self.assertEqual(await lector.readexactly(2), b"[]")
+        escritor.close()
+
+    async def test_error_inesperado(self):
+        """Test para responder 500 ante un error inesperado del controlador"""
+        with mock.patch.object(
+            self.controller, "get_viajes", side_effect=RuntimeError("falla")
+        ), self.assertLogs(level="ERROR"):
+            estado, contenido = await self.solicitar("GET", "/viajes")
+        self.assertEqual(estado, 500)
+        self.assertEqual(json.loads(contenido), {"error": "error interno del servidor"})
+        estado, _ = await self.solicitar("GET", "/viajes")
+        self.assertEqual(estado, 200)
+
+    async def test_escrituras_en_pool_del_servidor(self):
+        """Test para ejecutar los registros en el pool de hilos del servidor"""
+        hilos = []
+        agregar = self.controller.repositorio.agregar_viaje
+
+        def registrar(viaje):
+            hilos.append(threading.current_thread().name)
+            return agregar(viaje)
+
+        with mock.patch.object(
+            self.controller.repositorio, "agregar_viaje", side_effect=registrar
+        ):
+            estado, _ = await self.solicitar(
+                "POST",
+                "/viajes",
+                {
+                    "destino": "usa",
+                    "fecha_inicio": "2024-06-07",
+                    "fecha_fin": "2024-06-10",
+                    "presupuesto_diario": 100,
+                },
+            )
+        self.assertEqual(estado, 201)
+        self.assertTrue(hilos[0].startswith("servidor-viajes"))
@@ -0,0 +1,164 @@
+"Tasas de cambio Unit Tests"
+
+import asyncio
+import importlib.util
+import os
+import tempfile
+import threading
+from unittest import IsolatedAsyncioTestCase, TestCase, mock, skipIf
+
+from controllers.viajes_controller import ViajesController
+from repositories.viajes_repository import ViajesRepository
+from services.tasas_cambio import (
+    ProveedorTasas,
+    ProveedorTasasFijas,
+    ProveedorTasasRemoto,
+    TasasCache,
+)
+
+
+class ProveedorContador(ProveedorTasas):
+    """proveedor de prueba que cuenta las consultas y puede simular fallos"""
+
+    def __init__(self) -> None:
+        self.consultas = 0
+        self.falla = False
+
+    def get_tasa(self, lugar: str) -> float:
+        self.consultas += 1
+        if self.falla:
+            raise ValueError("La solicitud para obtener la tasa de cambio ha expirado")
+        return 4000.0 + self.consultas
+
+
+class TestTasasCambio(TestCase):
+    """tasas de cambio tests suite"""
+
+    def test_cache_reutiliza_tasa_vigente(self):
+        """Test para verificar que la tasa vigente no se vuelve a consultar"""
+        ahora = [0.0]
+        proveedor = ProveedorContador()
+        cache = TasasCache(proveedor, ttl=60, reloj=lambda: ahora[0])
+        self.assertEqual(cache.get_tasa("usa"), 4001.0)
+        ahora[0] = 59
+        self.assertEqual(cache.get_tasa("usa"), 4001.0)
+        ahora[0] = 60
+        self.assertEqual(cache.get_tasa("usa"), 4002.0)
+        self.assertEqual(proveedor.consultas, 2)
+
+    def test_cache_usa_tasa_vencida_si_falla_el_proveedor(self):
+        """Test para verificar el uso de una tasa vencida cuando el proveedor falla"""
+        ahora = [0.0]
+        proveedor = ProveedorContador()
+        cache = TasasCache(proveedor, ttl=60, reloj=lambda: ahora[0])
+        cache.get_tasa("usa")
+        proveedor.falla = True
+        ahora[0] = 120
+        self.assertEqual(cache.get_tasa("usa"), 4001.0)
+        with self.assertRaises(ValueError):
+            cache.get_tasa("europa")
+
+    def test_cache_en_disco(self):
+        """Test para verificar que la cache en disco sobrevive entre instancias"""
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "tasas_cache.json")
+            TasasCache(ProveedorContador(), ruta_cache=ruta).get_tasa("usa")
+            proveedor = ProveedorContador()
+            self.assertEqual(
+                TasasCache(proveedor, ruta_cache=ruta).get_tasa("usa"), 4001.0
+            )
+            self.assertEqual(proveedor.consultas, 0)
+
+    def test_interfaz_abstracta(self):
+        """Test para verificar que ProveedorTasas no se puede instanciar"""
+        with self.assertRaises(TypeError):
+            ProveedorTasas()
+
+    def test_convertir_moneda_con_proveedor_local(self):
+        """Test para el metodo convertir_moneda con tasas fijas"""
+        controller = ViajesController(
+            proveedor_tasas=ProveedorTasasFijas({"usa": 4000, "europa": 4200})
+        )
+        self.assertEqual(controller.convertir_moneda("colombia", 10), 10)
+        self.assertEqual(controller.convertir_moneda("usa", 10), 40_000)
+        self.assertEqual(controller.convertir_moneda("europa", 10), 42_000)
+        with self.assertRaises(ValueError):
+            controller.convertir_moneda("usa", -1)
+
+
+class ProveedorLento(ProveedorTasas):
+    """proveedor de prueba que solo responde cuando dos consultas estan en curso a
+    la vez, y cuenta las consultas por lugar"""
+
+    def __init__(self) -> None:
+        self.consultas = {}
+        self.barrera = threading.Barrier(2, timeout=5)
+
+    def get_tasa(self, lugar: str) -> float:
+        self.consultas[lugar] = self.consultas.get(lugar, 0) + 1
+        self.barrera.wait()
+        return {"usa": 4000.0, "europa": 4200.0}[lugar]
+
+
+class TestTasasCambioAsync(IsolatedAsyncioTestCase):
+    """variantes asincronas del controlador tests suite"""
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.proveedor = ProveedorLento()
+        self.controller = ViajesController(
+            ViajesRepository(os.path.join(self.directorio.name, "viajes.json")),
+            self.proveedor,
+        )
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    async def test_registrar_viajes_con_consultas_concurrentes(self):
+        """Test para verificar que las consultas de tasas de varios registros se
+        solapan y que las del mismo destino se unen en una sola"""
+        mensajes = await asyncio.gather(
+            self.controller.registrar_viaje_async("usa", "2024-06-01", "2024-06-05", 1),
+            self.controller.registrar_viaje_async("usa", "2024-07-01", "2024-07-05", 2),
+            self.controller.registrar_viaje_async(
+                "europa", "2024-08-01", "2024-08-05", 1
+            ),
+        )
+        self.assertTrue(all(mensajes))
+        self.assertEqual(self.proveedor.consultas, {"usa": 1, "europa": 1})
+        presupuestos = [v.presupuesto_diario for v in self.controller.get_viajes()]
+        self.assertEqual(sorted(presupuestos), [4000.0, 4200.0, 8000.0])
+
+    async def test_registrar_gasto_async(self):
+        """Test para el metodo registrar_gasto_async"""
+        self.controller.proveedor_tasas = ProveedorTasasFijas({"usa": 4000})
+        await self.controller.registrar_viaje_async(
+            "usa", "2024-06-01", "2024-06-05", 1
+        )
+        mensaje = await self.controller.registrar_gasto_async(
+            "2024-06-02", 0.5, "efectivo", "compras"
+        )
+        self.assertIn("Balance dia: 2000.0", mensaje)
+        self.assertEqual(
+            await self.controller.registrar_gasto_async(
+                "2024-09-02", 0.5, "efectivo", "compras"
+            ),
+            "",
+        )
+
+
+@skipIf(importlib.util.find_spec("requests") is None, "requests no instalado")
+class TestProveedorTasasRemoto(TestCase):
+    """ProveedorTasasRemoto tests suite"""
+
+    def test_respuesta_inesperada(self):
+        """Test para convertir las respuestas inesperadas de la API en ValueError"""
+        proveedor = ProveedorTasasRemoto()
+        for respuesta in ([], [{}], {"random": 1}, None, [{"random": "x"}]):
+            with mock.patch.object(ProveedorTasasRemoto, "sesion") as sesion:
+                sesion.get.return_value.json.return_value = respuesta
+                with self.assertRaises(ValueError):
+                    proveedor.get_tasa("usa")
+        with mock.patch.object(ProveedorTasasRemoto, "sesion") as sesion:
+            sesion.get.return_value.json.return_value = [{"random": 4000}]
+            self.assertEqual(proveedor.get_tasa("europa"), 4200)
@@ -126,3 +126,16 @@ class TestViajesController(TestCase):
                 "gastos": [],
             },
         )
+
+    def test_validar_fechas_contiene_viaje(self):
+        """Test para el metodo validar_fechas cuando el nuevo viaje contiene a otro"""
+        self.cleanup()
+        controller = ViajesController()
+        controller.registrar_viaje("colombia", "2024-06-07", "2024-06-08", 200_000)
+        with self.assertRaises(ViajeException):
+            controller.validar_fechas("2024-06-01", "2024-06-30")
+
+    def test_cache_reportes_en_memoria_por_defecto(self):
+        """Test para verificar que la cache de reportes no escribe en disco por defecto"""
+        controller = ViajesController()
+        self.assertIsNone(controller.cache_reportes.directorio)
@@ -0,0 +1,291 @@
+"ViajesRepository Unit Tests"
+
+import json
+import multiprocessing
+import os
+import tempfile
+from datetime import date
+from unittest import TestCase, mock, skipIf
+
+from exceptions.concurrencia_exception import ConcurrenciaException
+
+from models.gasto import Gasto
+from models.reporte import Reporte
+from models.viaje import Viaje
+from repositories import archivo_viajes, bloqueo_archivo
+from repositories.viajes_repository import ViajesRepository
+
+
+class TestViajesRepository(TestCase):
+    """ViajesRepository tests suite"""
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "viajes.json")
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def crear_viaje(self, inicio: str, fin: str):
+        """crea un viaje a colombia entre las fechas dadas"""
+        return Viaje(
+            "colombia", date.fromisoformat(inicio), date.fromisoformat(fin), 100.0
+        )
+
+    def test_get_viajes_sin_cambios_no_relee(self):
+        """Test para verificar que la cache evita releer el archivo"""
+        repositorio = ViajesRepository(self.ruta)
+        repositorio.agregar_viaje(self.crear_viaje("2024-06-07", "2024-06-08"))
+        with mock.patch("repositories.archivo_viajes.iter_viajes") as iter_viajes:
+            self.assertEqual(len(repositorio.get_viajes()), 1)
+            self.assertEqual(len(repositorio.get_viajes()), 1)
+            iter_viajes.assert_not_called()
+
+    def test_get_viajes_recarga_si_cambia_el_archivo(self):
+        """Test para verificar que la cache se invalida con cambios externos"""
+        repositorio = ViajesRepository(self.ruta)
+        repositorio.agregar_viaje(self.crear_viaje("2024-06-07", "2024-06-08"))
+        otro = ViajesRepository(self.ruta)
+        otro.agregar_viaje(self.crear_viaje("2024-07-01", "2024-07-05"))
+        self.assertEqual(len(repositorio.get_viajes()), 2)
+        os.remove(self.ruta)
+        self.assertEqual(repositorio.get_viajes(), [])
+
+    def test_guardar_actualiza_cache(self):
+        """Test para verificar que guardar actualiza el estado en memoria"""
+        repositorio = ViajesRepository(self.ruta)
+        viaje = self.crear_viaje("2024-06-07", "2024-06-08")
+        repositorio.guardar([viaje])
+        self.assertIs(repositorio.get_viajes()[0], viaje)
+        self.assertTrue(repositorio.hay_cruce(date(2024, 6, 1), date(2024, 6, 30)))
+        with open(self.ruta, "r", encoding="utf-8") as f:
+            guardados = json.load(f)
+        self.assertEqual(guardados[0].pop("longitud_gastos"), 2)
+        self.assertEqual(
+            guardados, [{**viaje.to_dict(), "agregados": viaje.agregados()}]
+        )
+
+    def test_agregar_gasto_usa_journal(self):
+        """Test para verificar que los gastos se agregan a la bitacora sin reescribir viajes.json"""
+        repositorio = ViajesRepository(self.ruta)
+        viaje = self.crear_viaje("2024-06-07", "2024-06-08")
+        repositorio.agregar_viaje(viaje)
+        firma = os.stat(self.ruta).st_mtime_ns
+        gasto = Gasto(date(2024, 6, 7), 50.0, "efectivo", "transporte")
+        repositorio.agregar_gasto(viaje, gasto)
+        self.assertEqual(os.stat(self.ruta).st_mtime_ns, firma)
+        viajes = ViajesRepository(self.ruta).get_viajes()
+        self.assertEqual(viajes[0].to_dict(), viaje.to_dict())
+
+    def test_journal_ignora_linea_incompleta(self):
+        """Test para verificar que una escritura interrumpida no corrompe la carga"""
+        repositorio = ViajesRepository(self.ruta)
+        viaje = self.crear_viaje("2024-06-07", "2024-06-08")
+        repositorio.agregar_viaje(viaje)
+        repositorio.agregar_gasto(
+            viaje, Gasto(date(2024, 6, 7), 50.0, "efectivo", "transporte")
+        )
+        with open(repositorio.ruta_journal, "a", encoding="utf-8") as f:
+            f.write('{"viaje": "2024-06-07", "gas')
+        otro = ViajesRepository(self.ruta)
+        self.assertEqual(len(otro.get_viajes()[0].gastos), 1)
+        otro.agregar_gasto(
+            otro.get_viajes()[0], Gasto(date(2024, 6, 8), 5.0, "tarjeta", "compras")
+        )
+        self.assertEqual(len(ViajesRepository(self.ruta).get_viajes()[0].gastos), 2)
+
+    def test_journal_se_compacta_al_exceder_umbral(self):
+        """Test para verificar la compactacion de la bitacora"""
+        repositorio = ViajesRepository(self.ruta, max_registros_journal=3)
+        viaje = self.crear_viaje("2024-06-07", "2024-06-08")
+        repositorio.agregar_viaje(viaje)
+        for _ in range(3):
+            repositorio.agregar_gasto(
+                viaje, Gasto(date(2024, 6, 7), 1.0, "efectivo", "compras")
+            )
+        self.assertFalse(os.path.exists(repositorio.ruta_journal))
+        with open(self.ruta, "r", encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)[0]["gastos"]), 3)
+
+    def test_journal_de_otra_version_se_ignora(self):
+        """Test para verificar que la bitacora no se aplica sobre otro viajes.json"""
+        repositorio = ViajesRepository(self.ruta)
+        repositorio.agregar_viaje(self.crear_viaje("2024-06-07", "2024-06-08"))
+        repositorio.agregar_viaje(self.crear_viaje("2024-07-01", "2024-07-05"))
+        os.remove(self.ruta)
+        self.assertEqual(ViajesRepository(self.ruta).get_viajes(), [])
+
+    def test_gastos_se_cargan_al_primer_acceso(self):
+        """Test para verificar la carga perezosa de los gastos de cada viaje"""
+        repositorio = ViajesRepository(self.ruta)
+        viajes = [
+            self.crear_viaje("2024-06-07", "2024-06-08"),
+            self.crear_viaje("2024-07-01", "2024-07-05"),
+        ]
+        viajes[1].agregar_gasto(Gasto(date(2024, 7, 2), 3.0, "tarjeta", "compras"))
+        repositorio.guardar(viajes)
+        cargados = ViajesRepository(self.ruta).get_viajes()
+        self.assertFalse(any(viaje.gastos_cargados for viaje in cargados))
+        self.assertEqual(cargados[1].to_dict(), viajes[1].to_dict())
+        self.assertFalse(cargados[1].gastos_cargados)
+        self.assertEqual(cargados[1].get_balance_dia(date(2024, 7, 2)), 97.0)
+        self.assertFalse(cargados[1].gastos_cargados)
+        self.assertEqual(len(cargados[1].gastos), 1)
+        self.assertTrue(cargados[1].gastos_cargados)
+        self.assertFalse(cargados[0].gastos_cargados)
+
+    def test_compactar_mantiene_gastos_pendientes(self):
+        """Test para verificar que reescribir viajes.json no pierde los gastos sin cargar"""
+        viaje = self.crear_viaje("2024-06-07", "2024-06-08")
+        viaje.agregar_gasto(Gasto(date(2024, 6, 7), 3.0, "tarjeta", "compras"))
+        ViajesRepository(self.ruta).guardar([viaje])
+        repositorio = ViajesRepository(self.ruta)
+        repositorio.agregar_viaje(self.crear_viaje("2024-07-01", "2024-07-05"))
+        repositorio.compactar()
+        pendiente = repositorio.get_viajes()[0]
+        self.assertFalse(pendiente.gastos_cargados)
+        self.assertEqual(pendiente.to_dict(), viaje.to_dict())
+        self.assertEqual(len(pendiente.gastos), 1)
+
+    def test_agregados_persistidos(self):
+        """Test para registrar gastos y consultar totales sin cargar los gastos"""
+        viaje = self.crear_viaje("2024-06-07", "2024-06-08")
+        viaje.agregar_gasto(Gasto(date(2024, 6, 7), 3.0, "tarjeta", "compras"))
+        ViajesRepository(self.ruta).guardar([viaje])
+        repositorio = ViajesRepository(self.ruta)
+        cargado = repositorio.get_viaje(date(2024, 6, 7))
+        repositorio.agregar_gasto(
+            cargado, Gasto(date(2024, 6, 7), 1.5, "efectivo", "transporte")
+        )
+        viaje.agregar_gasto(Gasto(date(2024, 6, 7), 1.5, "efectivo", "transporte"))
+        otro = ViajesRepository(self.ruta).get_viaje(date(2024, 6, 7))
+        for actual in (cargado, otro):
+            self.assertEqual(
+                "".join(Reporte.lineas_reporte(actual)),
+                "".join(Reporte.lineas_reporte(viaje)),
+            )
+            self.assertEqual(actual.version, viaje.version)
+            self.assertFalse(actual.gastos_cargados)
+        self.assertEqual(otro.to_dict(), viaje.to_dict())
+        self.assertEqual(otro.resumen.to_dict(), viaje.resumen.to_dict())
+
+    def test_sesion_escribe_una_vez(self):
+        """Test para verificar que una sesion escribe los cambios juntos al cerrarla"""
+        repositorio = ViajesRepository(self.ruta)
+        repositorio.agregar_viaje(self.crear_viaje("2024-06-07", "2024-06-08"))
+        with repositorio.sesion():
+            repositorio.agregar_viaje(self.crear_viaje("2024-07-01", "2024-07-05"))
+            viaje = repositorio.get_viaje(date(2024, 7, 2))
+            for _ in range(3):
+                repositorio.agregar_gasto(
+                    viaje, Gasto(date(2024, 7, 2), 1.0, "efectivo", "compras")
+                )
+            self.assertFalse(os.path.exists(repositorio.ruta_journal))
+            self.assertEqual(len(ViajesRepository(self.ruta).get_viajes()), 1)
+        with open(repositorio.ruta_journal, "rb") as f:
+            self.assertEqual(len(f.readlines()), 5)
+        otro = ViajesRepository(self.ruta)
+        self.assertEqual(otro.get_viaje(date(2024, 7, 2)).resumen.total, 3.0)
+
+    def test_sesion_con_excepcion_no_escribe(self):
+        """Test para verificar que una sesion interrumpida descarta sus cambios"""
+        repositorio = ViajesRepository(self.ruta)
+        repositorio.agregar_viaje(self.crear_viaje("2024-06-07", "2024-06-08"))
+        with self.assertRaises(RuntimeError):
+            with repositorio.sesion():
+                repositorio.agregar_viaje(self.crear_viaje("2024-07-01", "2024-07-05"))
+                raise RuntimeError("interrumpida")
+        self.assertEqual(len(repositorio.get_viajes()), 1)
+
+    def test_escritura_con_version_anterior(self):
+        """Test para verificar que no se escribe sobre viajes leidos antes de que otro
+        proceso modificara los archivos"""
+        repositorio = ViajesRepository(self.ruta)
+        repositorio.agregar_viaje(self.crear_viaje("2024-06-07", "2024-06-08"))
+        viaje = repositorio.get_viaje(date(2024, 6, 7))
+        otro = ViajesRepository(self.ruta)
+        otro.agregar_gasto(
+            otro.get_viaje(date(2024, 6, 7)),
+            Gasto(date(2024, 6, 7), 2.0, "efectivo", "compras"),
+        )
+        with self.assertRaises(ConcurrenciaException):
+            repositorio.agregar_gasto(
+                viaje, Gasto(date(2024, 6, 7), 1.0, "efectivo", "compras")
+            )
+        with self.assertRaises(ConcurrenciaException):
+            repositorio.agregar_gasto(
+                viaje, Gasto(date(2024, 6, 7), 1.0, "efectivo", "compras")
+            )
+        repositorio.agregar_gasto(
+            repositorio.get_viaje(date(2024, 6, 7)),
+            Gasto(date(2024, 6, 7), 1.0, "efectivo", "compras"),
+        )
+        actual = ViajesRepository(self.ruta).get_viaje(date(2024, 6, 7))
+        self.assertEqual(actual.resumen.total, 3.0)
+
+    def test_archivo_invalido_no_se_sobrescribe(self):
+        """Test para verificar que un viajes.json invalido no se reemplaza por una
+        lista vacia"""
+        with open(self.ruta, "w", encoding="utf-8") as f:
+            f.write('[{"destino": "colom')
+        repositorio = ViajesRepository(self.ruta)
+        self.assertEqual(repositorio.get_viajes(), [])
+        with self.assertRaises(ValueError):
+            repositorio.agregar_viaje(self.crear_viaje("2024-06-07", "2024-06-08"))
+        with self.assertRaises(ValueError):
+            repositorio.compactar()
+        with open(self.ruta, encoding="utf-8") as f:
+            self.assertEqual(f.read(), '[{"destino": "colom')
+
+    @skipIf(bloqueo_archivo.fcntl is None, "fcntl no disponible")
+    def test_escrituras_concurrentes_entre_procesos(self):
+        """Test para registrar gastos desde varios procesos sin perder ninguno"""
+        ViajesRepository(self.ruta).guardar([self.crear_viaje("2024-06-07", "2024-06-08")])
+        contexto = multiprocessing.get_context("fork")
+        procesos = [
+            contexto.Process(target=registrar_gastos, args=(self.ruta, 20))
+            for _ in range(4)
+        ]
+        for proceso in procesos:
+            proceso.start()
+        for proceso in procesos:
+            proceso.join()
+            self.assertEqual(proceso.exitcode, 0)
+        viaje = ViajesRepository(self.ruta).get_viaje(date(2024, 6, 7))
+        self.assertEqual(len(viaje.gastos), 80)
+
+    def test_leer_solo_encabezados(self):
+        """Test para leer los viajes sin decodificar sus gastos, y los viajes escritos
+        sin la longitud de sus gastos decodificandolos completos"""
+        viaje = self.crear_viaje("2024-06-07", "2024-06-08")
+        viaje.agregar_gasto(Gasto(date(2024, 6, 7), 10.0, "efectivo", "compras"))
+        otro = self.crear_viaje("2024-07-01", "2024-07-02")
+        ViajesRepository(self.ruta).guardar([viaje, otro])
+        with open(self.ruta, "r", encoding="utf-8") as f:
+            contenido = f.read()
+        with open(self.ruta, "w", encoding="utf-8") as f:
+            f.write(contenido.replace('    "longitud_gastos": 2,\n', ""))
+        for tamano_bloque in (3, 7, 16, 1 << 20):
+            leidos = list(archivo_viajes.iter_viajes(self.ruta, tamano_bloque))
+            self.assertNotIn("gastos", leidos[0][0])
+            self.assertEqual(leidos[0][0]["presupuesto_diario"], 100.0)
+            self.assertEqual(leidos[1][0]["gastos"], [])
+        cargados = ViajesRepository(self.ruta).get_viajes()
+        self.assertEqual(
+            [v.to_dict() for v in cargados], [viaje.to_dict(), otro.to_dict()]
+        )
+
+
+def registrar_gastos(ruta: str, cantidad: int):
+    """registra la cantidad de gastos dada, repitiendo ante conflictos de version"""
+    repositorio = ViajesRepository(ruta)
+    for _ in range(cantidad):
+        while True:
+            try:
+                repositorio.agregar_gasto(
+                    repositorio.get_viaje(date(2024, 6, 7)),
+                    Gasto(date(2024, 6, 7), 1.0, "efectivo", "compras"),
+                )
+                break
+            except ConcurrenciaException:
+                pass
@@ -0,0 +1,134 @@
+"ViajesShardRepository Unit Tests"
+
+import json
+import os
+import tempfile
+from datetime import date
+from unittest import TestCase
+
+from controllers.viajes_controller import ViajesController
+from exceptions.concurrencia_exception import ConcurrenciaException
+from models.gasto import Gasto
+from models.viaje import Viaje
+from repositories.viajes_repository import ViajesRepository
+from repositories.viajes_shard_repository import ViajesShardRepository
+from services.tasas_cambio import ProveedorTasasFijas
+
+
+class TestViajesShardRepository(TestCase):
+    """ViajesShardRepository tests suite"""
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "viajes")
+        self.repositorio = ViajesShardRepository(self.ruta)
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    def test_registrar_viaje_y_gasto(self):
+        """Test para registrar un viaje y un gasto en archivos por viaje"""
+        controller = ViajesController(self.repositorio)
+        controller.registrar_viaje("colombia", "2024-06-07", "2024-06-10", 200_000)
+        controller.registrar_viaje("colombia", "2024-07-01", "2024-07-03", 100_000)
+        self.assertNotEqual(
+            controller.registrar_gasto("2024-06-08", 50_000, "efectivo", "compras"), ""
+        )
+        with open(os.path.join(self.ruta, "2024-06-07.json"), encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), 1)
+        with open(os.path.join(self.ruta, "2024-07-01.json"), encoding="utf-8") as f:
+            self.assertEqual(json.load(f), [])
+        otro = ViajesShardRepository(self.ruta)
+        viaje = otro.get_viaje(date(2024, 6, 9))
+        self.assertEqual(viaje.get_balance_dia(date(2024, 6, 8)), 150_000)
+        self.assertTrue(otro.hay_cruce(date(2024, 7, 3), date(2024, 7, 5)))
+        self.assertIsNone(otro.get_viaje(date(2024, 6, 11)))
+
+    def test_get_viajes_no_lee_gastos(self):
+        """Test para listar viajes leyendo solo el manifiesto"""
+        viaje = Viaje("usa", date(2024, 6, 7), date(2024, 6, 10), 100.0)
+        viaje.agregar_gasto(Gasto(date(2024, 6, 7), 10.0, "tarjeta", "alojamiento"))
+        self.repositorio.guardar([viaje])
+        viajes = ViajesShardRepository(self.ruta).get_viajes()
+        self.assertEqual(len(viajes), 1)
+        self.assertFalse(viajes[0].gastos_cargados)
+        self.assertEqual(viajes[0].to_dict(), viaje.to_dict())
+
+    def test_detecta_cambios_de_otro_proceso(self):
+        """Test para recargar un viaje cuyo archivo modifico otra instancia"""
+        self.repositorio.agregar_viaje(
+            Viaje("usa", date(2024, 6, 7), date(2024, 6, 10), 100.0)
+        )
+        viaje = self.repositorio.get_viaje(date(2024, 6, 8))
+        self.assertEqual(len(viaje.gastos), 0)
+        otro = ViajesShardRepository(self.ruta)
+        otro.agregar_gasto(
+            otro.get_viaje(date(2024, 6, 8)),
+            Gasto(date(2024, 6, 8), 10.0, "efectivo", "compras"),
+        )
+        self.assertEqual(len(self.repositorio.get_viaje(date(2024, 6, 8)).gastos), 1)
+
+    def test_guardar_elimina_archivos_obsoletos(self):
+        """Test para eliminar los archivos de viajes que ya no existen"""
+        self.repositorio.agregar_viaje(
+            Viaje("usa", date(2024, 6, 7), date(2024, 6, 10), 100.0)
+        )
+        self.repositorio.guardar([])
+        self.assertEqual(sorted(os.listdir(self.ruta)), ["manifest.json"])
+        self.assertEqual(self.repositorio.get_viajes(), [])
+
+    def test_importar_json(self):
+        """Test para migrar un archivo viajes.json existente"""
+        ruta_json = os.path.join(self.directorio.name, "viajes.json")
+        viaje = Viaje("europa", date(2024, 6, 7), date(2024, 6, 10), 100.0)
+        viaje.agregar_gasto(Gasto(date(2024, 6, 7), 10.0, "tarjeta", "alojamiento"))
+        ViajesRepository(ruta_json).guardar([viaje])
+        self.assertEqual(self.repositorio.importar_json(ruta_json), 1)
+        self.assertEqual(
+            [v.to_dict() for v in ViajesShardRepository(self.ruta).get_viajes()],
+            [viaje.to_dict()],
+        )
+
+    def test_sesion_escribe_al_cerrar(self):
+        """Test para escribir los archivos modificados al cerrar la sesion"""
+        with self.repositorio.sesion():
+            self.repositorio.agregar_viaje(
+                Viaje("usa", date(2024, 6, 7), date(2024, 6, 10), 100.0)
+            )
+            self.repositorio.agregar_gasto(
+                self.repositorio.get_viaje(date(2024, 6, 8)),
+                Gasto(date(2024, 6, 8), 10.0, "efectivo", "compras"),
+            )
+            self.assertFalse(os.path.exists(self.ruta))
+        viaje = ViajesShardRepository(self.ruta).get_viaje(date(2024, 6, 8))
+        self.assertEqual(viaje.get_balance_dia(date(2024, 6, 8)), 90.0)
+
+    def test_escrituras_de_otra_instancia(self):
+        """Test para rechazar escrituras sobre archivos que otra instancia modifico y
+        reintentarlas desde el controlador con los datos actuales"""
+        self.repositorio.agregar_viaje(
+            Viaje("usa", date(2024, 6, 7), date(2024, 6, 10), 100.0)
+        )
+        viaje = self.repositorio.get_viaje(date(2024, 6, 8))
+        self.assertEqual(len(viaje.gastos), 0)
+        otro = ViajesShardRepository(self.ruta)
+        otro.agregar_gasto(
+            otro.get_viaje(date(2024, 6, 8)),
+            Gasto(date(2024, 6, 8), 10.0, "efectivo", "compras"),
+        )
+        with self.assertRaises(ConcurrenciaException):
+            self.repositorio.agregar_gasto(
+                viaje, Gasto(date(2024, 6, 9), 1.0, "efectivo", "compras")
+            )
+        self.repositorio.get_viajes()
+        otro.agregar_viaje(Viaje("usa", date(2024, 7, 1), date(2024, 7, 2), 100.0))
+        with self.assertRaises(ConcurrenciaException):
+            self.repositorio.agregar_viaje(
+                Viaje("usa", date(2024, 8, 1), date(2024, 8, 2), 100.0)
+            )
+        controller = ViajesController(self.repositorio, ProveedorTasasFijas({"usa": 1}))
+        controller.registrar_viaje("colombia", "2024-08-01", "2024-08-02", 100)
+        controller.registrar_gasto("2024-06-09", 1, "efectivo", "compras")
+        actual = ViajesShardRepository(self.ruta)
+        self.assertEqual(len(actual.get_viajes()), 3)
+        self.assertEqual(len(actual.get_viaje(date(2024, 6, 8)).gastos), 2)
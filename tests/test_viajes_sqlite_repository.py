@@ -0,0 +1,161 @@
+"ViajesSqliteRepository Unit Tests"
+
+import os
+import sqlite3
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from unittest import TestCase
+
+from controllers.viajes_controller import ViajesController
+from models.gasto import Gasto
+from models.viaje import Viaje
+from repositories.viajes_repository import ViajesRepository
+from repositories.viajes_sqlite_repository import ViajesSqliteRepository
+
+
+class TestViajesSqliteRepository(TestCase):
+    """ViajesSqliteRepository tests suite"""
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.repositorio = ViajesSqliteRepository(
+            os.path.join(self.directorio.name, "viajes.db")
+        )
+
+    def tearDown(self):
+        self.repositorio.cerrar()
+        self.directorio.cleanup()
+
+    def test_registrar_viaje_y_gasto(self):
+        """Test para registrar un viaje y un gasto sobre SQLite"""
+        controller = ViajesController(self.repositorio)
+        controller.registrar_viaje("colombia", "2024-06-07", "2024-06-10", 200_000)
+        self.assertNotEqual(
+            controller.registrar_gasto("2024-06-08", 50_000, "efectivo", "compras"), ""
+        )
+        viaje = self.repositorio.get_viaje(date(2024, 6, 9))
+        self.assertEqual(viaje.get_balance_dia(date(2024, 6, 8)), 150_000)
+        self.assertIsNone(self.repositorio.get_viaje(date(2024, 6, 11)))
+
+    def test_hay_cruce(self):
+        """Test para la validacion de cruces con consultas indexadas"""
+        self.repositorio.agregar_viaje(
+            Viaje("usa", date(2024, 6, 7), date(2024, 6, 10), 100.0)
+        )
+        self.assertTrue(self.repositorio.hay_cruce(date(2024, 6, 1), date(2024, 6, 30)))
+        self.assertTrue(self.repositorio.hay_cruce(date(2024, 6, 10), date(2024, 6, 12)))
+        self.assertFalse(self.repositorio.hay_cruce(date(2024, 6, 11), date(2024, 6, 12)))
+
+    def test_importar_json(self):
+        """Test para importar un archivo viajes.json existente"""
+        ruta_json = os.path.join(self.directorio.name, "viajes.json")
+        viaje = Viaje("europa", date(2024, 6, 7), date(2024, 6, 10), 100.0)
+        viaje.agregar_gasto(Gasto(date(2024, 6, 7), 10.0, "tarjeta", "alojamiento"))
+        ViajesRepository(ruta_json).guardar([viaje])
+        self.assertEqual(self.repositorio.importar_json(ruta_json), 1)
+        self.assertEqual(
+            [v.to_dict() for v in self.repositorio.get_viajes()], [viaje.to_dict()]
+        )
+
+    def test_agregados_persistidos(self):
+        """Test para actualizar los totales agregados en la misma transaccion del gasto"""
+        viaje = Viaje("usa", date(2024, 6, 7), date(2024, 6, 10), 100.0)
+        viaje.agregar_gasto(Gasto(date(2024, 6, 7), 10.0, "tarjeta", "alojamiento"))
+        self.repositorio.agregar_viaje(viaje)
+        cargado = self.repositorio.get_viaje(date(2024, 6, 8))
+        gasto = Gasto(date(2024, 6, 8), 2.5, "efectivo", "compras")
+        self.repositorio.agregar_gasto(cargado, gasto)
+        viaje.agregar_gasto(gasto)
+        otro = self.repositorio.get_viaje(date(2024, 6, 8))
+        self.assertEqual(otro.get_balance_dia(date(2024, 6, 8)), 97.5)
+        self.assertEqual(otro.version, viaje.version)
+        self.assertFalse(otro.gastos_cargados)
+        for actual in (cargado, otro):
+            self.assertEqual(actual.to_dict(), viaje.to_dict())
+
+    def test_sesion_en_una_transaccion(self):
+        """Test para confirmar o revertir juntas las operaciones de una sesion"""
+        with self.repositorio.sesion():
+            self.repositorio.agregar_viaje(
+                Viaje("usa", date(2024, 6, 7), date(2024, 6, 10), 100.0)
+            )
+        with self.assertRaises(RuntimeError):
+            with self.repositorio.sesion():
+                self.repositorio.agregar_viaje(
+                    Viaje("usa", date(2024, 7, 1), date(2024, 7, 2), 100.0)
+                )
+                raise RuntimeError("interrumpida")
+        self.assertEqual(len(self.repositorio.get_viajes()), 1)
+
+    def test_uso_desde_varios_hilos(self):
+        """Test para registrar gastos desde varios hilos con la misma conexion"""
+        controller = ViajesController(self.repositorio)
+        controller.registrar_viaje("colombia", "2024-06-07", "2024-06-10", 100)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            mensajes = list(
+                pool.map(
+                    lambda _: controller.registrar_gasto(
+                        "2024-06-08", 1, "efectivo", "compras"
+                    ),
+                    range(20),
+                )
+            )
+        self.assertTrue(all(mensajes))
+        viaje = self.repositorio.get_viaje(date(2024, 6, 8))
+        self.assertEqual(len(viaje.gastos), 20)
+
+    def test_gastos_revertidos_no_modifican_el_viaje(self):
+        """Test para verificar que un lote revertido deja el viaje en memoria igual"""
+        self.repositorio.agregar_viaje(
+            Viaje("usa", date(2024, 6, 7), date(2024, 6, 10), 100.0)
+        )
+        viaje = self.repositorio.get_viaje(date(2024, 6, 8))
+        version = viaje.version
+        self.repositorio.conexion.execute("DROP TABLE agregados")
+        with self.assertRaises(sqlite3.OperationalError):
+            self.repositorio.agregar_gasto(
+                viaje, Gasto(date(2024, 6, 8), 2.5, "efectivo", "compras")
+            )
+        self.assertEqual(viaje.version, version)
+        self.assertEqual(viaje.resumen.cantidad, 0)
+        self.assertEqual(
+            self.repositorio.conexion.execute("SELECT COUNT(*) FROM gastos").fetchone(),
+            (0,),
+        )
+
+    def test_gasto_en_viaje_nuevo(self):
+        """Test para agregar un gasto a un viaje registrado sin gastos"""
+        self.repositorio.agregar_viaje(
+            Viaje("usa", date(2024, 6, 7), date(2024, 6, 10), 100.0)
+        )
+        viaje = self.repositorio.get_viaje(date(2024, 6, 8))
+        self.repositorio.agregar_gasto(
+            viaje, Gasto(date(2024, 6, 8), 2.5, "efectivo", "compras")
+        )
+        for actual in (viaje, self.repositorio.get_viaje(date(2024, 6, 8))):
+            self.assertEqual(len(actual.gastos), 1)
+            self.assertEqual(actual.resumen.cantidad, 1)
+
+    def test_totales_con_varias_conexiones(self):
+        """Test para acumular los totales de gastos agregados desde otra conexion
+        sobre un viaje leido antes"""
+        self.repositorio.agregar_viaje(
+            Viaje("usa", date(2024, 6, 7), date(2024, 6, 10), 100.0)
+        )
+        otro = ViajesSqliteRepository(self.repositorio.ruta)
+        try:
+            viaje = self.repositorio.get_viaje(date(2024, 6, 8))
+            viaje_otro = otro.get_viaje(date(2024, 6, 8))
+            self.repositorio.agregar_gasto(
+                viaje, Gasto(date(2024, 6, 8), 2.5, "efectivo", "compras")
+            )
+            otro.agregar_gasto(
+                viaje_otro, Gasto(date(2024, 6, 9), 1.0, "tarjeta", "transporte")
+            )
+        finally:
+            otro.cerrar()
+        guardado = self.repositorio.get_viaje(date(2024, 6, 8))
+        self.assertEqual(guardado.resumen.cantidad, 2)
+        self.assertEqual(guardado.resumen.total, 3.5)
+        self.assertEqual(len(guardado.gastos), 2)